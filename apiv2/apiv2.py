@@ -12,11 +12,19 @@ import discord
 from aiohttp import web
 from redbot.core import commands, Config, checks
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 
 from .auth import KeyManager, RateLimiter
 from .decorator import API_ROUTE_ATTR
 from .server import create_app, APP_BOT_KEY, APP_START_TIME_KEY, json_error
-from .webhooks import WebhookManager, SUPPORTED_EVENTS
+from .webhooks import WebhookManager, SUPPORTED_EVENTS, MAX_BATCH_SIZE
+from .stream import EventHub
+from .voiceindex import VoiceLogIndex
+from .jobs import JobManager
+from .cache import ResponseCache
+from .metrics import MetricsRegistry
+from .caseindex import ModlogCaseIndex
+from .dynamic import RouteTable, register_routes as register_dynamic_routes
 from .routes.core import register_routes as register_core_routes
 from .routes.members import register_routes as register_member_routes
 from .routes.moderation import register_routes as register_moderation_routes
@@ -31,6 +39,10 @@ from .routes.warnings_modlog import register_routes as register_warnings_modlog_
 from .routes.community import register_routes as register_community_routes
 from .routes.utilities import register_routes as register_utilities_routes
 from .routes.colacoins import register_routes as register_colacoins_routes
+from .routes.stream import register_routes as register_stream_routes
+from .routes.jobs import register_routes as register_job_routes
+from .routes.metrics import register_routes as register_metrics_routes
+from .routes.batch import register_routes as register_batch_routes, DEFAULT_BATCH_CONCURRENCY
 
 logger = logging.getLogger("red.killerbite95.apiv2")
 
@@ -57,26 +69,43 @@ class APIv2(commands.Cog):
             port=DEFAULT_PORT,
             api_keys={},
             webhooks={},
+            batch_concurrency=DEFAULT_BATCH_CONCURRENCY,
         )
 
         self.key_manager = KeyManager(self.config)
         self.rate_limiter = RateLimiter(default_max=200, window_seconds=60)
-        self.webhook_manager = WebhookManager(self.config)
+        self.webhook_manager = WebhookManager(self.config, cog_data_path(self))
+        self.event_hub = EventHub()
+        self.voice_index = VoiceLogIndex()
+        self.job_manager = JobManager()
+        self.response_cache = ResponseCache()
+        self.metrics = MetricsRegistry()
+        self.case_index = ModlogCaseIndex()
+        # External @api_route routes; swapped in place as cogs load and unload
+        self.route_table = RouteTable()
 
         self._app: web.Application | None = None
         self._runner: web.AppRunner | None = None
         self._site: web.TCPSite | None = None
         self._external_routes: dict[str, list[dict]] = {}
+        # Settings read by request handlers at runtime; mutated in place by commands
+        self._settings: dict = {}
 
     async def cog_load(self):
         await self.key_manager.load_cache()
         await self._load_key_rate_limits()
         await self.webhook_manager.initialize()
+        self.job_manager.start()
+        self._settings["batch_concurrency"] = await self.config.batch_concurrency()
         self._scan_all_cogs()
         await self._start_server()
+        voicelogs = self.bot.get_cog("VoiceLogs")
+        if voicelogs is not None:
+            self.bot.loop.create_task(self.voice_index.ensure_built(voicelogs))
 
     async def cog_unload(self):
         await self._stop_server()
+        await self.job_manager.close()
         await self.webhook_manager.close()
 
     async def _load_key_rate_limits(self):
@@ -93,7 +122,20 @@ class APIv2(commands.Cog):
         host = await self.config.host()
         port = await self.config.port()
 
-        self._app = create_app(self.bot, self.key_manager, self.rate_limiter, self.webhook_manager)
+        self._app = create_app(
+            self.bot,
+            self.key_manager,
+            self.rate_limiter,
+            self.webhook_manager,
+            self.event_hub,
+            self._settings,
+            self.voice_index,
+            self.job_manager,
+            self.response_cache,
+            self.metrics,
+            self.case_index,
+            self.route_table,
+        )
         register_core_routes(self._app)
         register_member_routes(self._app)
         register_moderation_routes(self._app)
@@ -107,20 +149,15 @@ class APIv2(commands.Cog):
         register_community_routes(self._app)
         register_utilities_routes(self._app)
         register_colacoins_routes(self._app)
+        register_stream_routes(self._app)
+        register_batch_routes(self._app)
+        register_job_routes(self._app)
+        register_metrics_routes(self._app)
 
-        # Register external cog routes (@api_route)
-        for cog_name, routes in self._external_routes.items():
-            for route_info in routes:
-                handler = self._make_external_handler(cog_name, route_info["method_name"])
-                handler.__doc__ = route_info["meta"].get("summary") or ""
-                self._app.router.add_route(
-                    route_info["http_method"],
-                    route_info["path"],
-                    handler,
-                )
-
-        # Docs routes last so they can see all registered routes
+        # Docs routes before the catch-all so they are not shadowed by it
         register_docs_routes(self._app)
+        # External cog routes (@api_route) resolve through the route table, last
+        register_dynamic_routes(self._app, self.route_table)
 
         self._runner = web.AppRunner(self._app)
         await self._runner.setup()
@@ -138,6 +175,7 @@ class APIv2(commands.Cog):
 
     async def _stop_server(self):
         """Gracefully stop the server."""
+        self.event_hub.close()
         if self._runner:
             await self._runner.cleanup()
             logger.info("APIv2 server stopped")
@@ -182,6 +220,18 @@ class APIv2(commands.Cog):
             if routes:
                 self._external_routes[cog_name] = routes
                 logger.info(f"Discovered {len(routes)} API route(s) in {cog_name}")
+        self.route_table.clear()
+        for cog_name in self._external_routes:
+            self._publish_routes(cog_name)
+
+    def _publish_routes(self, cog_name: str):
+        """Swap a cog's discovered routes into the live route table."""
+        handlers = []
+        for route_info in self._external_routes.get(cog_name, []):
+            handler = self._make_external_handler(cog_name, route_info["method_name"])
+            handler.__doc__ = route_info["meta"].get("summary") or ""
+            handlers.append((route_info["http_method"], route_info["path"], handler))
+        self.route_table.set_routes(cog_name, handlers)
 
     def _make_external_handler(self, cog_name: str, method_name: str):
         """Create a handler that dispatches to a cog method at request time."""
@@ -201,34 +251,114 @@ class APIv2(commands.Cog):
 
     @commands.Cog.listener()
     async def on_cog_add(self, cog: commands.Cog):
-        """Detect external cogs with @api_route and restart server if needed."""
+        """Publish routes of external cogs with @api_route; the server keeps running."""
         if cog is self:
             return
+        if type(cog).__name__ == "VoiceLogs":
+            self.voice_index.invalidate()
+        cog_name = type(cog).__name__
         routes = self._scan_cog_routes(cog)
         if routes:
-            cog_name = type(cog).__name__
             self._external_routes[cog_name] = routes
-            logger.info(f"Cog {cog_name} has {len(routes)} API routes, restarting server...")
-            await self._stop_server()
-            await self._start_server()
+            self._publish_routes(cog_name)
+            logger.info(f"Cog {cog_name} has {len(routes)} API route(s), published to the route table")
+        elif cog_name in self._external_routes:
+            # Reloaded without its routes
+            del self._external_routes[cog_name]
+            self.route_table.remove(cog_name)
 
     @commands.Cog.listener()
     async def on_cog_remove(self, cog: commands.Cog):
-        """Remove routes from unloaded cogs and restart server if needed."""
+        """Drop routes of unloaded cogs from the route table."""
         if cog is self:
             return
         cog_name = type(cog).__name__
+        if cog_name == "VoiceLogs":
+            self.voice_index.invalidate()
         if cog_name in self._external_routes:
             del self._external_routes[cog_name]
-            logger.info(f"Cog {cog_name} unloaded, removing its API routes...")
-            await self._stop_server()
-            await self._start_server()
+            self.route_table.remove(cog_name)
+            logger.info(f"Cog {cog_name} unloaded, removed its API routes")
+
+    # ==================== CACHE INVALIDATION ====================
+
+    def _invalidate_guild(self, guild: discord.Guild, listing: bool = False):
+        """Drop cached responses describing this guild (and the guild list)."""
+        if listing:
+            self.response_cache.invalidate("guilds", f"guild:{guild.id}")
+        else:
+            self.response_cache.invalidate(f"guild:{guild.id}")
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self._invalidate_guild(guild, listing=True)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._invalidate_guild(guild, listing=True)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
+        self._invalidate_guild(after, listing=True)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self._invalidate_guild(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self._invalidate_guild(channel.guild)
 
-    # ==================== WEBHOOK EVENT LISTENERS ====================
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self._invalidate_guild(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self._invalidate_guild(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._invalidate_guild(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._invalidate_guild(after.guild)
+
+    @commands.Cog.listener()
+    async def on_modlog_case_create(self, case):
+        self.case_index.record(case)
+
+    @commands.Cog.listener()
+    async def on_modlog_case_edit(self, case):
+        self.case_index.record(case)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        # Role member counts are part of the guild detail
+        if before.roles != after.roles:
+            self._invalidate_guild(after.guild)
+
+    # ==================== EVENT LISTENERS (webhooks + stream) ====================
+
+    def _has_listeners(self, event: str, guild_id: int | None) -> bool:
+        """True if any webhook or stream client wants this event."""
+        return (
+            self.webhook_manager.has_subscribers(event, guild_id)
+            or self.event_hub.has_subscribers(event)
+        )
+
+    async def _emit(self, event: str, payload: dict, guild_id: int | None):
+        """Fan an event out to outgoing webhooks and live stream clients."""
+        await self.webhook_manager.dispatch(event, payload, guild_id=guild_id)
+        self.event_hub.publish(event, payload, guild_id=guild_id)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
-        await self.webhook_manager.dispatch("member_join", {
+        self._invalidate_guild(member.guild, listing=True)
+        if not self._has_listeners("member_join", member.guild.id):
+            return
+        await self._emit("member_join", {
             "guild_id": str(member.guild.id),
             "guild_name": member.guild.name,
             "user": {
@@ -239,11 +369,14 @@ class APIv2(commands.Cog):
                 "bot": member.bot,
             },
             "joined_at": member.joined_at.isoformat() if member.joined_at else None,
-        }, guild_id=member.guild.id)
+        }, member.guild.id)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
-        await self.webhook_manager.dispatch("member_remove", {
+        self._invalidate_guild(member.guild, listing=True)
+        if not self._has_listeners("member_remove", member.guild.id):
+            return
+        await self._emit("member_remove", {
             "guild_id": str(member.guild.id),
             "guild_name": member.guild.name,
             "user": {
@@ -251,35 +384,41 @@ class APIv2(commands.Cog):
                 "username": member.name,
                 "display_name": member.display_name,
             },
-        }, guild_id=member.guild.id)
+        }, member.guild.id)
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild: discord.Guild, user: discord.User):
-        await self.webhook_manager.dispatch("member_ban", {
+        if not self._has_listeners("member_ban", guild.id):
+            return
+        await self._emit("member_ban", {
             "guild_id": str(guild.id),
             "guild_name": guild.name,
             "user": {
                 "id": str(user.id),
                 "username": user.name,
             },
-        }, guild_id=guild.id)
+        }, guild.id)
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild: discord.Guild, user: discord.User):
-        await self.webhook_manager.dispatch("member_unban", {
+        if not self._has_listeners("member_unban", guild.id):
+            return
+        await self._emit("member_unban", {
             "guild_id": str(guild.id),
             "guild_name": guild.name,
             "user": {
                 "id": str(user.id),
                 "username": user.name,
             },
-        }, guild_id=guild.id)
+        }, guild.id)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         if message.author.bot or not message.guild:
             return
-        await self.webhook_manager.dispatch("message", {
+        if not self._has_listeners("message", message.guild.id):
+            return
+        await self._emit("message", {
             "guild_id": str(message.guild.id),
             "channel_id": str(message.channel.id),
             "channel_name": getattr(message.channel, "name", str(message.channel.id)),
@@ -291,7 +430,79 @@ class APIv2(commands.Cog):
             },
             "content": message.content[:2000],
             "created_at": message.created_at.isoformat(),
-        }, guild_id=message.guild.id)
+        }, message.guild.id)
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(
+        self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState
+    ):
+        """Keep the VoiceLogs channel index current (once it has been built)."""
+        if before.channel == after.channel or not self.voice_index.built:
+            return
+        voicelogs = self.bot.get_cog("VoiceLogs")
+        if voicelogs is None or not await voicelogs.config.guild(member.guild).toggle():
+            return
+        if before.channel is not None:
+            self.voice_index.record_leave(member.id, before.channel)
+        if after.channel is not None:
+            self.voice_index.record_join(member.id, after.channel)
+
+    @commands.Cog.listener()
+    async def on_gameserver_status_change(self, guild, server_key, old_status, new_status):
+        """Dispatched by GameServerMonitor."""
+        self.response_cache.invalidate(f"game-servers:{guild.id}")
+        if not self._has_listeners("gameserver_status_change", guild.id):
+            return
+        await self._emit("gameserver_status_change", {
+            "guild_id": str(guild.id),
+            "server_key": server_key,
+            "old_status": getattr(old_status, "value", old_status),
+            "new_status": getattr(new_status, "value", new_status),
+        }, guild.id)
+
+    @commands.Cog.listener()
+    async def on_ticket_open(self, guild, channel, owner_id, panel, reopened=False):
+        """Dispatched by TicketsTrini, also when an archived ticket is reopened."""
+        # Panel ticket counters changed
+        self.response_cache.invalidate(f"ticket-panels:{guild.id}")
+        if not self._has_listeners("ticket_open", guild.id):
+            return
+        await self._emit("ticket_open", {
+            "guild_id": str(guild.id),
+            "channel_id": str(channel.id),
+            "owner_id": str(owner_id),
+            "panel": panel,
+            "reopened": reopened,
+        }, guild.id)
+
+    @commands.Cog.listener()
+    async def on_ticket_close(self, guild, channel, owner_id, panel, closed_by, reason):
+        """Dispatched by TicketsTrini."""
+        if not self._has_listeners("ticket_close", guild.id):
+            return
+        await self._emit("ticket_close", {
+            "guild_id": str(guild.id),
+            "channel_id": str(channel.id),
+            "owner_id": str(owner_id),
+            "panel": panel,
+            "closed_by": str(closed_by),
+            "reason": reason,
+        }, guild.id)
+
+    @commands.Cog.listener()
+    async def on_suggestion_vote(self, guild, suggestion, user_id, vote_type, action):
+        """Dispatched by SimpleSuggestions."""
+        if not self._has_listeners("suggestion_vote", guild.id):
+            return
+        await self._emit("suggestion_vote", {
+            "guild_id": str(guild.id),
+            "suggestion_id": suggestion.suggestion_id,
+            "user_id": str(user_id),
+            "vote_type": vote_type,
+            "action": action,
+            "upvotes": suggestion.upvotes,
+            "downvotes": suggestion.downvotes,
+        }, guild.id)
 
     # ==================== COMMANDS ====================
 
@@ -334,6 +545,38 @@ class APIv2(commands.Cog):
         embed.add_field(name="Listening", value=f"`{host}:{port}`", inline=True)
         embed.add_field(name="Uptime", value=f"{hours}h {mins}m {secs}s", inline=True)
         embed.add_field(name="API Keys", value=f"{active_keys} active", inline=True)
+        embed.add_field(name="Stream Clients", value=str(self.event_hub.subscriber_count), inline=True)
+        cache = self.response_cache
+        lookups = cache.hits + cache.misses
+        hit_rate = f"{cache.hits / lookups:.0%}" if lookups else "—"
+        embed.add_field(name="Response Cache", value=f"{len(cache)} entries · {hit_rate} hits", inline=True)
+
+        wq = self.webhook_manager.queue_status()
+        embed.add_field(
+            name="Webhook Queue",
+            value=(
+                f"{wq['queued']} queued · {wq['retrying']} retrying · {wq['spilled']} on disk\n"
+                f"{wq['delivered']} delivered · {wq['dead_lettered']} dead-lettered"
+            ),
+            inline=False,
+        )
+
+        routes = [r for r in self.metrics.items() if r[2].count]
+        embed.add_field(
+            name="Requests",
+            value=f"{self.metrics.total_requests} handled · {self.metrics.in_flight} in flight",
+            inline=False,
+        )
+        if routes:
+            slowest = sorted(routes, key=lambda r: r[2].percentile(0.95), reverse=True)[:5]
+            lines = []
+            for method, path, stats in slowest:
+                lat = stats.to_dict()["latency_ms"]
+                lines.append(
+                    f"`{method} {path.removeprefix('/api/v2')}` — "
+                    f"p50 {lat['p50']}ms · p95 {lat['p95']}ms · p99 {lat['p99']}ms ({stats.count})"
+                )
+            embed.add_field(name="Slowest Routes (p95)", value="\n".join(lines)[:1024], inline=False)
         await ctx.send(embed=embed)
 
     # ---- Restart ----
@@ -542,7 +785,8 @@ class APIv2(commands.Cog):
             status = "🟢" if wh["active"] else "🔴"
             evts = ", ".join(wh["events"])
             guild = f" (guild: {wh['guild_id']})" if wh.get("guild_id") else ""
-            lines.append(f"{status} **{wh['name']}** → `{wh['url']}`\n   Events: {evts}{guild}")
+            batch = f" (batch: {wh['batch_size']})" if wh.get("batch_size", 1) > 1 else ""
+            lines.append(f"{status} **{wh['name']}** → `{wh['url']}`\n   Events: {evts}{guild}{batch}")
 
         embed = discord.Embed(
             title="Outgoing Webhooks",
@@ -551,6 +795,23 @@ class APIv2(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @webhook_group.command(name="batch")
+    async def cmd_webhook_batch(self, ctx: commands.Context, name: str, size: int):
+        """Group high-volume events (message) into batches of up to `size` per POST.
+
+        Use 1 to disable batching.
+        """
+        if not 1 <= size <= MAX_BATCH_SIZE:
+            await ctx.send(f"❌ Batch size must be between 1 and {MAX_BATCH_SIZE}.")
+            return
+        success = await self.webhook_manager.set_batch_size(name, size)
+        if not success:
+            await ctx.send(f"❌ Webhook `{name}` not found.")
+        elif size == 1:
+            await ctx.send(f"✅ Batching disabled for `{name}`.")
+        else:
+            await ctx.send(f"✅ Webhook `{name}` will batch up to **{size}** events per request.")
+
     @webhook_group.command(name="test")
     async def cmd_webhook_test(self, ctx: commands.Context, name: str):
         """Send a test ping to a webhook."""
@@ -580,6 +841,16 @@ class APIv2(commands.Cog):
         await self.config.port.set(port)
         await ctx.send(f"✅ Port set to `{port}`. Run `[p]apiv2 restart` to apply.")
 
+    @set_group.command(name="batchconcurrency")
+    async def cmd_set_batch_concurrency(self, ctx: commands.Context, limit: int):
+        """Set how many sub-requests of a /batch call run at the same time."""
+        if not 1 <= limit <= 50:
+            await ctx.send("❌ Concurrency must be between 1 and 50.")
+            return
+        await self.config.batch_concurrency.set(limit)
+        self._settings["batch_concurrency"] = limit
+        await ctx.send(f"✅ Batch concurrency set to `{limit}`.")
+
     @set_group.command(name="host")
     async def cmd_set_host(self, ctx: commands.Context, host: str):
         """Change the API server bind address. Requires restart."""
@@ -35,8 +35,11 @@ class RateLimiter:
         """Get the effective rate limit for a key."""
         return self._limits.get(key_name, self.default_max)
 
-    def is_allowed(self, key_name: str) -> tuple[bool, int]:
-        """Check if a request is allowed. Returns (allowed, remaining)."""
+    def is_allowed(self, key_name: str, cost: int = 1) -> tuple[bool, int]:
+        """Check if a request is allowed. Returns (allowed, remaining).
+
+        ``cost`` lets weighted requests (e.g. batches) count as several hits.
+        """
         now = time.monotonic()
         cutoff = now - self.window
         max_req = self.get_key_limit(key_name)
@@ -44,7 +47,7 @@ class RateLimiter:
         hits = self._hits.get(key_name, [])
         # Prune old entries
         hits = [t for t in hits if t > cutoff]
-        hits.append(now)
+        hits.extend([now] * cost)
         self._hits[key_name] = hits
 
         remaining = max(0, max_req - len(hits))
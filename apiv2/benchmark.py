@@ -0,0 +1,563 @@
+"""
+Load-test and benchmark harness for APIv2.
+
+Runs the real ``create_app`` stack (middlewares, routes, cache, metrics)
+against a simulated bot — synthetic guilds with configurable member, role
+and channel counts and an in-memory stand-in for Red's Config — and drives
+it with a concurrent aiohttp client. Reports requests/sec, latency
+percentiles and memory per scenario, the cost of the middleware stack, and
+webhook dispatch throughput against a local sink.
+
+Run from the directory containing the cog (Red must be installed)::
+
+    python -m apiv2.benchmark --guilds 5 --members 5000 --requests 5000
+    python -m apiv2.benchmark --json bench.json
+    python -m apiv2.benchmark --baseline bench.json --tolerance 0.2
+
+With ``--baseline`` the exit status is 1 when any scenario's throughput or
+p95 latency regressed by more than the tolerance, so it can gate CI.
+Client and server share one event loop, so absolute numbers understate a
+real deployment; compare runs on the same machine.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+
+from .auth import KeyManager, RateLimiter
+from .cache import ResponseCache
+from .caseindex import ModlogCaseIndex
+from .dynamic import RouteTable, register_routes as register_dynamic_routes
+from .jobs import JobManager
+from .metrics import MetricsRegistry
+from .server import create_app, APP_BOT_KEY, APP_ROUTE_TABLE_KEY, APP_START_TIME_KEY
+from .stream import EventHub
+from .webhooks import WebhookManager
+from .routes.core import handle_health, register_routes as register_core_routes
+from .routes.members import register_routes as register_member_routes
+from .routes.colacoins import register_routes as register_colacoins_routes
+from .routes.webhooks import register_routes as register_webhook_routes
+from .routes.metrics import register_routes as register_metrics_routes
+
+BASE_GUILD_ID = 100_000_000_000_000_000
+BASE_USER_ID = 200_000_000_000_000_000
+BASE_ROLE_ID = 300_000_000_000_000_000
+BASE_CHANNEL_ID = 400_000_000_000_000_000
+
+# name -> path template; {guild_id} rotates over the synthetic guilds
+SCENARIOS: dict[str, str] = {
+    "health": "/api/v2/health",
+    "guild_detail": "/api/v2/guilds/{guild_id}",
+    "members_list": "/api/v2/guilds/{guild_id}/members?limit=100",
+    "members_list_1000": "/api/v2/guilds/{guild_id}/members?limit=1000",
+    "colacoins_leaderboard": "/api/v2/guilds/{guild_id}/colacoins/leaderboard?limit=50",
+}
+
+
+# ==================== SIMULATED BOT ====================
+
+class _FakeValue:
+    """One Config value: ``await value()`` and ``await value.set(x)``."""
+
+    def __init__(self, store: dict, key: str):
+        self._store = store
+        self._key = key
+
+    async def __call__(self):
+        return copy.deepcopy(self._store[self._key])
+
+    async def set(self, value):
+        self._store[self._key] = copy.deepcopy(value)
+
+
+class FakeConfig:
+    """In-memory stand-in for a Red Config with global values only."""
+
+    def __init__(self, **defaults):
+        self._store = dict(defaults)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self._store:
+            raise AttributeError(name)
+        return _FakeValue(self._store, name)
+
+
+class _Asset:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class FakeRole:
+    def __init__(self, role_id: int, name: str, position: int, default: bool = False):
+        self.id = role_id
+        self.name = name
+        self.position = position
+        self.color = SimpleNamespace(value=(role_id * 2654435761) & 0xFFFFFF)
+        self.mentionable = not default
+        self.managed = False
+        self.members: list = []
+        self._default = default
+
+    def is_default(self) -> bool:
+        return self._default
+
+
+class FakeMember:
+    def __init__(self, user_id: int, index: int, roles: list[FakeRole], joined_at: datetime):
+        self.id = user_id
+        self.name = f"user{index}"
+        self.nick = f"Nick {index}" if index % 3 == 0 else None
+        self.display_name = self.nick or self.name
+        self.display_avatar = _Asset(f"https://cdn.discordapp.com/embed/avatars/{index % 6}.png")
+        self.roles = roles
+        self.joined_at = joined_at
+        self.premium_since = None
+        self.bot = index % 50 == 0
+        self.status = "online" if index % 4 else "offline"
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, name: str, position: int, category_id: int | None):
+        self.id = channel_id
+        self.name = name
+        self.type = "text"
+        self.position = position
+        self.category_id = category_id
+
+
+class FakeGuild:
+    def __init__(self, index: int, members: int, roles: int, channels: int, roles_per_member: int):
+        self.id = BASE_GUILD_ID + index
+        self.name = f"Bench Guild {index}"
+        self.icon = None
+        self.banner = None
+        self.owner_id = BASE_USER_ID
+        self.created_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        default = FakeRole(self.id, "@everyone", 0, default=True)
+        self.roles = [default] + [
+            FakeRole(BASE_ROLE_ID + index * 10_000 + i, f"role-{i}", i + 1) for i in range(roles)
+        ]
+        categories = max(1, channels // 10)
+        self.channels = [
+            FakeChannel(
+                BASE_CHANNEL_ID + index * 10_000 + i,
+                f"channel-{i}",
+                i,
+                BASE_CHANNEL_ID + index * 10_000 + (i % categories) if i >= categories else None,
+            )
+            for i in range(channels)
+        ]
+
+        joined = self.created_at
+        self._members: dict[int, FakeMember] = {}
+        for i in range(members):
+            member_roles = [default] + [
+                self.roles[1 + (i + k) % roles] for k in range(min(roles_per_member, roles))
+            ]
+            member = FakeMember(BASE_USER_ID + i, i, member_roles, joined + timedelta(minutes=i))
+            self._members[member.id] = member
+            for role in member_roles:
+                role.members.append(member)
+
+    @property
+    def members(self) -> list[FakeMember]:
+        return list(self._members.values())
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    def get_member(self, user_id: int) -> FakeMember | None:
+        return self._members.get(user_id)
+
+
+class FakeBot:
+    """Just enough of ``Red`` for the benchmarked routes."""
+
+    def __init__(self, guilds: list[FakeGuild]):
+        self._guilds = {g.id: g for g in guilds}
+        self.user = SimpleNamespace(
+            id=BASE_USER_ID - 1, name="BenchBot", discriminator="0000",
+            display_avatar=_Asset("https://cdn.discordapp.com/embed/avatars/0.png"),
+        )
+        self.latency = 0.042
+        self.cogs: dict[str, object] = {}
+
+    @property
+    def guilds(self) -> list[FakeGuild]:
+        return list(self._guilds.values())
+
+    def get_guild(self, guild_id: int) -> FakeGuild | None:
+        return self._guilds.get(guild_id)
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+
+def build_bot(guilds: int, members: int, roles: int, channels: int, roles_per_member: int) -> FakeBot:
+    bot = FakeBot([FakeGuild(i, members, roles, channels, roles_per_member) for i in range(guilds)])
+    # ColaCoins keeps one global balance dict; give every other member a balance
+    balances = {str(BASE_USER_ID + i): (i * 7919) % 10_000 for i in range(0, members, 2)}
+    bot.cogs["ColaCoins"] = SimpleNamespace(config=FakeConfig(colacoins=balances, emoji="🥤"))
+    return bot
+
+
+# ==================== MEASUREMENT ====================
+
+def _rss_mb() -> float | None:
+    """Resident set size of this process in MiB, where the platform exposes it."""
+    try:
+        with open("/proc/self/statm") as fp:
+            pages = int(fp.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1048576
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak, not current, outside Linux (kilobytes on Linux, bytes on macOS)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1048576 if sys.platform == "darwin" else rss / 1024
+
+
+def _percentile(ordered: list[float], q: float) -> float | None:
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, round(q * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies_ms: list[float], elapsed: float, statuses: Counter, **extra) -> dict:
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "rps": round(count / elapsed, 1) if elapsed else None,
+        "mean_ms": round(sum(ordered) / count, 3) if count else None,
+        "p50_ms": _round(_percentile(ordered, 0.50)),
+        "p95_ms": _round(_percentile(ordered, 0.95)),
+        "p99_ms": _round(_percentile(ordered, 0.99)),
+        "max_ms": _round(ordered[-1] if ordered else None),
+        "status": {str(k): v for k, v in sorted(statuses.items())},
+        **extra,
+    }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 3) if value is not None else None
+
+
+async def drive(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    paths: list[str],
+    total: int,
+    concurrency: int,
+    headers: dict | None = None,
+    warmup: int = 0,
+) -> dict:
+    """Issue ``total`` GETs over ``concurrency`` workers, cycling through ``paths``."""
+
+    async def worker(jobs, latencies, statuses):
+        for i in jobs:
+            start = time.perf_counter()
+            async with session.get(base_url + paths[i % len(paths)], headers=headers) as resp:
+                await resp.read()
+                statuses[resp.status] += 1
+            if latencies is not None:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    if warmup:
+        jobs = iter(range(warmup))
+        await asyncio.gather(*(worker(jobs, None, Counter()) for _ in range(concurrency)))
+
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    jobs = iter(range(total))
+    rss_before = _rss_mb()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(jobs, latencies, statuses) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    extra = {}
+    rss_after = _rss_mb()
+    if rss_after is not None:
+        extra["rss_mb"] = round(rss_after, 1)
+        extra["rss_delta_mb"] = round(rss_after - rss_before, 1)
+    if tracemalloc.is_tracing():
+        extra["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1048576, 2)
+    return summarize(latencies, elapsed, statuses, **extra)
+
+
+async def _serve(app: web.Application) -> tuple[web.AppRunner, str]:
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+# ==================== SCENARIOS ====================
+
+async def bench_routes(args, bot: FakeBot) -> dict:
+    """Full middleware stack against the key read routes."""
+    key_manager = KeyManager(FakeConfig(api_keys={}))
+    token = await key_manager.create_key("bench")
+    # The benchmark is not about rate limiting; keep it out of the way
+    rate_limiter = RateLimiter(default_max=10 ** 9, window_seconds=1)
+    webhook_manager = WebhookManager(FakeConfig(webhooks={}))
+    job_manager = JobManager()
+    job_manager.start()
+    metrics = MetricsRegistry()
+
+    app = create_app(
+        bot, key_manager, rate_limiter, webhook_manager, EventHub(), {},
+        None, job_manager, ResponseCache(), metrics, ModlogCaseIndex(), RouteTable(),
+    )
+    register_core_routes(app)
+    register_member_routes(app)
+    register_colacoins_routes(app)
+    register_webhook_routes(app)
+    register_metrics_routes(app)
+    register_dynamic_routes(app, app[APP_ROUTE_TABLE_KEY])
+
+    runner, base_url = await _serve(app)
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": args.accept_encoding}
+    guild_ids = [g.id for g in bot.guilds]
+    results = {}
+    try:
+        connector = aiohttp.TCPConnector(limit=args.concurrency)
+        async with aiohttp.ClientSession(connector=connector, auto_decompress=False) as session:
+            for name, template in SCENARIOS.items():
+                if args.scenarios and name not in args.scenarios:
+                    continue
+                paths = [template.format(guild_id=gid) for gid in guild_ids]
+                results[name] = await drive(
+                    session, base_url, paths, args.requests, args.concurrency, headers, args.warmup,
+                )
+                _print_result(name, results[name])
+    finally:
+        await runner.cleanup()
+        await job_manager.close()
+
+    results["_server_metrics"] = metrics.snapshot()["routes"]
+    return results
+
+
+async def bench_middleware_overhead(args, bot: FakeBot, full: dict | None) -> dict:
+    """/health on a bare app with no middlewares, to isolate the stack's cost."""
+    app = web.Application()
+    app[APP_BOT_KEY] = bot
+    app[APP_START_TIME_KEY] = time.monotonic()
+    app.router.add_get(SCENARIOS["health"], handle_health)
+
+    runner, base_url = await _serve(app)
+    try:
+        connector = aiohttp.TCPConnector(limit=args.concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            bare = await drive(
+                session, base_url, [SCENARIOS["health"]], args.requests, args.concurrency, warmup=args.warmup,
+            )
+    finally:
+        await runner.cleanup()
+
+    if full is not None and full["mean_ms"] is not None and bare["mean_ms"] is not None:
+        bare["middleware_overhead_ms"] = round(full["mean_ms"] - bare["mean_ms"], 3)
+        bare["middleware_overhead_pct"] = round(100 * (1 - full["rps"] / bare["rps"]), 1) if bare["rps"] else None
+    _print_result("health_bare", bare)
+    return bare
+
+
+async def bench_webhooks(args) -> dict:
+    """Dispatch events through WebhookManager to a local sink and time delivery."""
+    received: list[float] = []
+    statuses: Counter = Counter()
+    done = asyncio.Event()
+
+    async def sink(request: web.Request) -> web.Response:
+        payload = await request.json()
+        received.append((time.perf_counter() - payload["data"]["sent"]) * 1000)
+        statuses[204] += 1
+        if len(received) >= args.webhook_events:
+            done.set()
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_post("/hook", sink)
+    runner, base_url = await _serve(app)
+
+    webhooks = {
+        f"bench-{i}": {
+            "url": f"{base_url}/hook",
+            "events": ["member_join"],
+            "secret": "bench",
+            "active": True,
+            "guild_id": None,
+            "batch_size": 1,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        for i in range(args.webhooks)
+    }
+    events = max(1, args.webhook_events // max(1, args.webhooks))
+    args.webhook_events = events * max(1, args.webhooks)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = WebhookManager(FakeConfig(webhooks=webhooks), Path(tmp))
+        await manager.initialize()
+        try:
+            rss_before = _rss_mb()
+            started = time.perf_counter()
+            for i in range(events):
+                await manager.dispatch("member_join", {"seq": i, "sent": time.perf_counter()}, BASE_GUILD_ID)
+            dispatch_elapsed = time.perf_counter() - started
+            try:
+                await asyncio.wait_for(done.wait(), timeout=args.timeout)
+            except asyncio.TimeoutError:
+                print(f"webhooks: timed out with {len(received)}/{args.webhook_events} delivered", file=sys.stderr)
+            elapsed = time.perf_counter() - started
+            extra = {
+                "dispatch_us_per_event": round(dispatch_elapsed / events * 1e6, 2),
+                "deliveries_per_s": round(len(received) / elapsed, 1) if elapsed else None,
+                "pipeline": manager.queue_status(),
+            }
+            rss_after = _rss_mb()
+            if rss_after is not None:
+                extra["rss_mb"] = round(rss_after, 1)
+                extra["rss_delta_mb"] = round(rss_after - rss_before, 1)
+        finally:
+            await manager.close()
+            await runner.cleanup()
+
+    result = summarize(received, elapsed, statuses, **extra)
+    _print_result("webhook_dispatch", result)
+    return result
+
+
+# ==================== REPORTING ====================
+
+def _print_result(name: str, result: dict):
+    parts = [
+        f"{name:<24}",
+        f"{result['rps'] or 0:>9.1f} req/s",
+        f"p50 {result['p50_ms'] or 0:>8.2f}ms",
+        f"p95 {result['p95_ms'] or 0:>8.2f}ms",
+        f"p99 {result['p99_ms'] or 0:>8.2f}ms",
+    ]
+    if "rss_mb" in result:
+        parts.append(f"rss {result['rss_mb']:.1f}MiB ({result['rss_delta_mb']:+.1f})")
+    if "traced_peak_mb" in result:
+        parts.append(f"peak {result['traced_peak_mb']:.2f}MiB")
+    if "middleware_overhead_ms" in result:
+        parts.append(f"middleware +{result['middleware_overhead_ms']:.3f}ms/req")
+    if "dispatch_us_per_event" in result:
+        parts.append(f"dispatch {result['dispatch_us_per_event']:.1f}us/event")
+    non_2xx = {k: v for k, v in result["status"].items() if not k.startswith("2") and k != "304"}
+    if non_2xx:
+        parts.append(f"non-2xx {non_2xx}")
+    print("  ".join(parts))
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of throughput or p95 latency beyond ``tolerance`` (a fraction)."""
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if name.startswith("_") or not isinstance(before, dict):
+            continue
+        if before.get("rps") and current.get("rps") is not None:
+            if current["rps"] < before["rps"] * (1 - tolerance):
+                regressions.append(f"{name}: {current['rps']} req/s vs {before['rps']} baseline")
+        if before.get("p95_ms") and current.get("p95_ms") is not None:
+            if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{name}: p95 {current['p95_ms']}ms vs {before['p95_ms']}ms baseline")
+    return regressions
+
+
+# ==================== ENTRY POINT ====================
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m apiv2.benchmark", description="Benchmark the APIv2 server.")
+    parser.add_argument("--guilds", type=int, default=3)
+    parser.add_argument("--members", type=int, default=5000, help="Members per guild")
+    parser.add_argument("--roles", type=int, default=50, help="Roles per guild")
+    parser.add_argument("--channels", type=int, default=100, help="Channels per guild")
+    parser.add_argument("--roles-per-member", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=100, help="Unrecorded requests before each scenario")
+    parser.add_argument("--accept-encoding", default="identity", help="e.g. 'gzip, br' to include compression")
+    parser.add_argument("--scenarios", nargs="*", choices=sorted(SCENARIOS), help="Subset of route scenarios")
+    parser.add_argument("--webhooks", type=int, default=4, help="Subscribed webhooks for the dispatch scenario")
+    parser.add_argument("--webhook-events", type=int, default=2000, help="Deliveries in the dispatch scenario")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Max seconds to wait for webhook deliveries")
+    parser.add_argument("--tracemalloc", action="store_true", help="Track Python allocation peaks (slower)")
+    parser.add_argument("--json", metavar="PATH", help="Write results to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression fraction")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    rss_before = _rss_mb()
+    bot = build_bot(args.guilds, args.members, args.roles, args.channels, args.roles_per_member)
+    rss_after = _rss_mb()
+    print(
+        f"Simulated bot: {args.guilds} guild(s) x {args.members} members, {args.roles} roles, "
+        f"{args.channels} channels (built in {time.perf_counter() - started:.1f}s"
+        + (f", {rss_after - rss_before:+.1f}MiB" if rss_after is not None else "")
+        + ")"
+    )
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}\n")
+
+    results = await bench_routes(args, bot)
+    results["health_bare"] = await bench_middleware_overhead(args, bot, results.get("health"))
+    if args.webhooks and args.webhook_events:
+        results["webhook_dispatch"] = await bench_webhooks(args)
+    return results
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    results = asyncio.run(run(args))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
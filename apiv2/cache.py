@@ -0,0 +1,190 @@
+"""
+Response cache and conditional GET support for APIv2 read routes.
+
+Handlers opt in with the ``cached`` decorator, declaring a TTL and the tags
+their output depends on (formatted with the route's match info, e.g.
+``"guild:{guild_id}"``). The cache middleware stores the serialized body,
+answers ``If-None-Match`` / ``If-Modified-Since`` with 304, and entries are
+dropped as soon as one of their tags is invalidated by a Discord event or a
+write through the API. The TTL bounds staleness for changes the cog cannot
+observe (e.g. Config writes made by other cogs' commands).
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger("red.killerbite95.apiv2.cache")
+
+CACHE_POLICY_ATTR = "__apiv2_cache__"
+MAX_ENTRIES = 1000
+
+
+def cached(ttl: float, tags: tuple[str, ...] = ()) -> Callable:
+    """Declare a GET handler's response as cacheable for ``ttl`` seconds.
+
+    ``tags`` are format strings over the route's match info; invalidating any
+    of them drops the cached response.
+    """
+    def decorator(func):
+        setattr(func, CACHE_POLICY_ATTR, (ttl, tuple(tags)))
+        return func
+    return decorator
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class _Entry:
+    __slots__ = ("body", "content_type", "etag", "last_modified", "expires", "tags")
+
+    def __init__(self, body: bytes, content_type: str, etag: str, last_modified: float, expires: float, tags):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.tags = tags
+
+
+class ResponseCache:
+    """LRU of serialized responses keyed by path and query, indexed by tag."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._by_tag: dict[str, set[str]] = {}
+        # Last-Modified survives re-validation when the body did not change
+        self._last_etag: dict[str, tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, body: bytes, content_type: str, ttl: float, tags: tuple[str, ...]) -> _Entry:
+        etag = _etag(body)
+        previous = self._last_etag.get(key)
+        last_modified = previous[1] if previous and previous[0] == etag else time.time()
+        self._last_etag[key] = (etag, last_modified)
+
+        self._drop(key)
+        entry = _Entry(body, content_type, etag, last_modified, time.monotonic() + ttl, tags)
+        self._entries[key] = entry
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+        while len(self._last_etag) > self.max_entries * 2:
+            self._last_etag.pop(next(iter(self._last_etag)))
+        return entry
+
+    def invalidate(self, *tags: str):
+        """Drop every cached response depending on any of ``tags``."""
+        for tag in tags:
+            for key in self._by_tag.pop(tag, ()):
+                self._drop(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._by_tag.clear()
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+
+def _base_etag(tag: str) -> str:
+    """Strip the weak prefix and the content-coding suffix added by compression."""
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ('-br"', '-gzip"'):
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def _not_modified(request: web.Request, entry: _Entry) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        candidates = {_base_etag(tag) for tag in if_none_match.split(",")}
+        return "*" in candidates or entry.etag in candidates
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(entry.last_modified) <= since
+    return False
+
+
+def _respond(request: web.Request, entry: _Entry, hit: bool) -> web.Response:
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+        "X-Cache": "HIT" if hit else "MISS",
+    }
+    if _not_modified(request, entry):
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=entry.body, content_type=entry.content_type, headers=headers)
+
+
+def cache_middleware_factory(cache: ResponseCache):
+    """Build the middleware serving cached responses for ``cached`` handlers."""
+
+    @web.middleware
+    async def cache_middleware(request: web.Request, handler):
+        if request.method != "GET":
+            return await handler(request)
+        policy = getattr(request.match_info.handler, CACHE_POLICY_ATTR, None)
+        if policy is None:
+            return await handler(request)
+
+        key = request.path_qs
+        entry = cache.get(key)
+        if entry is not None:
+            cache.hits += 1
+            return _respond(request, entry, hit=True)
+
+        cache.misses += 1
+        resp = await handler(request)
+        body = getattr(resp, "body", None)
+        if resp.status != 200 or not isinstance(body, (bytes, bytearray)):
+            return resp
+
+        ttl, tag_templates = policy
+        try:
+            tags = tuple(t.format(**request.match_info) for t in tag_templates)
+        except (KeyError, IndexError):
+            tags = tuple(tag_templates)
+        entry = cache.put(key, bytes(body), resp.content_type, ttl, tags)
+        return _respond(request, entry, hit=False)
+
+    return cache_middleware
@@ -0,0 +1,194 @@
+"""
+Per-guild index over Red's modlog cases for APIv2.
+
+``modlog.get_all_cases`` builds a full Case object (with user lookups) for
+every case in the guild, which takes seconds on guilds with tens of thousands
+of cases. This index is built once per guild from the raw modlog config and
+then kept current from ``on_modlog_case_create`` / ``on_modlog_case_edit``.
+Cases are held as serialized dicts in a case-number sorted list with by-type
+and by-user secondary lists, so a page is a slice rather than a scan.
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+
+from redbot.core import modlog
+
+logger = logging.getLogger("red.killerbite95.apiv2.caseindex")
+
+# Red has no event for `[p]reset cases`; rebuild periodically to pick it up
+REBUILD_AFTER_SECONDS = 3600
+
+
+def _id_of(obj) -> str | None:
+    if obj is None:
+        return None
+    if isinstance(obj, int):
+        return str(obj)
+    return str(obj.id)
+
+
+def _timestamp_to_iso(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromtimestamp(value, tz=timezone.utc).isoformat()
+    except Exception:
+        return str(value)
+
+
+def case_to_dict(case) -> dict:
+    """Serialize a Red modlog Case object to a plain dict."""
+    return {
+        "case_number": case.case_number,
+        "action_type": case.action_type,
+        "user_id": _id_of(case.user),
+        "moderator_id": _id_of(case.moderator),
+        "reason": case.reason,
+        "created_at": _timestamp_to_iso(case.created_at),
+        "amended_by": _id_of(case.amended_by),
+        "amended_reason": getattr(case, "amended_reason", None),
+    }
+
+
+def _raw_case_to_dict(data: dict) -> dict:
+    """Serialize a case as stored in modlog's config (no Discord lookups)."""
+    return {
+        "case_number": data["case_number"],
+        "action_type": data.get("action_type"),
+        "user_id": _id_of(data.get("user")),
+        "moderator_id": _id_of(data.get("moderator")),
+        "reason": data.get("reason"),
+        "created_at": _timestamp_to_iso(data.get("created_at")),
+        "amended_by": _id_of(data.get("amended_by")),
+        "amended_reason": data.get("amended_reason"),
+    }
+
+
+def _remove(numbers: list[int], number: int):
+    i = bisect_left(numbers, number)
+    if i < len(numbers) and numbers[i] == number:
+        del numbers[i]
+
+
+class GuildCaseIndex:
+    """Cases of one guild, sorted by case number, with type and user indexes."""
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self._cases: dict[int, dict] = {}
+        self._numbers: list[int] = []
+        self._by_type: dict[str, list[int]] = {}
+        self._by_user: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def upsert(self, case: dict):
+        number = case["case_number"]
+        old = self._cases.get(number)
+        if old is None:
+            insort(self._numbers, number)
+        else:
+            if old["action_type"] != case["action_type"]:
+                _remove(self._by_type.get(old["action_type"], []), number)
+            if old["user_id"] != case["user_id"]:
+                _remove(self._by_user.get(old["user_id"], []), number)
+        self._cases[number] = case
+
+        if old is None or old["action_type"] != case["action_type"]:
+            insort(self._by_type.setdefault(case["action_type"], []), number)
+        if old is None or old["user_id"] != case["user_id"]:
+            insort(self._by_user.setdefault(case["user_id"], []), number)
+
+    def get(self, number: int) -> dict | None:
+        return self._cases.get(number)
+
+    def page(
+        self,
+        action_type: str | None = None,
+        user_id: str | None = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> tuple[int, list[dict]]:
+        """Return (total, cases) for the filter, newest first."""
+        if action_type is not None and user_id is not None:
+            by_user = self._by_user.get(user_id, [])
+            numbers = [n for n in by_user if self._cases[n]["action_type"] == action_type]
+        elif action_type is not None:
+            numbers = self._by_type.get(action_type, [])
+        elif user_id is not None:
+            numbers = self._by_user.get(user_id, [])
+        else:
+            numbers = self._numbers
+
+        total = len(numbers)
+        end = max(total - offset, 0)
+        start = max(end - limit, 0)
+        return total, [self._cases[n] for n in reversed(numbers[start:end])]
+
+
+class ModlogCaseIndex:
+    """guild_id -> GuildCaseIndex, built lazily on first use."""
+
+    def __init__(self):
+        self._guilds: dict[int, GuildCaseIndex] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        # Events that arrive while a guild is being built, replayed afterwards
+        self._pending: dict[int, list[dict]] = {}
+
+    async def get_guild(self, guild, bot) -> GuildCaseIndex:
+        index = self._guilds.get(guild.id)
+        if index is not None and time.monotonic() - index.built_at < REBUILD_AFTER_SECONDS:
+            return index
+
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            index = self._guilds.get(guild.id)
+            if index is not None and time.monotonic() - index.built_at < REBUILD_AFTER_SECONDS:
+                return index
+            self._pending[guild.id] = []
+            try:
+                index = await self._build(guild, bot)
+                for case in self._pending[guild.id]:
+                    index.upsert(case)
+            finally:
+                self._pending.pop(guild.id, None)
+            self._guilds[guild.id] = index
+            logger.info(f"Modlog case index built for guild {guild.id}: {len(index)} case(s)")
+            return index
+
+    async def _build(self, guild, bot) -> GuildCaseIndex:
+        index = GuildCaseIndex()
+        # Read modlog's raw config when available: no Case objects, no user fetches
+        config = getattr(modlog, "_config", None)
+        if config is not None:
+            raw = await config.custom("CASES", str(guild.id)).all()
+            for data in raw.values():
+                if isinstance(data, dict) and "case_number" in data:
+                    index.upsert(_raw_case_to_dict(data))
+        else:
+            for case in await modlog.get_all_cases(guild, bot):
+                index.upsert(case_to_dict(case))
+        return index
+
+    def record(self, case):
+        """Apply a created or edited Case from a modlog event."""
+        guild = getattr(case, "guild", None)
+        if guild is None:
+            return
+        data = case_to_dict(case)
+        if guild.id in self._pending:
+            self._pending[guild.id].append(data)
+        index = self._guilds.get(guild.id)
+        if index is not None:
+            index.upsert(data)
+
+    def invalidate(self, guild_id: int | None = None):
+        if guild_id is None:
+            self._guilds = {}
+        else:
+            self._guilds.pop(guild_id, None)
@@ -0,0 +1,128 @@
+"""
+Mutable route table for routes contributed by external cogs (@api_route).
+
+aiohttp freezes its router once the app starts, so adding or removing a
+route used to mean tearing down the listener and building a new app. These
+routes now live in their own ``UrlDispatcher`` reached through a single
+catch-all resource registered after every built-in route. Loading or
+unloading a cog builds a fresh dispatcher and swaps it in with one
+assignment: in-flight requests finish on the table they resolved against,
+new requests see the new one, and the listening socket is never closed.
+"""
+
+import logging
+from typing import Callable
+
+from aiohttp import web
+
+logger = logging.getLogger("red.killerbite95.apiv2.dynamic")
+
+PREFIX = "/api/v2"
+CATCH_ALL_PATTERN = f"{PREFIX}/{{tail:.*}}"
+# How aiohttp reports the catch-all (canonical / formatter), for listings to skip
+CATCH_ALL_PATH = f"{PREFIX}/{{tail}}"
+# Request key holding the matched template, used by the metrics middleware
+ROUTE_TEMPLATE_KEY = "route_template"
+
+
+class _RoutedRequest:
+    """Request handed to an external handler: the original request with the
+    match info resolved by the route table instead of the catch-all's."""
+
+    def __init__(self, request: web.Request, match_info):
+        self._request = request
+        self._match_info = match_info
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+    def __getitem__(self, key):
+        return self._request[key]
+
+    def __setitem__(self, key, value):
+        self._request[key] = value
+
+    def __contains__(self, key):
+        return key in self._request
+
+    @property
+    def match_info(self):
+        return self._match_info
+
+
+class RouteTable:
+    """owner -> routes, compiled into a dispatcher that is replaced on change."""
+
+    def __init__(self):
+        self._routes: dict[str, list[tuple[str, str, Callable]]] = {}
+        self._router = web.UrlDispatcher()
+        self.version = 0
+
+    def __len__(self) -> int:
+        return sum(len(routes) for routes in self._routes.values())
+
+    def owners(self) -> list[str]:
+        return sorted(self._routes)
+
+    def set_routes(self, owner: str, routes: list[tuple[str, str, Callable]]):
+        """Replace every route owned by ``owner`` (a cog name) in one swap."""
+        if routes:
+            self._routes[owner] = list(routes)
+        else:
+            self._routes.pop(owner, None)
+        self._rebuild()
+
+    def remove(self, owner: str) -> bool:
+        if self._routes.pop(owner, None) is None:
+            return False
+        self._rebuild()
+        return True
+
+    def clear(self):
+        self._routes = {}
+        self._rebuild()
+
+    def _rebuild(self):
+        router = web.UrlDispatcher()
+        for owner, routes in self._routes.items():
+            for method, path, handler in routes:
+                if not path.startswith(f"{PREFIX}/"):
+                    logger.warning(f"Ignoring route {method} {path} from {owner}: paths must start with {PREFIX}/")
+                    continue
+                try:
+                    router.add_route(method, path, handler)
+                except (ValueError, RuntimeError) as e:
+                    logger.error(f"Invalid route {method} {path} from {owner}: {e}")
+        # Built completely before publishing; readers never see a partial table
+        self._router = router
+        self.version += 1
+
+    def resources(self) -> list:
+        return list(self._router.resources())
+
+    async def dispatch(self, request: web.Request) -> web.StreamResponse:
+        """Handler of the catch-all resource: resolve against the current table."""
+        match_info = await self._router.resolve(request)
+        if match_info.http_exception is not None:
+            # Not an external route; keep the 405 a built-in resource would give
+            allowed = await _builtin_allowed_methods(request)
+            if allowed:
+                raise web.HTTPMethodNotAllowed(request.method, allowed)
+            raise match_info.http_exception
+        request[ROUTE_TEMPLATE_KEY] = match_info.route.resource.canonical
+        return await match_info.handler(_RoutedRequest(request, match_info))
+
+
+async def _builtin_allowed_methods(request: web.Request) -> set[str]:
+    allowed: set[str] = set()
+    for resource in request.app.router.resources():
+        if resource.canonical == CATCH_ALL_PATH:
+            continue
+        _, methods = await resource.resolve(request)
+        allowed |= methods
+    return allowed
+
+
+def register_routes(app: web.Application, table: RouteTable):
+    """Mount the route table. Must run after every built-in route is added."""
+    app.router.add_route("*", CATCH_ALL_PATTERN, table.dispatch)
@@ -0,0 +1,43 @@
+"""
+JSON encoding backend for APIv2.
+
+Uses orjson when it is installed and falls back to the stdlib ``json``
+module otherwise. Both produce compact UTF-8 output. Every handler builds
+its responses through ``json_response`` so the backend applies everywhere.
+"""
+
+import json
+
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize ``obj`` to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: str | bytes):
+    """Parse JSON text; accepts ``str`` or ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_response(data, *, status: int = 200, headers: dict | None = None) -> web.Response:
+    """Drop-in replacement for ``web.json_response`` using the fast encoder."""
+    return web.Response(
+        body=dumps_bytes(data),
+        status=status,
+        headers=headers,
+        content_type="application/json",
+        charset="utf-8",
+    )
@@ -0,0 +1,342 @@
+"""
+Background job engine for long-running APIv2 operations.
+
+Endpoints that would otherwise perform many Discord writes inside the HTTP
+request (mass moves, prunes, bulk role grants) submit a job instead and
+return ``202 Accepted``. Jobs run on a small worker pool; the Discord calls
+inside them share one concurrency limit so several jobs cannot stampede the
+API together. Progress, partial results and cancellation are exposed through
+``/api/v2/jobs``.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger("red.killerbite95.apiv2.jobs")
+
+MAX_RUNNING_JOBS = 2
+DISCORD_CONCURRENCY = 4
+MAX_STORED_RESULTS = 5000
+JOB_RETENTION_SECONDS = 3600
+
+# (requests, per seconds) for Discord routes that bulk jobs hit hard.
+# Discord buckets these per guild; staying under them keeps discord.py from
+# stalling the whole bot on 429s.
+DISCORD_ROUTE_BUCKETS = {
+    "member_roles": (10, 10.0),
+}
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = frozenset({COMPLETED, FAILED, CANCELLED})
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class TokenBucket:
+    """Async token bucket: ``capacity`` calls per ``per`` seconds, refilled continuously."""
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        # Waiters are served in arrival order
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, seconds: float):
+        """Empty the bucket for ``seconds`` (e.g. after a 429 with Retry-After)."""
+        self._refill()
+        self._tokens = -seconds * self.rate
+
+
+class Job:
+    """State and progress of a single background job."""
+
+    def __init__(
+        self,
+        kind: str,
+        runner: Callable[["Job"], Awaitable[Optional[dict]]],
+        guild_id: int | None = None,
+        key_name: str | None = None,
+        params: dict | None = None,
+    ):
+        self.id = secrets.token_hex(8)
+        self.kind = kind
+        self.guild_id = guild_id
+        self.key_name = key_name
+        self.params = params or {}
+        self.status = QUEUED
+        self.created_at = _now()
+        self.started_at: str | None = None
+        self.finished_at: str | None = None
+        self.total: int | None = None
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.results: list[dict] = []
+        self.results_truncated = False
+        self.result: dict | None = None
+        self.error: str | None = None
+
+        self._runner = runner
+        self._task: asyncio.Task | None = None
+        self._finished_mono: float | None = None
+        self._watchers: list[asyncio.Queue] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def record(self, item: Any, ok: bool, detail: str | None = None):
+        """Record the outcome of one unit of work."""
+        self.processed += 1
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        entry = {"item": str(item), "ok": ok}
+        if detail:
+            entry["detail"] = detail
+        if len(self.results) < MAX_STORED_RESULTS:
+            self.results.append(entry)
+        else:
+            self.results_truncated = True
+        for queue in self._watchers:
+            queue.put_nowait(entry)
+
+    def watch(self) -> asyncio.Queue:
+        """Queue receiving every result recorded from now on, then None when the job ends."""
+        queue: asyncio.Queue = asyncio.Queue()
+        if self.finished:
+            queue.put_nowait(None)
+        else:
+            self._watchers.append(queue)
+        return queue
+
+    def unwatch(self, queue: asyncio.Queue):
+        if queue in self._watchers:
+            self._watchers.remove(queue)
+
+    def to_dict(self, results_offset: int = 0, results_limit: int = 0) -> dict:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "guild_id": str(self.guild_id) if self.guild_id else None,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": {
+                "total": self.total,
+                "processed": self.processed,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+            },
+            "result": self.result,
+            "error": self.error,
+        }
+        if results_limit > 0:
+            data["results"] = self.results[results_offset : results_offset + results_limit]
+            data["results_total"] = len(self.results)
+            data["results_truncated"] = self.results_truncated
+        return data
+
+
+class JobManager:
+    """Queue and worker pool for background jobs."""
+
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        # Shared by every job so their Discord calls are throttled together
+        self._discord_limit: asyncio.Semaphore | None = None
+        self._buckets: dict[tuple[str, Any], TokenBucket] = {}
+        self._closing = False
+
+    def start(self):
+        if self._workers:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue()
+        self._discord_limit = asyncio.Semaphore(DISCORD_CONCURRENCY)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(MAX_RUNNING_JOBS)]
+
+    async def close(self):
+        """Cancel running jobs and stop the workers."""
+        self._closing = True
+        for job in self._jobs.values():
+            if not job.finished:
+                self.cancel(job.id)
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    # ==================== PUBLIC API ====================
+
+    def submit(
+        self,
+        kind: str,
+        runner: Callable[[Job], Awaitable[Optional[dict]]],
+        *,
+        guild_id: int | None = None,
+        key_name: str | None = None,
+        params: dict | None = None,
+    ) -> Job:
+        """Queue a job. ``runner(job)`` does the work and may return a result dict."""
+        self._prune()
+        job = Job(kind, runner, guild_id=guild_id, key_name=key_name, params=params)
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        logger.info(f"Job {job.id} ({kind}) queued by key {key_name}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list[Job]:
+        self._prune()
+        return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if unknown or already finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.status = CANCELLED
+        if job._task is not None:
+            job._task.cancel()
+        else:
+            self._finish(job)
+        return True
+
+    def bucket(self, route: str, major_id: Any = None) -> TokenBucket:
+        """Shared token bucket for a Discord route (per major parameter, e.g. guild)."""
+        bucket = self._buckets.get((route, major_id))
+        if bucket is None:
+            capacity, per = DISCORD_ROUTE_BUCKETS[route]
+            bucket = self._buckets[(route, major_id)] = TokenBucket(capacity, per)
+        return bucket
+
+    async def run_items(
+        self,
+        job: Job,
+        items: Iterable,
+        func: Callable[[Any], Awaitable[Optional[str]]],
+        *,
+        key: Callable[[Any], Any] = lambda item: item,
+        bucket: TokenBucket | None = None,
+    ):
+        """Run ``func(item)`` for every item under the shared Discord limit.
+
+        ``func`` returns None on success or raises; any exception is recorded
+        as a failure for that item without stopping the job. When ``bucket``
+        is given, each call also waits for a token from it.
+        """
+        items = list(items)
+        if job.total is None:
+            job.total = len(items)
+
+        async def one(item):
+            if bucket is not None:
+                await bucket.acquire()
+            async with self._discord_limit:
+                try:
+                    detail = await func(item)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    retry_after = getattr(e, "retry_after", None)
+                    if bucket is not None and retry_after:
+                        bucket.penalize(retry_after)
+                    job.record(key(item), False, str(e))
+                else:
+                    job.record(key(item), True, detail)
+
+        await asyncio.gather(*(one(item) for item in items))
+
+    # ==================== INTERNALS ====================
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            if job.status != QUEUED:
+                continue  # Cancelled while waiting
+
+            job.status = RUNNING
+            job.started_at = _now()
+            job._task = asyncio.create_task(job._runner(job))
+            try:
+                job.result = await job._task
+                job.status = COMPLETED
+            except asyncio.CancelledError:
+                job.status = CANCELLED
+                if self._worker_cancelled():
+                    # The worker itself is shutting down, not just this job
+                    job._task.cancel()
+                    self._finish(job)
+                    raise
+            except Exception as e:
+                logger.error(f"Job {job.id} ({job.kind}) failed: {e}", exc_info=True)
+                job.status = FAILED
+                job.error = str(e)
+            self._finish(job)
+
+    def _worker_cancelled(self) -> bool:
+        """Whether the running worker task (rather than the job it awaits) was cancelled."""
+        if self._closing:
+            return True
+        task = asyncio.current_task()
+        # Task.cancelling() only exists on Python 3.11+
+        return task is not None and getattr(task, "cancelling", lambda: 0)() > 0
+
+    def _finish(self, job: Job):
+        if job.finished_at is None:
+            job.finished_at = _now()
+            job._finished_mono = time.monotonic()
+            for queue in job._watchers:
+                queue.put_nowait(None)
+            job._watchers = []
+            logger.info(
+                f"Job {job.id} ({job.kind}) {job.status}: "
+                f"{job.succeeded} ok, {job.failed} failed"
+            )
+
+    def _prune(self):
+        """Forget finished jobs older than the retention window."""
+        cutoff = time.monotonic() - JOB_RETENTION_SECONDS
+        stale = [
+            job_id for job_id, job in self._jobs.items()
+            if job._finished_mono is not None and job._finished_mono < cutoff
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
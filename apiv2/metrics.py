@@ -0,0 +1,190 @@
+"""
+Per-route request metrics for APIv2.
+
+Requests are grouped by method and the route's canonical path (e.g.
+``/api/v2/guilds/{guild_id}``), not the raw URL, so IDs do not explode the
+number of series. Latency goes into fixed histogram buckets, which keeps the
+per-request cost to a bisect and a few integer increments; percentiles are
+estimated from the buckets when metrics are read.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+
+from aiohttp import web
+
+from .dynamic import ROUTE_TEMPLATE_KEY
+
+# Upper bounds in milliseconds; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteStats:
+    """Counters and latency histogram for one (method, route) pair."""
+
+    __slots__ = ("count", "in_flight", "statuses", "buckets", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.in_flight = 0
+        self.statuses = [0] * len(STATUS_CLASSES)
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, status: int, elapsed_ms: float):
+        self.count += 1
+        self.statuses[min(max(status // 100, 1), 5) - 1] += 1
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        self.sum_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def percentile(self, q: float) -> float | None:
+        """Estimate the q-quantile (0..1) by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if seen + n >= rank and n:
+                if i == len(LATENCY_BUCKETS_MS):
+                    return self.max_ms
+                lower = LATENCY_BUCKETS_MS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS_MS[i]
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max_ms)
+            seen += n
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "in_flight": self.in_flight,
+            "status": dict(zip(STATUS_CLASSES, self.statuses)),
+            "latency_ms": {
+                "avg": round(self.sum_ms / self.count, 2) if self.count else None,
+                "p50": _round(self.percentile(0.50)),
+                "p95": _round(self.percentile(0.95)),
+                "p99": _round(self.percentile(0.99)),
+                "max": round(self.max_ms, 2),
+            },
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+class MetricsRegistry:
+    """All route stats for the API server; survives server restarts."""
+
+    def __init__(self):
+        self._routes: dict[tuple[str, str], RouteStats] = {}
+        self.in_flight = 0
+        self.started = time.time()
+
+    def route(self, method: str, path: str) -> RouteStats:
+        stats = self._routes.get((method, path))
+        if stats is None:
+            stats = self._routes[(method, path)] = RouteStats()
+        return stats
+
+    def reset(self):
+        self._routes = {}
+        self.started = time.time()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(s.count for s in self._routes.values())
+
+    def items(self) -> list[tuple[str, str, RouteStats]]:
+        return [(method, path, stats) for (method, path), stats in sorted(self._routes.items(), key=lambda kv: (kv[0][1], kv[0][0]))]
+
+    def snapshot(self) -> dict:
+        return {
+            "since": self.started,
+            "in_flight": self.in_flight,
+            "total_requests": self.total_requests,
+            "routes": [
+                {"method": method, "path": path, **stats.to_dict()}
+                for method, path, stats in self.items()
+            ],
+        }
+
+    def prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP apiv2_requests_total Requests handled, by route and status class.",
+            "# TYPE apiv2_requests_total counter",
+        ]
+        routes = self.items()
+        for method, path, stats in routes:
+            for cls, n in zip(STATUS_CLASSES, stats.statuses):
+                if n:
+                    lines.append(f'apiv2_requests_total{{method="{method}",route="{_escape(path)}",status="{cls}"}} {n}')
+
+        lines += [
+            "# HELP apiv2_request_duration_ms Request latency in milliseconds.",
+            "# TYPE apiv2_request_duration_ms histogram",
+        ]
+        for method, path, stats in routes:
+            labels = f'method="{method}",route="{_escape(path)}"'
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS_MS, stats.buckets):
+                cumulative += n
+                lines.append(f'apiv2_request_duration_ms_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'apiv2_request_duration_ms_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"apiv2_request_duration_ms_sum{{{labels}}} {stats.sum_ms:.3f}")
+            lines.append(f"apiv2_request_duration_ms_count{{{labels}}} {stats.count}")
+
+        lines += [
+            "# HELP apiv2_requests_in_flight Requests currently being handled.",
+            "# TYPE apiv2_requests_in_flight gauge",
+            f"apiv2_requests_in_flight {self.in_flight}",
+        ]
+        for method, path, stats in routes:
+            if stats.in_flight:
+                lines.append(f'apiv2_requests_in_flight{{method="{method}",route="{_escape(path)}"}} {stats.in_flight}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def metrics_middleware_factory(registry: MetricsRegistry):
+    """Build the middleware recording per-route counts, latency and in-flight gauges."""
+
+    @web.middleware
+    async def metrics_middleware(request: web.Request, handler):
+        resource = request.match_info.route.resource
+        path = resource.canonical if resource is not None else UNMATCHED_ROUTE
+        stats = registry.route(request.method, path)
+
+        start = time.perf_counter()
+        registry.in_flight += 1
+        stats.in_flight += 1
+        status = 500
+        try:
+            resp = await handler(request)
+            status = resp.status
+            return resp
+        except web.HTTPException as e:
+            status = e.status
+            raise
+        except asyncio.CancelledError:
+            status = 499  # Client went away mid-request
+            raise
+        finally:
+            registry.in_flight -= 1
+            stats.in_flight -= 1
+            # External routes all match the catch-all; file them under their own template
+            template = request.get(ROUTE_TEMPLATE_KEY)
+            if template is not None:
+                stats = registry.route(request.method, template)
+            stats.observe(status, (time.perf_counter() - start) * 1000)
+
+    return metrics_middleware
@@ -0,0 +1,179 @@
+"""
+Batch API route: run several API calls in one HTTP request.
+
+Sub-requests are resolved against the app router and handed straight to
+their handlers, so authentication, rate limiting and logging happen once for
+the whole batch instead of once per call.
+"""
+
+import asyncio
+import json
+import logging
+
+from aiohttp import web
+
+from ..encoding import json_response, loads
+from ..server import APP_RATE_LIMITER_KEY, APP_SETTINGS_KEY, json_error
+
+logger = logging.getLogger("red.killerbite95.apiv2.routes.batch")
+
+PREFIX = "/api/v2"
+
+MAX_BATCH_REQUESTS = 50
+DEFAULT_BATCH_CONCURRENCY = 8
+ALLOWED_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+# Endpoints that make no sense inside a batch
+EXCLUDED_PATHS = {f"{PREFIX}/batch", f"{PREFIX}/stream"}
+
+
+def register_routes(app: web.Application):
+    """Register the batch route."""
+    app.router.add_post(f"{PREFIX}/batch", handle_batch)
+
+
+class _SubRequest:
+    """Request seen by a handler inside a batch.
+
+    Wraps a clone of the batch request (so ``app``, ``query``, ``headers`` and
+    the auth state behave normally) with its own match info and JSON body.
+    """
+
+    def __init__(self, clone: web.Request, match_info, body):
+        self._clone = clone
+        self._match_info = match_info
+        self._body = body
+
+    def __getattr__(self, name):
+        return getattr(self._clone, name)
+
+    def __getitem__(self, key):
+        return self._clone[key]
+
+    def __setitem__(self, key, value):
+        self._clone[key] = value
+
+    def __contains__(self, key):
+        return key in self._clone
+
+    @property
+    def match_info(self):
+        return self._match_info
+
+    async def json(self, *, loads=json.loads):
+        if self._body is None:
+            raise ValueError("Sub-request has no body")
+        return self._body
+
+    async def text(self) -> str:
+        return "" if self._body is None else json.dumps(self._body)
+
+    async def read(self) -> bytes:
+        return (await self.text()).encode("utf-8")
+
+    @property
+    def can_read_body(self) -> bool:
+        return self._body is not None
+
+    @property
+    def _payload_writer(self):
+        # StreamResponse.prepare() would write straight onto the batch's connection
+        raise web.HTTPBadRequest(reason="Streaming responses cannot be batched")
+
+
+def _response_body(resp: web.StreamResponse):
+    """Decode a handler response body for embedding in the batch result."""
+    body = getattr(resp, "body", None)
+    if body is None:
+        return None
+    if isinstance(body, (bytes, bytearray)):
+        if resp.content_type == "application/json":
+            try:
+                return loads(body)
+            except ValueError:
+                pass
+        text = body.decode(resp.charset or "utf-8", errors="replace")
+    else:
+        text = getattr(resp, "text", None)
+        if text is None:
+            return None
+    if resp.content_type == "application/json":
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+async def _run_one(request: web.Request, item: dict, index: int) -> dict:
+    ref = item.get("id", index) if isinstance(item, dict) else index
+
+    if not isinstance(item, dict):
+        return {"id": ref, "status": 400, "body": {"error": "bad_request", "message": "Each request must be an object"}}
+
+    method = str(item.get("method", "GET")).upper()
+    path = item.get("path")
+    if method not in ALLOWED_METHODS:
+        return {"id": ref, "status": 400, "body": {"error": "bad_request", "message": f"Unsupported method {method}"}}
+    if not isinstance(path, str) or not path.startswith(f"{PREFIX}/"):
+        return {"id": ref, "status": 400, "body": {"error": "bad_request", "message": f"path must start with {PREFIX}/"}}
+    if path.split("?", 1)[0] in EXCLUDED_PATHS:
+        return {"id": ref, "status": 400, "body": {"error": "bad_request", "message": f"{path} cannot be batched"}}
+
+    clone = request.clone(method=method, rel_url=path)
+    if "stream" in clone.query:
+        return {"id": ref, "status": 400, "body": {"error": "bad_request", "message": "stream= cannot be used inside a batch"}}
+    match_info = await request.app.router.resolve(clone)
+    match_info.add_app(request.app)
+    match_info.freeze()
+    sub = _SubRequest(clone, match_info, item.get("body"))
+
+    try:
+        resp = await match_info.handler(sub)
+    except web.HTTPException as e:
+        return {"id": ref, "status": e.status, "body": {"error": e.reason.lower().replace(" ", "_"), "message": e.reason}}
+    except Exception as e:
+        logger.error(f"Batch sub-request {method} {path} failed: {e}", exc_info=True)
+        return {"id": ref, "status": 500, "body": {"error": "internal_error", "message": "An internal error occurred"}}
+
+    return {"id": ref, "status": resp.status, "body": _response_body(resp)}
+
+
+async def handle_batch(request: web.Request) -> web.Response:
+    """POST /api/v2/batch — Run multiple API calls in one request.
+
+    Body: { "requests": [ {"id": "a", "method": "GET", "path": "/api/v2/...", "body": {...}}, ... ] }
+    """
+    # aiohttp can't clone a request once its body is read; sub-requests are
+    # cloned from this untouched copy instead
+    template = request.clone()
+    try:
+        data = await request.json()
+    except Exception:
+        return json_error(400, "bad_request", "Invalid JSON body")
+
+    items = data.get("requests") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return json_error(422, "validation_error", "'requests' must be a non-empty list")
+    if len(items) > MAX_BATCH_REQUESTS:
+        return json_error(422, "validation_error", f"A batch can contain at most {MAX_BATCH_REQUESTS} requests")
+
+    # The batch itself already counted once in auth_middleware; charge the rest
+    key_name = request.get("api_key_name")
+    if key_name and len(items) > 1:
+        rate_limiter = request.app[APP_RATE_LIMITER_KEY]
+        allowed, _ = rate_limiter.is_allowed(key_name, cost=len(items) - 1)
+        if not allowed:
+            retry_after = rate_limiter.get_retry_after(key_name)
+            resp = json_error(429, "rate_limited", f"Batch of {len(items)} exceeds the rate limit. Retry after {retry_after:.0f}s")
+            resp.headers["Retry-After"] = str(int(retry_after))
+            return resp
+
+    settings = request.app[APP_SETTINGS_KEY]
+    semaphore = asyncio.Semaphore(settings.get("batch_concurrency", DEFAULT_BATCH_CONCURRENCY))
+
+    async def run(index: int, item):
+        async with semaphore:
+            return await _run_one(template, item, index)
+
+    results = await asyncio.gather(*(run(i, item) for i, item in enumerate(items)))
+    return json_response({"responses": list(results), "count": len(results)})
@@ -9,7 +9,9 @@ from typing import TYPE_CHECKING
 
 from aiohttp import web
 
-from ..server import APP_BOT_KEY, json_error
+from ..cache import cached
+from ..encoding import json_response
+from ..server import APP_BOT_KEY, APP_RESPONSE_CACHE_KEY, json_error
 
 if TYPE_CHECKING:
     from redbot.core.bot import Red
@@ -84,7 +86,7 @@ async def handle_balance_get(request: web.Request) -> web.Response:
     balance = colacoins.get(str(user_id), 0)
     emoji = await cog.config.emoji() or ""
 
-    return web.json_response({
+    return json_response({
         "user_id": str(user_id),
         "username": member.display_name,
         "balance": balance,
@@ -128,9 +130,10 @@ async def handle_balance_set(request: web.Request) -> web.Response:
         colacoins[str(user_id)] = new_balance
 
     await cog.save_data()
+    request.app[APP_RESPONSE_CACHE_KEY].invalidate("colacoins")
 
     emoji = await cog.config.emoji() or ""
-    return web.json_response({
+    return json_response({
         "user_id": str(user_id),
         "username": member.display_name,
         "balance": new_balance,
@@ -177,9 +180,10 @@ async def handle_give(request: web.Request) -> web.Response:
         new_balance = colacoins[str(user_id)]
 
     await cog.save_data()
+    request.app[APP_RESPONSE_CACHE_KEY].invalidate("colacoins")
 
     emoji = await cog.config.emoji() or ""
-    return web.json_response({
+    return json_response({
         "user_id": str(user_id),
         "username": member.display_name,
         "given": amount,
@@ -234,9 +238,10 @@ async def handle_remove(request: web.Request) -> web.Response:
         new_balance = colacoins[str(user_id)]
 
     await cog.save_data()
+    request.app[APP_RESPONSE_CACHE_KEY].invalidate("colacoins")
 
     emoji = await cog.config.emoji() or ""
-    return web.json_response({
+    return json_response({
         "user_id": str(user_id),
         "username": member.display_name,
         "removed": amount,
@@ -288,7 +293,7 @@ async def handle_leaderboard(request: web.Request) -> web.Response:
     for i, entry in enumerate(page):
         entry["rank"] = offset + i + 1
 
-    return web.json_response({
+    return json_response({
         "emoji": emoji,
         "total": total,
         "limit": limit,
@@ -297,6 +302,7 @@ async def handle_leaderboard(request: web.Request) -> web.Response:
     })
 
 
+@cached(ttl=60, tags=("colacoins",))
 async def handle_settings_get(request: web.Request) -> web.Response:
     """GET /colacoins/settings — Current ColaCoins emoji/config."""
     bot: "Red" = request.app[APP_BOT_KEY]
@@ -312,7 +318,7 @@ async def handle_settings_get(request: web.Request) -> web.Response:
     total_users = sum(1 for v in colacoins.values() if v > 0)
     total_coins = sum(v for v in colacoins.values() if v > 0)
 
-    return web.json_response({
+    return json_response({
         "emoji": emoji,
         "total_users_with_coins": total_users,
         "total_coins_in_circulation": total_coins,
@@ -13,6 +13,7 @@ from typing import TYPE_CHECKING
 import discord
 from aiohttp import web
 
+from ..encoding import json_response
 from ..server import APP_BOT_KEY, json_error
 
 if TYPE_CHECKING:
@@ -166,7 +167,7 @@ async def handle_giveaways_list(request: web.Request) -> web.Response:
 
     results.sort(key=lambda x: x["message_id"], reverse=True)
     total = len(results)
-    return web.json_response({
+    return json_response({
         "total": total,
         "limit": limit,
         "offset": offset,
@@ -192,7 +193,7 @@ async def handle_giveaway_get(request: web.Request) -> web.Response:
 
     # Check live cache first
     if msg_id in cog.giveaways and cog.giveaways[msg_id].guildid == guild.id:
-        return web.json_response(_giveaway_to_dict(cog.giveaways[msg_id]))
+        return json_response(_giveaway_to_dict(cog.giveaways[msg_id]))
 
     # Fall back to config
     raw = await cog.config.custom(GIVEAWAY_KEY, str(guild.id), str(msg_id)).all()
@@ -200,7 +201,7 @@ async def handle_giveaway_get(request: web.Request) -> web.Response:
         return json_error("not_found", f"Giveaway {msg_id} not found", 404)
     raw.setdefault("messageid", msg_id)
     raw.setdefault("guildid", guild.id)
-    return web.json_response(_giveaway_to_dict(None, raw))
+    return json_response(_giveaway_to_dict(None, raw))
 
 
 async def handle_giveaways_create(request: web.Request) -> web.Response:
@@ -282,7 +283,7 @@ async def handle_giveaways_create(request: web.Request) -> web.Response:
     except discord.HTTPException as e:
         return json_error("internal_error", f"Discord error: {e}", 500)
 
-    return web.json_response(_giveaway_to_dict(giveaway_obj), status=201)
+    return json_response(_giveaway_to_dict(giveaway_obj), status=201)
 
 
 async def handle_giveaway_end(request: web.Request) -> web.Response:
@@ -313,7 +314,7 @@ async def handle_giveaway_end(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error("internal_error", str(e), 500)
 
-    return web.json_response({"ended": True, "message_id": str(msg_id)})
+    return json_response({"ended": True, "message_id": str(msg_id)})
 
 
 async def handle_giveaway_reroll(request: web.Request) -> web.Response:
@@ -350,7 +351,7 @@ async def handle_giveaway_reroll(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error("internal_error", str(e), 500)
 
-    return web.json_response({"rerolled": True, "message_id": str(msg_id)})
+    return json_response({"rerolled": True, "message_id": str(msg_id)})
 
 
 async def handle_giveaway_delete(request: web.Request) -> web.Response:
@@ -376,7 +377,7 @@ async def handle_giveaway_delete(request: web.Request) -> web.Response:
     # Remove from config
     await cog.config.custom(GIVEAWAY_KEY, str(guild.id), str(msg_id)).clear()
 
-    return web.json_response({"deleted": str(msg_id)})
+    return json_response({"deleted": str(msg_id)})
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -430,7 +431,7 @@ async def handle_tags_list(request: web.Request) -> web.Response:
 
     tags.sort(key=lambda t: t.name)
     total = len(tags)
-    return web.json_response({
+    return json_response({
         "total": total,
         "limit": limit,
         "offset": offset,
@@ -454,7 +455,7 @@ async def handle_tag_get(request: web.Request) -> web.Response:
     if tag is None:
         return json_error("not_found", f"Tag '{name}' not found", 404)
 
-    return web.json_response(_tag_obj_to_dict(tag))
+    return json_response(_tag_obj_to_dict(tag))
 
 
 async def handle_tags_create(request: web.Request) -> web.Response:
@@ -499,7 +500,7 @@ async def handle_tags_create(request: web.Request) -> web.Response:
     )
     await tag.initialize()
 
-    return web.json_response(_tag_obj_to_dict(tag), status=201)
+    return json_response(_tag_obj_to_dict(tag), status=201)
 
 
 async def handle_tag_put(request: web.Request) -> web.Response:
@@ -537,7 +538,7 @@ async def handle_tag_put(request: web.Request) -> web.Response:
         tag.add_to_cache()
 
     await tag.update_config()
-    return web.json_response(_tag_obj_to_dict(tag))
+    return json_response(_tag_obj_to_dict(tag))
 
 
 async def handle_tag_delete(request: web.Request) -> web.Response:
@@ -557,7 +558,7 @@ async def handle_tag_delete(request: web.Request) -> web.Response:
         return json_error("not_found", f"Tag '{name}' not found", 404)
 
     await tag.delete()
-    return web.json_response({"deleted": name})
+    return json_response({"deleted": name})
 
 
 async def handle_tag_invoke(request: web.Request) -> web.Response:
@@ -637,7 +638,7 @@ async def handle_tag_invoke(request: web.Request) -> web.Response:
     tag.uses += 1
     await tag.update_config()
 
-    return web.json_response({"invoked": name, "uses": tag.uses, "variables": list(extra_vars.keys())})
+    return json_response({"invoked": name, "uses": tag.uses, "variables": list(extra_vars.keys())})
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -685,7 +686,7 @@ async def handle_rb_list(request: web.Request) -> web.Response:
         mode = modes_cfg.get(key, "add_or_remove")
         result.append(_rb_data_to_dict(key, buttons, mode))
 
-    return web.json_response(result)
+    return json_response(result)
 
 
 async def handle_rb_get(request: web.Request) -> web.Response:
@@ -712,7 +713,7 @@ async def handle_rb_get(request: web.Request) -> web.Response:
         return json_error("not_found", f"No roles-buttons configured for {key}", 404)
 
     mode = all_cfg.get("modes", {}).get(key, "add_or_remove")
-    return web.json_response(_rb_data_to_dict(key, buttons, mode))
+    return json_response(_rb_data_to_dict(key, buttons, mode))
 
 
 async def handle_rb_add_button(request: web.Request) -> web.Response:
@@ -763,7 +764,7 @@ async def handle_rb_add_button(request: web.Request) -> web.Response:
             btn_id = str(uuid.uuid4())[:5]
         rb[key][btn_id] = {"role": role.id, "emoji": emoji}
 
-    return web.json_response({"added": btn_id, "role_id": str(role.id), "emoji": emoji}, status=201)
+    return json_response({"added": btn_id, "role_id": str(role.id), "emoji": emoji}, status=201)
 
 
 async def handle_rb_delete_button(request: web.Request) -> web.Response:
@@ -796,7 +797,7 @@ async def handle_rb_delete_button(request: web.Request) -> web.Response:
             async with cog.config.guild(guild).modes() as modes:
                 modes.pop(key, None)
 
-    return web.json_response({"deleted": btn_id})
+    return json_response({"deleted": btn_id})
 
 
 async def handle_rb_mode_patch(request: web.Request) -> web.Response:
@@ -831,7 +832,7 @@ async def handle_rb_mode_patch(request: web.Request) -> web.Response:
         return json_error("not_found", f"No roles-buttons configured for {key}", 404)
 
     await cog.config.guild(guild).modes.set_raw(key, value=mode)
-    return web.json_response({"key": key, "mode": mode})
+    return json_response({"key": key, "mode": mode})
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -851,7 +852,7 @@ async def handle_rolesyncer_get(request: web.Request) -> web.Response:
         return json_error("cog_unavailable", "RoleSyncer cog is not loaded", 503)
 
     cfg = await cog.config.guild(guild).all()
-    return web.json_response({
+    return json_response({
         "onesync": [[str(r) for r in pair] for pair in cfg.get("onesync", [])],
         "twosync": [[str(r) for r in pair] for pair in cfg.get("twosync", [])],
     })
@@ -893,7 +894,7 @@ async def _rolesyncer_add(request: web.Request, sync_type: str) -> web.Response:
             return json_error("bad_request", "This sync pair already exists", 409)
         syncs.append(pair)
 
-    return web.json_response({"added": [str(r1), str(r2)], "type": sync_type}, status=201)
+    return json_response({"added": [str(r1), str(r2)], "type": sync_type}, status=201)
 
 
 async def handle_rolesyncer_add_one(request: web.Request) -> web.Response:
@@ -924,7 +925,7 @@ async def _rolesyncer_delete(request: web.Request, sync_type: str) -> web.Respon
             return json_error("not_found", f"Index {idx} out of range (0–{len(syncs)-1})", 404)
         removed = syncs.pop(idx)
 
-    return web.json_response({"deleted_index": idx, "pair": [str(r) for r in removed]})
+    return json_response({"deleted_index": idx, "pair": [str(r) for r in removed]})
 
 
 async def handle_rolesyncer_del_one(request: web.Request) -> web.Response:
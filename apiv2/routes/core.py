@@ -8,7 +8,10 @@ from typing import TYPE_CHECKING
 
 from aiohttp import web
 
-from ..server import APP_BOT_KEY, APP_START_TIME_KEY, json_error
+from ..cache import cached
+from ..dynamic import CATCH_ALL_PATH
+from ..encoding import json_response
+from ..server import APP_BOT_KEY, APP_ROUTE_TABLE_KEY, APP_START_TIME_KEY, json_error
 
 if TYPE_CHECKING:
     from redbot.core.bot import Red
@@ -34,7 +37,7 @@ async def handle_health(request: web.Request) -> web.Response:
 
     latency_ms = round(bot.latency * 1000, 1) if bot.latency else None
 
-    return web.json_response({
+    return json_response({
         "status": "ok",
         "bot": bot.user.name if bot.user else "unknown",
         "guilds": len(bot.guilds),
@@ -51,9 +54,12 @@ async def handle_info(request: web.Request) -> web.Response:
 
     # Auto-generate endpoint list from registered routes
     endpoints = []
-    for resource in request.app.router.resources():
+    resources = list(request.app.router.resources()) + request.app[APP_ROUTE_TABLE_KEY].resources()
+    for resource in resources:
         info = resource.get_info()
         path = info.get("formatter") or info.get("path") or str(resource)
+        if path == CATCH_ALL_PATH:
+            continue
         for route in resource:
             endpoints.append({
                 "method": route.method,
@@ -62,7 +68,7 @@ async def handle_info(request: web.Request) -> web.Response:
     # Sort by path then method
     endpoints.sort(key=lambda e: (e["path"], e["method"]))
 
-    return web.json_response({
+    return json_response({
         "bot_id": str(bot.user.id) if bot.user else None,
         "name": bot.user.name if bot.user else "unknown",
         "discriminator": bot.user.discriminator if bot.user else None,
@@ -73,6 +79,7 @@ async def handle_info(request: web.Request) -> web.Response:
     })
 
 
+@cached(ttl=30, tags=("guilds",))
 async def handle_guilds(request: web.Request) -> web.Response:
     """GET /api/v2/guilds — List all guilds the bot is in."""
     bot: "Red" = request.app[APP_BOT_KEY]
@@ -87,9 +94,10 @@ async def handle_guilds(request: web.Request) -> web.Response:
             "owner_id": str(guild.owner_id),
         })
 
-    return web.json_response(guilds)
+    return json_response(guilds)
 
 
+@cached(ttl=30, tags=("guild:{guild_id}",))
 async def handle_guild_detail(request: web.Request) -> web.Response:
     """GET /api/v2/guilds/{guild_id} — Detailed guild info."""
     bot: "Red" = request.app[APP_BOT_KEY]
@@ -126,7 +134,7 @@ async def handle_guild_detail(request: web.Request) -> web.Response:
             "member_count": len(role.members),
         })
 
-    return web.json_response({
+    return json_response({
         "id": str(guild.id),
         "name": guild.name,
         "icon_url": str(guild.icon.url) if guild.icon else None,
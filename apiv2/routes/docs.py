@@ -7,7 +7,9 @@ import logging
 
 from aiohttp import web
 
-from ..server import APP_BOT_KEY
+from ..encoding import json_response
+from ..dynamic import CATCH_ALL_PATH
+from ..server import APP_BOT_KEY, APP_ROUTE_TABLE_KEY
 
 logger = logging.getLogger("red.killerbite95.apiv2.routes.docs")
 
@@ -31,11 +33,16 @@ _PATH_TAG_RULES: list[tuple[str, str]] = [
     (r"^/api/v2/guilds$",               "Core"),
     (r"^/api/v2/guilds/\{[^}]+\}$",     "Core"),
     (r"^/api/v2/webhooks",              "Webhooks"),
+    (r"^/api/v2/stream$",               "Stream"),
+    (r"^/api/v2/batch$",                "Core"),
+    (r"^/api/v2/metrics$",              "Core"),
+    (r"^/api/v2/jobs",                  "Jobs"),
     # Members & roles
     (r"/bans",                          "Moderation"),
     (r"/kick$",                         "Moderation"),
     (r"/timeout",                       "Moderation"),
     (r"/members/\{[^}]+\}/roles",       "Roles"),
+    (r"/roles/\{[^}]+\}/members",       "Roles"),
     (r"/members",                       "Members"),
     (r"/guilds/\{[^}]+\}/roles",        "Roles"),
     # Channels & messaging
@@ -72,6 +79,8 @@ _TAG_DEFINITIONS: list[dict] = [
     {"name": "Messaging",        "description": "Send messages and embeds, add reactions"},
     {"name": "Moderation",       "description": "Kick, ban, unban, timeout"},
     {"name": "Webhooks",         "description": "Outgoing webhooks on Discord events"},
+    {"name": "Stream",           "description": "Live event stream over SSE or WebSocket"},
+    {"name": "Jobs",             "description": "Progress and cancellation of background operations (massmove, prune, bulk roles)"},
     {"name": "Economy",          "description": "Red bank balance, leaderboard, ExtendedEconomy costs — *cog optional*"},
     {"name": "Warnings",         "description": "User warnings via Red Mod cog"},
     {"name": "Modlog",           "description": "Modlog cases (ban, kick, warn…)"},
@@ -94,7 +103,7 @@ _TAG_DEFINITIONS: list[dict] = [
 
 # x-tagGroups for Redoc (ignored by SwaggerUI but harmless)
 _TAG_GROUPS: list[dict] = [
-    {"name": "🤖 Sistema",            "tags": ["Core", "Webhooks"]},
+    {"name": "🤖 Sistema",            "tags": ["Core", "Webhooks", "Stream", "Jobs"]},
     {"name": "👥 Miembros & Roles",   "tags": ["Members", "Roles", "Moderation"]},
     {"name": "💬 Canales",            "tags": ["Channels", "Messaging"]},
     {"name": "💰 Economía",           "tags": ["Economy", "ColaCoins"]},
@@ -143,9 +152,11 @@ def generate_openapi_spec(app: web.Application) -> dict:
         "paths": {},
     }
 
-    skip_paths = {f"{PREFIX}/openapi.json", f"{PREFIX}/docs"}
+    skip_paths = {f"{PREFIX}/openapi.json", f"{PREFIX}/docs", CATCH_ALL_PATH}
+    # External cog routes live in the route table, behind the catch-all
+    resources = list(app.router.resources()) + app[APP_ROUTE_TABLE_KEY].resources()
 
-    for resource in app.router.resources():
+    for resource in resources:
         info = resource.get_info()
         path = info.get("formatter") or info.get("path")
         if not path or not path.startswith(PREFIX) or path in skip_paths:
@@ -347,7 +358,7 @@ SWAGGER_HTML = """<!DOCTYPE html>
 async def handle_openapi(request: web.Request) -> web.Response:
     """GET /api/v2/openapi.json — Auto-generated OpenAPI 3.0 specification."""
     spec = generate_openapi_spec(request.app)
-    return web.json_response(spec)
+    return json_response(spec)
 
 
 async def handle_swagger_ui(request: web.Request) -> web.Response:
@@ -13,7 +13,9 @@ import discord
 from aiohttp import web
 from redbot.core import bank
 
-from ..server import APP_BOT_KEY, json_error
+from ..encoding import json_response
+from ..server import APP_BOT_KEY, APP_JOB_MANAGER_KEY, json_error
+from .jobs import job_accepted
 
 if TYPE_CHECKING:
     from redbot.core.bot import Red
@@ -91,7 +93,7 @@ async def handle_currency_get(request: web.Request) -> web.Response:
     default_balance = await bank.get_default_balance(guild)
     max_balance = await bank.get_max_balance(guild)
 
-    return web.json_response({
+    return json_response({
         "name": currency_name,
         "default_balance": default_balance,
         "max_balance": max_balance,
@@ -143,7 +145,7 @@ async def handle_currency_patch(request: web.Request) -> web.Response:
     if not updated:
         return json_error(400, "bad_request", "No valid fields to update (name, default_balance, max_balance)")
 
-    return web.json_response({"updated": updated})
+    return json_response({"updated": updated})
 
 
 async def handle_balance_get(request: web.Request) -> web.Response:
@@ -172,7 +174,7 @@ async def handle_balance_get(request: web.Request) -> web.Response:
 
     currency_name = await bank.get_currency_name(guild)
 
-    return web.json_response({
+    return json_response({
         "user_id": str(user_id),
         "balance": balance,
         "currency": currency_name,
@@ -220,7 +222,7 @@ async def handle_balance_patch(request: web.Request) -> web.Response:
         return json_error(400, "bad_request", str(e))
 
     currency_name = await bank.get_currency_name(guild)
-    return web.json_response({
+    return json_response({
         "user_id": str(user_id),
         "balance": new_balance,
         "currency": currency_name,
@@ -274,7 +276,7 @@ async def handle_transfer(request: web.Request) -> web.Response:
     to_bal = await bank.get_balance(to_member)
     currency_name = await bank.get_currency_name(guild)
 
-    return web.json_response({
+    return json_response({
         "transferred": amount,
         "currency": currency_name,
         "from": {"user_id": str(from_id), "new_balance": from_bal},
@@ -316,7 +318,7 @@ async def handle_leaderboard(request: web.Request) -> web.Response:
     for i, entry in enumerate(page):
         entry["rank"] = offset + i + 1
 
-    return web.json_response({
+    return json_response({
         "currency": currency_name,
         "total": total,
         "limit": limit,
@@ -340,8 +342,17 @@ async def handle_prune(request: web.Request) -> web.Response:
     if not data.get("confirm"):
         return json_error(400, "bad_request", "Send { \"confirm\": true } to confirm bank prune")
 
-    pruned = await bank.bank_prune(bot, guild)
-    return web.json_response({"pruned_accounts": pruned})
+    async def run(job):
+        pruned = await bank.bank_prune(bot, guild)
+        return {"pruned_accounts": pruned}
+
+    job = request.app[APP_JOB_MANAGER_KEY].submit(
+        "economy_prune",
+        run,
+        guild_id=guild.id,
+        key_name=request.get("api_key_name"),
+    )
+    return job_accepted(job)
 
 
 # ──────────────────────────── ExtendedEconomy ────────────────────────────
@@ -384,7 +395,7 @@ async def handle_costs_list(request: web.Request) -> web.Response:
             "value": cc.value,
         })
 
-    return web.json_response({
+    return json_response({
         "guild_costs": costs,
         "global_costs": global_costs,
     })
@@ -444,7 +455,7 @@ async def handle_costs_create(request: web.Request) -> web.Response:
     guild_conf.command_costs[cmd_name] = cc
     await cog.save()
 
-    return web.json_response({
+    return json_response({
         "command": cmd_name,
         "cost": cc.cost,
         "duration": cc.duration,
@@ -504,7 +515,7 @@ async def handle_costs_update(request: web.Request) -> web.Response:
 
     await cog.save()
 
-    return web.json_response({
+    return json_response({
         "command": cmd_name,
         "cost": cc.cost,
         "duration": cc.duration,
@@ -535,7 +546,7 @@ async def handle_costs_delete(request: web.Request) -> web.Response:
     del guild_conf.command_costs[cmd_name]
     await cog.save()
 
-    return web.json_response({"deleted": cmd_name})
+    return json_response({"deleted": cmd_name})
 
 
 async def handle_log_channels_get(request: web.Request) -> web.Response:
@@ -555,7 +566,7 @@ async def handle_log_channels_get(request: web.Request) -> web.Response:
     def ch_str(val: int) -> str | None:
         return str(val) if val else None
 
-    return web.json_response({
+    return json_response({
         "default_log_channel": ch_str(logs.default_log_channel),
         "set_balance": ch_str(logs.set_balance),
         "transfer_credits": ch_str(logs.transfer_credits),
@@ -610,4 +621,4 @@ async def handle_log_channels_patch(request: web.Request) -> web.Response:
             updated[field] = str(ch_id)
 
     await cog.save()
-    return web.json_response({"updated": updated})
+    return json_response({"updated": updated})
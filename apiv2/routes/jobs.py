@@ -0,0 +1,73 @@
+"""
+Background job API routes: progress, partial results and cancellation.
+"""
+
+import logging
+
+from aiohttp import web
+
+from ..encoding import json_response
+from ..server import APP_JOB_MANAGER_KEY, json_error
+
+logger = logging.getLogger("red.killerbite95.apiv2.routes.jobs")
+
+PREFIX = "/api/v2"
+
+
+def register_routes(app: web.Application):
+    """Register job routes."""
+    app.router.add_get(f"{PREFIX}/jobs", handle_jobs_list)
+    app.router.add_get(f"{PREFIX}/jobs/{{job_id}}", handle_job_detail)
+    app.router.add_delete(f"{PREFIX}/jobs/{{job_id}}", handle_job_cancel)
+
+
+def job_accepted(job) -> web.Response:
+    """202 response pointing the client at the job status endpoint."""
+    status_url = f"{PREFIX}/jobs/{job.id}"
+    resp = json_response({
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "status_url": status_url,
+    }, status=202)
+    resp.headers["Location"] = status_url
+    return resp
+
+
+async def handle_jobs_list(request: web.Request) -> web.Response:
+    """GET /api/v2/jobs — List recent background jobs."""
+    jobs = request.app[APP_JOB_MANAGER_KEY]
+    status_filter = request.query.get("status")
+    result = [
+        job.to_dict() for job in jobs.list_jobs()
+        if not status_filter or job.status == status_filter
+    ]
+    return json_response({"jobs": result, "count": len(result)})
+
+
+async def handle_job_detail(request: web.Request) -> web.Response:
+    """GET /api/v2/jobs/{job_id}?results_offset=0&results_limit=100 — Job progress and partial results."""
+    jobs = request.app[APP_JOB_MANAGER_KEY]
+    job = jobs.get(request.match_info["job_id"])
+    if job is None:
+        return json_error(404, "not_found", f"Job {request.match_info['job_id']} not found")
+
+    try:
+        offset = max(0, int(request.query.get("results_offset", "0")))
+        limit = min(int(request.query.get("results_limit", "100")), 1000)
+    except ValueError:
+        return json_error(400, "bad_request", "results_offset and results_limit must be integers")
+
+    return json_response(job.to_dict(results_offset=offset, results_limit=limit))
+
+
+async def handle_job_cancel(request: web.Request) -> web.Response:
+    """DELETE /api/v2/jobs/{job_id} — Cancel a queued or running job."""
+    jobs = request.app[APP_JOB_MANAGER_KEY]
+    job_id = request.match_info["job_id"]
+    job = jobs.get(job_id)
+    if job is None:
+        return json_error(404, "not_found", f"Job {job_id} not found")
+    if not jobs.cancel(job_id):
+        return json_error(409, "conflict", f"Job {job_id} already {job.status}")
+    return json_response({"ok": True, "job_id": job_id, "status": job.status})
@@ -7,7 +7,9 @@ from typing import TYPE_CHECKING
 
 from aiohttp import web
 
-from ..server import APP_BOT_KEY, json_error
+from ..encoding import dumps_bytes, json_response
+from ..server import APP_BOT_KEY, APP_JOB_MANAGER_KEY, json_error
+from .jobs import job_accepted
 
 if TYPE_CHECKING:
     from redbot.core.bot import Red
@@ -16,6 +18,8 @@ logger = logging.getLogger("red.killerbite95.apiv2.routes.members")
 
 PREFIX = "/api/v2"
 
+MAX_BULK_ROLE_MEMBERS = 25000
+
 
 def register_routes(app: web.Application):
     """Register all member and role routes."""
@@ -38,6 +42,10 @@ def register_routes(app: web.Application):
         f"{PREFIX}/guilds/{{guild_id}}/members/{{user_id}}/roles",
         handle_roles_bulk,
     )
+    app.router.add_post(
+        f"{PREFIX}/guilds/{{guild_id}}/roles/{{role_id}}/members",
+        handle_role_add_members,
+    )
 
 
 # ==================== HELPERS ====================
@@ -94,7 +102,7 @@ async def handle_members_list(request: web.Request) -> web.Response:
         members = [m for m in members if m.id > after]
     members = members[:limit]
 
-    return web.json_response({
+    return json_response({
         "members": [_serialize_member(m) for m in members],
         "count": len(members),
         "total": guild.member_count,
@@ -117,7 +125,7 @@ async def handle_member_detail(request: web.Request) -> web.Response:
     if member is None:
         return json_error(404, "not_found", f"Member {user_id} not found in guild")
 
-    return web.json_response(_serialize_member(member))
+    return json_response(_serialize_member(member))
 
 
 async def handle_member_patch(request: web.Request) -> web.Response:
@@ -150,7 +158,7 @@ async def handle_member_patch(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(403, "forbidden", f"Cannot change nickname: {e}")
 
-    return web.json_response({"ok": True, "nickname": nickname})
+    return json_response({"ok": True, "nickname": nickname})
 
 
 # ==================== ROLES ====================
@@ -175,7 +183,7 @@ async def handle_roles_list(request: web.Request) -> web.Response:
             "member_count": len(role.members),
         })
 
-    return web.json_response(roles)
+    return json_response(roles)
 
 
 async def handle_role_add(request: web.Request) -> web.Response:
@@ -200,14 +208,14 @@ async def handle_role_add(request: web.Request) -> web.Response:
         return json_error(404, "not_found", f"Role {role_id} not found in guild")
 
     if role in member.roles:
-        return web.json_response({"ok": True, "action": "already_has_role"})
+        return json_response({"ok": True, "action": "already_has_role"})
 
     try:
         await member.add_roles(role, reason="APIv2")
     except Exception as e:
         return json_error(403, "forbidden", f"Cannot add role: {e}")
 
-    return web.json_response({"ok": True, "action": "role_added"})
+    return json_response({"ok": True, "action": "role_added"})
 
 
 async def handle_role_remove(request: web.Request) -> web.Response:
@@ -232,14 +240,14 @@ async def handle_role_remove(request: web.Request) -> web.Response:
         return json_error(404, "not_found", f"Role {role_id} not found in guild")
 
     if role not in member.roles:
-        return web.json_response({"ok": True, "action": "does_not_have_role"})
+        return json_response({"ok": True, "action": "does_not_have_role"})
 
     try:
         await member.remove_roles(role, reason="APIv2")
     except Exception as e:
         return json_error(403, "forbidden", f"Cannot remove role: {e}")
 
-    return web.json_response({"ok": True, "action": "role_removed"})
+    return json_response({"ok": True, "action": "role_removed"})
 
 
 async def handle_roles_bulk(request: web.Request) -> web.Response:
@@ -289,7 +297,121 @@ async def handle_roles_bulk(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(403, "forbidden", f"Cannot set roles: {e}")
 
-    return web.json_response({
+    return json_response({
         "ok": True,
         "roles_set": [str(r.id) for r in roles_to_set],
     })
+
+
+async def handle_role_add_members(request: web.Request) -> web.StreamResponse:
+    """POST /api/v2/guilds/{guild_id}/roles/{role_id}/members?stream=true — Grant a role to many members.
+
+    Body: { "user_ids": ["123", "456", ...] }
+
+    Runs as a background job paced by the guild's member-role bucket. By
+    default returns 202 with the job; with ``stream=true`` the per-member
+    results are streamed back as NDJSON while the job runs.
+    """
+    bot: "Red" = request.app[APP_BOT_KEY]
+    guild, err = _get_guild_or_error(bot, request.match_info["guild_id"])
+    if err:
+        return err
+
+    try:
+        role_id = int(request.match_info["role_id"])
+    except ValueError:
+        return json_error(400, "bad_request", "role_id must be an integer")
+
+    role = guild.get_role(role_id)
+    if role is None:
+        return json_error(404, "not_found", f"Role {role_id} not found in guild")
+    if role.managed or role.is_default():
+        return json_error(422, "validation_error", "Managed and @everyone roles cannot be assigned")
+    if role >= guild.me.top_role:
+        return json_error(403, "forbidden", "Role is above the bot's highest role")
+
+    try:
+        body = await request.json()
+    except Exception:
+        return json_error(400, "bad_request", "Invalid JSON body")
+
+    raw_ids = body.get("user_ids") if isinstance(body, dict) else None
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return json_error(422, "validation_error", "user_ids must be a non-empty list of user IDs")
+    if len(raw_ids) > MAX_BULK_ROLE_MEMBERS:
+        return json_error(422, "validation_error", f"At most {MAX_BULK_ROLE_MEMBERS} user_ids per call")
+
+    user_ids = []
+    seen = set()
+    for uid in raw_ids:
+        try:
+            uid_int = int(uid)
+        except (ValueError, TypeError):
+            return json_error(422, "validation_error", f"Invalid user_id: {uid}")
+        if uid_int not in seen:
+            seen.add(uid_int)
+            user_ids.append(uid_int)
+
+    jobs = request.app[APP_JOB_MANAGER_KEY]
+
+    async def run(job):
+        job.total = len(user_ids)
+        pending = []
+        already_had = 0
+        for uid in user_ids:
+            member = guild.get_member(uid)
+            if member is None:
+                job.record(uid, False, "member_not_found")
+            elif role in member.roles:
+                job.record(uid, True, "already_has_role")
+                already_had += 1
+            else:
+                pending.append(member)
+
+        async def grant(member):
+            await member.add_roles(role, reason="APIv2 bulk role grant")
+            return "role_added"
+
+        await jobs.run_items(
+            job, pending, grant,
+            key=lambda m: m.id,
+            bucket=jobs.bucket("member_roles", guild.id),
+        )
+        # Skipped members count as succeeded in the job; report them apart
+        return {"role_id": str(role.id), "added": job.succeeded - already_had, "already_had": already_had}
+
+    job = jobs.submit(
+        "role_add_members",
+        run,
+        guild_id=guild.id,
+        key_name=request.get("api_key_name"),
+        params={"role_id": str(role.id), "user_count": len(user_ids)},
+    )
+
+    if request.query.get("stream", "").lower() not in ("1", "true", "yes"):
+        return job_accepted(job)
+
+    # The job keeps running if the client disconnects; it can still be polled
+    results = job.watch()
+    resp = web.StreamResponse(headers={
+        "Content-Type": "application/x-ndjson",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    try:
+        await resp.prepare(request)
+        await resp.write(dumps_bytes({"job_id": job.id, "status_url": f"{PREFIX}/jobs/{job.id}"}) + b"\n")
+        while True:
+            entry = await results.get()
+            if entry is None:
+                break
+            line = {"user_id": entry["item"], "ok": entry["ok"]}
+            if "detail" in entry:
+                line["detail"] = entry["detail"]
+            await resp.write(dumps_bytes(line) + b"\n")
+        await resp.write(dumps_bytes({"done": True, **job.to_dict()}) + b"\n")
+    except ConnectionResetError:
+        pass  # Client disconnected
+    finally:
+        job.unwatch(results)
+    return resp
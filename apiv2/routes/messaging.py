@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 import discord
 from aiohttp import web
 
+from ..encoding import json_response
 from ..server import APP_BOT_KEY, json_error
 
 if TYPE_CHECKING:
@@ -69,7 +70,7 @@ async def handle_channels_list(request: web.Request) -> web.Response:
         channels.append(data)
 
     channels.sort(key=lambda c: c["position"])
-    return web.json_response(channels)
+    return json_response(channels)
 
 
 async def handle_send_message(request: web.Request) -> web.Response:
@@ -133,7 +134,7 @@ async def handle_send_message(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(500, "internal_error", f"Send failed: {e}")
 
-    return web.json_response({
+    return json_response({
         "ok": True,
         "message_id": str(msg.id),
         "channel_id": str(channel.id),
@@ -178,4 +179,4 @@ async def handle_add_reaction(request: web.Request) -> web.Response:
     except discord.HTTPException as e:
         return json_error(422, "validation_error", f"Invalid emoji or reaction failed: {e}")
 
-    return web.json_response({"ok": True, "emoji": emoji, "message_id": str(message_id)})
+    return json_response({"ok": True, "emoji": emoji, "message_id": str(message_id)})
@@ -0,0 +1,39 @@
+"""
+Metrics API route: per-route request counts and latency.
+"""
+
+import logging
+
+from aiohttp import web
+
+from ..encoding import json_response
+from ..server import APP_METRICS_KEY
+
+logger = logging.getLogger("red.killerbite95.apiv2.routes.metrics")
+
+PREFIX = "/api/v2"
+
+
+def register_routes(app: web.Application):
+    """Register the metrics route."""
+    app.router.add_get(f"{PREFIX}/metrics", handle_metrics)
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """GET /api/v2/metrics?format=json|prometheus — Per-route request metrics.
+
+    Prometheus text is returned for ``format=prometheus`` or when the client
+    asks for ``text/plain`` (as Prometheus scrapers do).
+    """
+    metrics = request.app[APP_METRICS_KEY]
+    fmt = request.query.get("format")
+    if fmt is None and "text/plain" in request.headers.get("Accept", ""):
+        fmt = "prometheus"
+
+    if fmt == "prometheus":
+        return web.Response(
+            text=metrics.prometheus(),
+            content_type="text/plain",
+            headers={"X-Content-Type-Options": "nosniff"},
+        )
+    return json_response(metrics.snapshot())
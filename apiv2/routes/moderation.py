@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING
 import discord
 from aiohttp import web
 
+from ..encoding import json_response
 from ..server import APP_BOT_KEY, json_error
 
 if TYPE_CHECKING:
@@ -88,7 +89,7 @@ async def handle_kick(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(500, "internal_error", f"Kick failed: {e}")
 
-    return web.json_response({"ok": True, "action": "kicked", "user_id": str(user_id)})
+    return json_response({"ok": True, "action": "kicked", "user_id": str(user_id)})
 
 
 async def handle_ban(request: web.Request) -> web.Response:
@@ -123,7 +124,7 @@ async def handle_ban(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(500, "internal_error", f"Ban failed: {e}")
 
-    return web.json_response({"ok": True, "action": "banned", "user_id": str(user_id)})
+    return json_response({"ok": True, "action": "banned", "user_id": str(user_id)})
 
 
 async def handle_unban(request: web.Request) -> web.Response:
@@ -147,7 +148,7 @@ async def handle_unban(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(500, "internal_error", f"Unban failed: {e}")
 
-    return web.json_response({"ok": True, "action": "unbanned", "user_id": str(user_id)})
+    return json_response({"ok": True, "action": "unbanned", "user_id": str(user_id)})
 
 
 async def handle_timeout_add(request: web.Request) -> web.Response:
@@ -185,7 +186,7 @@ async def handle_timeout_add(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(500, "internal_error", f"Timeout failed: {e}")
 
-    return web.json_response({
+    return json_response({
         "ok": True,
         "action": "timeout_applied",
         "user_id": str(user_id),
@@ -216,4 +217,4 @@ async def handle_timeout_remove(request: web.Request) -> web.Response:
     except Exception as e:
         return json_error(500, "internal_error", f"Remove timeout failed: {e}")
 
-    return web.json_response({"ok": True, "action": "timeout_removed", "user_id": str(user_id)})
+    return json_response({"ok": True, "action": "timeout_removed", "user_id": str(user_id)})
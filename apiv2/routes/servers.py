@@ -7,6 +7,8 @@ from typing import TYPE_CHECKING
 
 from aiohttp import web
 
+from ..cache import cached
+from ..encoding import json_response
 from ..server import APP_BOT_KEY, json_error
 
 if TYPE_CHECKING:
@@ -66,6 +68,7 @@ def _serialize_server(key: str, data: dict) -> dict:
     }
 
 
+@cached(ttl=30, tags=("game-servers:{guild_id}",))
 async def handle_servers_list(request: web.Request) -> web.Response:
     """GET /api/v2/guilds/{guild_id}/game-servers"""
     bot: "Red" = request.app[APP_BOT_KEY]
@@ -79,7 +82,7 @@ async def handle_servers_list(request: web.Request) -> web.Response:
     servers = await cog.config.guild(guild).servers()
     result = [_serialize_server(key, data) for key, data in servers.items()]
 
-    return web.json_response(result)
+    return json_response(result)
 
 
 async def handle_server_detail(request: web.Request) -> web.Response:
@@ -138,4 +141,4 @@ async def handle_server_detail(request: web.Request) -> web.Response:
     except Exception as e:
         data["live"] = {"error": str(e)}
 
-    return web.json_response(data)
+    return json_response(data)
@@ -0,0 +1,148 @@
+"""
+Live event stream routes: Server-Sent Events and WebSocket.
+"""
+
+import asyncio
+import json
+import logging
+
+from aiohttp import web, WSMsgType
+
+from ..server import APP_EVENT_HUB_KEY, json_error
+from ..stream import STREAM_EVENTS
+
+logger = logging.getLogger("red.killerbite95.apiv2.routes.stream")
+
+PREFIX = "/api/v2"
+
+HEARTBEAT_SECONDS = 15
+
+
+def register_routes(app: web.Application):
+    """Register live stream routes."""
+    app.router.add_get(f"{PREFIX}/stream", handle_stream)
+
+
+def _parse_events(raw) -> tuple[frozenset[str] | None, str | None]:
+    """Parse an event filter (comma string or list). Returns (events, error)."""
+    if raw is None or raw == "":
+        return frozenset(STREAM_EVENTS), None
+    if isinstance(raw, str):
+        raw = [e.strip() for e in raw.split(",") if e.strip()]
+    if not isinstance(raw, list) or not all(isinstance(e, str) for e in raw):
+        return None, "events must be a list of event names"
+    invalid = set(raw) - STREAM_EVENTS
+    if invalid:
+        return None, (
+            f"Invalid events: {', '.join(sorted(invalid))}. "
+            f"Supported: {', '.join(sorted(STREAM_EVENTS))}"
+        )
+    return frozenset(raw), None
+
+
+async def handle_stream(request: web.Request) -> web.StreamResponse:
+    """GET /api/v2/stream?events=member_join,message&guild_id=123 — Live event stream (SSE or WebSocket)."""
+    hub = request.app[APP_EVENT_HUB_KEY]
+    if hub is None:
+        return json_error(503, "unavailable", "Event stream is not enabled")
+
+    events, error = _parse_events(request.query.get("events"))
+    if error:
+        return json_error(422, "validation_error", error)
+
+    guild_id = None
+    if request.query.get("guild_id"):
+        try:
+            guild_id = int(request.query["guild_id"])
+        except ValueError:
+            return json_error(400, "bad_request", "guild_id must be an integer")
+
+    sub = hub.subscribe(request.get("api_key_name", "-"), events, guild_id)
+    if sub is None:
+        return json_error(503, "unavailable", "Too many open stream connections")
+
+    try:
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await _serve_websocket(request, hub, sub)
+        return await _serve_sse(request, sub)
+    finally:
+        hub.unsubscribe(sub)
+
+
+async def _serve_sse(request: web.Request, sub) -> web.StreamResponse:
+    resp = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",  # Disable nginx response buffering
+        "Access-Control-Allow-Origin": "*",
+    })
+    await resp.prepare(request)
+    await resp.write(b"retry: 3000\n\n")
+
+    reported_drops = 0
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(sub.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await resp.write(b": keepalive\n\n")
+                continue
+            if item is None:
+                break
+
+            if sub.dropped != reported_drops:
+                notice = json.dumps({"dropped": sub.dropped - reported_drops})
+                await resp.write(f"event: dropped\ndata: {notice}\n\n".encode())
+                reported_drops = sub.dropped
+
+            seq, event, body = item
+            await resp.write(f"id: {seq}\nevent: {event}\ndata: ".encode() + body + b"\n\n")
+    except ConnectionResetError:
+        pass  # Client disconnected
+
+    return resp
+
+
+async def _serve_websocket(request: web.Request, hub, sub) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse(heartbeat=HEARTBEAT_SECONDS * 2)
+    await ws.prepare(request)
+
+    async def reader():
+        # Clients may send {"events": [...]} to change their subscription
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            try:
+                data = json.loads(msg.data)
+            except json.JSONDecodeError:
+                await ws.send_json({"error": "bad_request", "message": "Invalid JSON"})
+                continue
+            events, error = _parse_events(data.get("events") if isinstance(data, dict) else None)
+            if error:
+                await ws.send_json({"error": "validation_error", "message": error})
+                continue
+            hub.update_events(sub, events)
+            await ws.send_json({"subscribed": sorted(events)})
+        sub.push(None)  # Client went away — wake the writer
+
+    reader_task = asyncio.create_task(reader())
+    reported_drops = 0
+    try:
+        await ws.send_json({"subscribed": sorted(sub.events)})
+        while not ws.closed:
+            item = await sub.queue.get()
+            if item is None:
+                break
+            if sub.dropped != reported_drops:
+                await ws.send_json({"event": "dropped", "dropped": sub.dropped - reported_drops})
+                reported_drops = sub.dropped
+            await ws.send_str(item[2].decode("utf-8"))
+    except ConnectionResetError:
+        pass
+    finally:
+        reader_task.cancel()
+        if not ws.closed:
+            await ws.close()
+
+    return ws
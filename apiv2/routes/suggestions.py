@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 
 from aiohttp import web
 
+from ..encoding import json_response
 from ..server import APP_BOT_KEY, json_error
 
 if TYPE_CHECKING:
@@ -22,6 +23,9 @@ VALID_STATUSES = {
     "approved", "implemented", "denied", "duplicate", "wont_do",
 }
 
+# Listing orders (mirrors suggestions.ranking.SORT_ORDERS)
+VALID_SORTS = ("newest", "top", "controversial", "hot")
+
 
 def register_routes(app: web.Application):
     """Register SimpleSuggestions routes."""
@@ -72,7 +76,11 @@ def _serialize_suggestion(s) -> dict:
 
 
 async def handle_suggestions_list(request: web.Request) -> web.Response:
-    """GET /api/v2/guilds/{guild_id}/suggestions?status=pending&limit=50&offset=0"""
+    """GET /api/v2/guilds/{guild_id}/suggestions?status=pending&sort=top&q=text&limit=50&offset=0
+
+    ``sort`` is newest (default), top, controversial or hot. With ``q`` the
+    results are ranked by relevance instead.
+    """
     bot: "Red" = request.app[APP_BOT_KEY]
     guild, err = _get_guild_or_error(bot, request.match_info["guild_id"])
     if err:
@@ -100,11 +108,40 @@ async def handle_suggestions_list(request: web.Request) -> web.Response:
         if SuggestionStatus:
             filter_status = SuggestionStatus(status_filter)
 
-    suggestions = await cog.storage.get_all_suggestions(guild, status_filter=filter_status)
-    total = len(suggestions)
-    suggestions = suggestions[offset : offset + limit]
-
-    return web.json_response({
+    query = request.query.get("q", "").strip()
+    if query:
+        if not hasattr(cog.storage, "search_suggestions"):
+            return json_error(501, "not_supported", "This SimpleSuggestions version does not support search")
+        total, results = await cog.storage.search_suggestions(
+            guild, query, status_filter=filter_status, offset=offset, limit=limit
+        )
+        serialized = []
+        for s, relevance in results:
+            item = _serialize_suggestion(s)
+            item["relevance"] = relevance
+            serialized.append(item)
+        return json_response({
+            "suggestions": serialized,
+            "count": len(serialized),
+            "total": total,
+        })
+
+    sort = request.query.get("sort", "newest")
+    if sort not in VALID_SORTS:
+        return json_error(422, "validation_error", f"Invalid sort. Valid: {', '.join(VALID_SORTS)}")
+
+    if hasattr(cog.storage, "list_suggestions"):
+        total, suggestions = await cog.storage.list_suggestions(
+            guild, sort=sort, status_filter=filter_status, offset=offset, limit=limit
+        )
+    elif sort != "newest":
+        return json_error(501, "not_supported", "This SimpleSuggestions version only lists newest first")
+    else:
+        suggestions = await cog.storage.get_all_suggestions(guild, status_filter=filter_status)
+        total = len(suggestions)
+        suggestions = suggestions[offset : offset + limit]
+
+    return json_response({
         "suggestions": [_serialize_suggestion(s) for s in suggestions],
         "count": len(suggestions),
         "total": total,
@@ -130,7 +167,7 @@ async def handle_suggestion_detail(request: web.Request) -> web.Response:
     if suggestion is None:
         return json_error(404, "not_found", f"Suggestion #{suggestion_id} not found")
 
-    return web.json_response(_serialize_suggestion(suggestion))
+    return json_response(_serialize_suggestion(suggestion))
 
 
 async def handle_suggestion_update(request: web.Request) -> web.Response:
@@ -201,7 +238,7 @@ async def handle_suggestion_update(request: web.Request) -> web.Response:
     except Exception:
         pass
 
-    return web.json_response({
+    return json_response({
         "ok": True,
         "suggestion": _serialize_suggestion(updated),
     })
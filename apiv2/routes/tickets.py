@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING
 import discord
 from aiohttp import web
 
+from ..cache import cached
+from ..encoding import json_response
 from ..server import APP_BOT_KEY, json_error
 
 if TYPE_CHECKING:
@@ -73,7 +75,7 @@ def _serialize_ticket(channel_id: str, owner_id: str, ticket: dict) -> dict:
 
 
 async def handle_tickets_list(request: web.Request) -> web.Response:
-    """GET /api/v2/guilds/{guild_id}/tickets?status=open&limit=50&offset=0"""
+    """GET /api/v2/guilds/{guild_id}/tickets?status=open&owner_id=&panel=&claimed_by=&limit=50&offset=0"""
     bot: "Red" = request.app[APP_BOT_KEY]
     guild, err = _get_guild_or_error(bot, request.match_info["guild_id"])
     if err:
@@ -85,10 +87,31 @@ async def handle_tickets_list(request: web.Request) -> web.Response:
     status_filter = request.query.get("status")
     try:
         limit = min(int(request.query.get("limit", "50")), 500)
-        offset = int(request.query.get("offset", "0"))
+        offset = max(0, int(request.query.get("offset", "0")))
     except ValueError:
         return json_error(400, "bad_request", "limit and offset must be integers")
 
+    index = getattr(cog, "ticket_index", None)
+    if index is not None:
+        await index.ensure_guild(guild.id, cog.config)
+        total, page = index.query(
+            guild.id,
+            status=status_filter or None,
+            owner_id=request.query.get("owner_id") or None,
+            panel=request.query.get("panel") or None,
+            claimed_by=request.query.get("claimed_by") or None,
+            offset=offset,
+            limit=limit,
+        )
+        tickets = [_serialize_ticket(cid, uid, ticket) for cid, uid, ticket in page]
+        return json_response({
+            "tickets": tickets,
+            "count": len(tickets),
+            "total": total,
+            "counts": index.counts(guild.id),
+        })
+
+    # Older TicketsTrini without the index: scan config
     opened = await cog.config.guild(guild).opened()
     tickets = []
     for uid, channels in opened.items():
@@ -103,7 +126,7 @@ async def handle_tickets_list(request: web.Request) -> web.Response:
     total = len(tickets)
     tickets = tickets[offset : offset + limit]
 
-    return web.json_response({"tickets": tickets, "count": len(tickets), "total": total})
+    return json_response({"tickets": tickets, "count": len(tickets), "total": total})
 
 
 async def handle_ticket_detail(request: web.Request) -> web.Response:
@@ -118,16 +141,28 @@ async def handle_ticket_detail(request: web.Request) -> web.Response:
 
     channel_id = request.match_info["channel_id"]
 
+    index = getattr(cog, "ticket_index", None)
+    if index is not None:
+        await index.ensure_guild(guild.id, cog.config)
+        entry = index.get(guild.id, channel_id)
+        if entry is None:
+            return json_error(404, "not_found", f"Ticket with channel {channel_id} not found")
+        uid, ticket_data = entry
+        ticket = _serialize_ticket(channel_id, uid, ticket_data)
+        ticket["notes"] = ticket_data.get("notes", [])
+        return json_response(ticket)
+
     opened = await cog.config.guild(guild).opened()
     for uid, channels in opened.items():
         if channel_id in channels:
             ticket = _serialize_ticket(channel_id, uid, channels[channel_id])
             ticket["notes"] = channels[channel_id].get("notes", [])
-            return web.json_response(ticket)
+            return json_response(ticket)
 
     return json_error(404, "not_found", f"Ticket with channel {channel_id} not found")
 
 
+@cached(ttl=60, tags=("ticket-panels:{guild_id}",))
 async def handle_panels_list(request: web.Request) -> web.Response:
     """GET /api/v2/guilds/{guild_id}/tickets/panels"""
     bot: "Red" = request.app[APP_BOT_KEY]
@@ -157,7 +192,7 @@ async def handle_panels_list(request: web.Request) -> web.Response:
             "priority": panel.get("priority", 0),
         })
 
-    return web.json_response(result)
+    return json_response(result)
 
 
 async def handle_ticket_close(request: web.Request) -> web.Response:
@@ -228,7 +263,7 @@ async def handle_ticket_close(request: web.Request) -> web.Response:
         logger.error(f"Failed to close ticket {channel_id}: {e}", exc_info=True)
         return json_error(500, "internal_error", f"Failed to close ticket: {e}")
 
-    return web.json_response({"ok": True, "action": "ticket_closed", "channel_id": channel_id_str})
+    return json_response({"ok": True, "action": "ticket_closed", "channel_id": channel_id_str})
 
 
 async def handle_ticket_message(request: web.Request) -> web.Response:
@@ -274,7 +309,7 @@ async def handle_ticket_message(request: web.Request) -> web.Response:
     except discord.Forbidden:
         return json_error(403, "forbidden", "Bot lacks permission to send in this channel")
 
-    return web.json_response({
+    return json_response({
         "ok": True,
         "message_id": str(msg.id),
         "channel_id": str(channel_id),
@@ -11,6 +11,9 @@ from typing import Any, Dict
 import discord
 from aiohttp import web
 
+from ..encoding import json_response
+from .jobs import job_accepted
+
 
 log = logging.getLogger("red.killerbite95.apiv2.utilities")
 
@@ -41,7 +44,7 @@ async def get_welcome(request: web.Request) -> web.Response:
         raise web.HTTPServiceUnavailable(reason="Welcome cog not loaded")
 
     cfg = await cog.config.guild(guild).all()
-    return web.json_response(cfg)
+    return json_response(cfg)
 
 
 async def patch_welcome(request: web.Request) -> web.Response:
@@ -63,7 +66,7 @@ async def patch_welcome(request: web.Request) -> web.Response:
     for key, value in updates.items():
         await guild_cfg.get_attr(key).set(value)
 
-    return web.json_response({"updated": list(updates.keys())})
+    return json_response({"updated": list(updates.keys())})
 
 
 async def get_welcome_messages(request: web.Request) -> web.Response:
@@ -80,7 +83,7 @@ async def get_welcome_messages(request: web.Request) -> web.Response:
         raise web.HTTPServiceUnavailable(reason="Welcome cog not loaded")
 
     messages = await cog.config.guild(guild).get_attr(event).messages()
-    return web.json_response({"event": event, "messages": messages})
+    return json_response({"event": event, "messages": messages})
 
 
 async def post_welcome_message(request: web.Request) -> web.Response:
@@ -105,7 +108,7 @@ async def post_welcome_message(request: web.Request) -> web.Response:
         msgs.append(content)
         index = len(msgs) - 1
 
-    return web.json_response({"event": event, "index": index, "content": content}, status=201)
+    return json_response({"event": event, "index": index, "content": content}, status=201)
 
 
 async def delete_welcome_message(request: web.Request) -> web.Response:
@@ -131,7 +134,7 @@ async def delete_welcome_message(request: web.Request) -> web.Response:
             raise web.HTTPNotFound(reason="Index out of range")
         msgs.pop(index)
 
-    return web.json_response({"deleted": True})
+    return json_response({"deleted": True})
 
 
 async def get_welcome_whisper(request: web.Request) -> web.Response:
@@ -144,7 +147,7 @@ async def get_welcome_whisper(request: web.Request) -> web.Response:
         raise web.HTTPServiceUnavailable(reason="Welcome cog not loaded")
 
     whisper = await cog.config.guild(guild).join.whisper()
-    return web.json_response(whisper)
+    return json_response(whisper)
 
 
 async def patch_welcome_whisper(request: web.Request) -> web.Response:
@@ -165,7 +168,7 @@ async def patch_welcome_whisper(request: web.Request) -> web.Response:
     async with cog.config.guild(guild).join.whisper() as whisper:
         whisper.update(updates)
 
-    return web.json_response({"updated": list(updates.keys())})
+    return json_response({"updated": list(updates.keys())})
 
 
 # ===========================================================================
@@ -201,7 +204,7 @@ async def list_stickies(request: web.Request) -> web.Response:
                 "header_enabled": data.get("header_enabled", True),
                 "last_message_id": str(data["last"]) if data.get("last") else None,
             })
-    return web.json_response(result)
+    return json_response(result)
 
 
 async def get_sticky(request: web.Request) -> web.Response:
@@ -222,7 +225,7 @@ async def get_sticky(request: web.Request) -> web.Response:
     if not (data.get("stickied") or (data.get("advstickied") or {}).get("content") or (data.get("advstickied") or {}).get("embed")):
         raise web.HTTPNotFound(reason="No sticky set for this channel")
 
-    return web.json_response({
+    return json_response({
         "channel_id": str(channel_id),
         "content": data.get("stickied"),
         "header_enabled": data.get("header_enabled", True),
@@ -275,7 +278,7 @@ async def put_sticky(request: web.Request) -> web.Response:
         "last": new_msg.id,
     })
 
-    return web.json_response({
+    return json_response({
         "channel_id": str(channel_id),
         "content": content,
         "header_enabled": header_enabled,
@@ -315,7 +318,7 @@ async def delete_sticky(request: web.Request) -> web.Response:
         "last": None,
     })
 
-    return web.json_response({"deleted": True})
+    return json_response({"deleted": True})
 
 
 async def patch_sticky(request: web.Request) -> web.Response:
@@ -337,7 +340,7 @@ async def patch_sticky(request: web.Request) -> web.Response:
         raise web.HTTPBadRequest(reason="header_enabled field required")
 
     await cog.conf.channel(channel).header_enabled.set(bool(data["header_enabled"]))
-    return web.json_response({"header_enabled": bool(data["header_enabled"])})
+    return json_response({"header_enabled": bool(data["header_enabled"])})
 
 
 # ===========================================================================
@@ -367,7 +370,7 @@ async def get_voicelogs_settings(request: web.Request) -> web.Response:
         raise web.HTTPServiceUnavailable(reason="VoiceLogs cog not loaded")
 
     toggle = await cog.config.guild(guild).toggle()
-    return web.json_response({"enabled": toggle})
+    return json_response({"enabled": toggle})
 
 
 async def patch_voicelogs_settings(request: web.Request) -> web.Response:
@@ -384,7 +387,7 @@ async def patch_voicelogs_settings(request: web.Request) -> web.Response:
         raise web.HTTPBadRequest(reason="enabled field required")
 
     await cog.config.guild(guild).toggle.set(bool(data["enabled"]))
-    return web.json_response({"enabled": bool(data["enabled"])})
+    return json_response({"enabled": bool(data["enabled"])})
 
 
 async def get_voicelogs_user(request: web.Request) -> web.Response:
@@ -405,7 +408,7 @@ async def get_voicelogs_user(request: web.Request) -> web.Response:
 
     # Sort by joined_at desc, take last 25
     sorted_entries = sorted(guild_entries, key=lambda e: e.get("joined_at", 0), reverse=True)[:25]
-    return web.json_response([_entry_to_dict(e) for e in sorted_entries])
+    return json_response([_entry_to_dict(e) for e in sorted_entries])
 
 
 async def get_voicelogs_channel(request: web.Request) -> web.Response:
@@ -422,18 +425,16 @@ async def get_voicelogs_channel(request: web.Request) -> web.Response:
     if channel is None:
         raise web.HTTPNotFound(reason="Channel not found")
 
-    all_users = await cog.config.all_users()
+    # Served from the channel index instead of scanning every user's history
+    index = request.app["voice_index"]
+    await index.ensure_built(cog)
     entries = []
-    for uid_str, user_data in all_users.items():
-        history = user_data.get("history", [])
-        for e in history:
-            if e.get("channel_id") == channel_id:
-                d = _entry_to_dict(e)
-                d["user_id"] = str(uid_str)
-                entries.append(d)
+    for e in index.recent(channel_id, 25):
+        d = _entry_to_dict(e)
+        d["user_id"] = str(e["user_id"])
+        entries.append(d)
 
-    entries.sort(key=lambda e: e.get("joined_at") or 0, reverse=True)
-    return web.json_response(entries[:25])
+    return json_response(entries)
 
 
 # ===========================================================================
@@ -451,7 +452,7 @@ async def get_autonick_settings(request: web.Request) -> web.Response:
 
     channel_id = await cog.config.guild(guild).channel()
     cooldown = await cog.config.guild(guild).cooldown()
-    return web.json_response({
+    return json_response({
         "channel": str(channel_id) if channel_id else None,
         "cooldown": cooldown,
     })
@@ -476,7 +477,7 @@ async def patch_autonick_settings(request: web.Request) -> web.Response:
     for key, value in updates.items():
         await guild_cfg.get_attr(key).set(value)
 
-    return web.json_response({"updated": list(updates.keys())})
+    return json_response({"updated": list(updates.keys())})
 
 
 async def get_autonick_forbidden(request: web.Request) -> web.Response:
@@ -486,7 +487,7 @@ async def get_autonick_forbidden(request: web.Request) -> web.Response:
         raise web.HTTPServiceUnavailable(reason="AutoNick cog not loaded")
 
     names = await cog.config.forbidden_names()
-    return web.json_response({"forbidden_names": names})
+    return json_response({"forbidden_names": names})
 
 
 async def post_autonick_forbidden(request: web.Request) -> web.Response:
@@ -505,7 +506,7 @@ async def post_autonick_forbidden(request: web.Request) -> web.Response:
             raise web.HTTPConflict(reason="Word already in forbidden list")
         names.append(word)
 
-    return web.json_response({"word": word}, status=201)
+    return json_response({"word": word}, status=201)
 
 
 async def delete_autonick_forbidden(request: web.Request) -> web.Response:
@@ -521,7 +522,7 @@ async def delete_autonick_forbidden(request: web.Request) -> web.Response:
             raise web.HTTPNotFound(reason="Word not found in forbidden list")
         names.remove(word)
 
-    return web.json_response({"deleted": word})
+    return json_response({"deleted": word})
 
 
 # ===========================================================================
@@ -557,19 +558,24 @@ async def post_massmove(request: web.Request) -> web.Response:
         # Move from all voice channels in the guild (except target)
         sources = [ch for ch in guild.voice_channels if ch.id != target_id]
 
-    moved = 0
-    for source_ch in sources:
-        for member in list(source_ch.members):
-            try:
-                await member.move_to(target, reason="APIv2 massmove")
-                moved += 1
-            except discord.HTTPException:
-                pass
-
-    return web.json_response({
-        "target_channel_id": str(target_id),
-        "moved": moved,
-    })
+    # Moves run as a background job; poll /api/v2/jobs/{id} for progress
+    async def run(job):
+        members = [m for source_ch in sources for m in source_ch.members]
+
+        async def move(member):
+            await member.move_to(target, reason="APIv2 massmove")
+
+        await request.app["job_manager"].run_items(job, members, move, key=lambda m: m.id)
+        return {"target_channel_id": str(target_id), "moved": job.succeeded}
+
+    job = request.app["job_manager"].submit(
+        "voice_massmove",
+        run,
+        guild_id=guild.id,
+        key_name=request.get("api_key_name"),
+        params={"target_channel_id": str(target_id), "source_channel_id": str(source_id) if source_id else None},
+    )
+    return job_accepted(job)
 
 
 # ===========================================================================
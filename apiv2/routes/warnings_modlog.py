@@ -17,7 +17,9 @@ import discord
 from aiohttp import web
 from redbot.core import modlog
 
-from ..server import APP_BOT_KEY, json_error
+from ..caseindex import case_to_dict
+from ..encoding import json_response
+from ..server import APP_BOT_KEY, APP_CASE_INDEX_KEY, json_error
 
 if TYPE_CHECKING:
     from redbot.core.bot import Red
@@ -91,30 +93,6 @@ def _get_guild(bot: "Red", guild_id_str: str):
     return bot.get_guild(gid)
 
 
-def _case_to_dict(case) -> dict:
-    """Serialize a Red modlog Case object to a plain dict."""
-    def _uid(obj):
-        return str(obj.id) if obj else None
-
-    created_at = None
-    if case.created_at:
-        try:
-            created_at = datetime.fromtimestamp(case.created_at, tz=timezone.utc).isoformat()
-        except Exception:
-            created_at = str(case.created_at)
-
-    return {
-        "case_number": case.case_number,
-        "action_type": case.action_type,
-        "user_id": _uid(case.user),
-        "moderator_id": _uid(case.moderator),
-        "reason": case.reason,
-        "created_at": created_at,
-        "amended_by": _uid(case.amended_by),
-        "amended_reason": getattr(case, "amended_reason", None),
-    }
-
-
 # ──────────────────────────── Warnings (Red Mod) ─────────────────────────────
 
 
@@ -158,7 +136,7 @@ async def handle_warnings_list(request: web.Request) -> web.Response:
         }
         for i, w in enumerate(raw_warnings)
     ]
-    return web.json_response(warnings)
+    return json_response(warnings)
 
 
 async def handle_warnings_add(request: web.Request) -> web.Response:
@@ -222,7 +200,7 @@ async def handle_warnings_add(request: web.Request) -> web.Response:
     except Exception as e:
         logger.debug(f"Could not create modlog case for warning: {e}")
 
-    return web.json_response(
+    return json_response(
         {
             "id": warning_id,
             "reason": reason,
@@ -268,7 +246,7 @@ async def handle_warning_delete(request: web.Request) -> web.Response:
                 return json_error("not_found", f"Warning '{warning_id}' not found", 404)
         warnings[:] = filtered
 
-    return web.json_response({"deleted": warning_id})
+    return json_response({"deleted": warning_id})
 
 
 async def handle_warnings_clear(request: web.Request) -> web.Response:
@@ -295,46 +273,43 @@ async def handle_warnings_clear(request: web.Request) -> web.Response:
         return json_error("bad_request", "Invalid user_id", 400)
 
     await mod_cog.config.member_from_ids(guild.id, user_id).warnings.set([])
-    return web.json_response({"cleared": True})
+    return json_response({"cleared": True})
 
 
 # ──────────────────────────── Modlog Cases ───────────────────────────────────
 
 
 async def handle_cases_list(request: web.Request) -> web.Response:
-    """GET /guilds/{guild_id}/cases?type=ban&limit=20&offset=0 — list modlog cases."""
+    """GET /guilds/{guild_id}/cases?type=ban&user_id=123&limit=20&offset=0 — list modlog cases."""
     bot: "Red" = request.app[APP_BOT_KEY]
     guild = _get_guild(bot, request.match_info["guild_id"])
     if guild is None:
-        return json_error("not_found", "Guild not found", 404)
+        return json_error(404, "not_found", "Guild not found")
 
-    action_type = request.rel_url.query.get("type")
+    action_type = request.rel_url.query.get("type") or None
+    user_id = request.rel_url.query.get("user_id") or None
     try:
         limit = max(1, min(100, int(request.rel_url.query.get("limit", 20))))
         offset = max(0, int(request.rel_url.query.get("offset", 0)))
+        if user_id is not None:
+            user_id = str(int(user_id))
     except ValueError:
-        return json_error("bad_request", "Invalid limit or offset", 400)
+        return json_error(400, "bad_request", "Invalid limit, offset or user_id")
 
     try:
-        all_cases = await modlog.get_all_cases(guild, bot)
+        index = await request.app[APP_CASE_INDEX_KEY].get_guild(guild, bot)
     except Exception as e:
-        logger.error(f"Failed to get modlog cases: {e}")
-        return json_error("internal_error", "Failed to retrieve cases", 500)
-
-    if action_type:
-        all_cases = [c for c in all_cases if c.action_type == action_type]
+        logger.error(f"Failed to get modlog cases: {e}", exc_info=True)
+        return json_error(500, "internal_error", "Failed to retrieve cases")
 
-    # Sort by case_number descending (newest first)
-    all_cases.sort(key=lambda c: c.case_number, reverse=True)
+    # Newest first
+    total, page = index.page(action_type=action_type, user_id=user_id, offset=offset, limit=limit)
 
-    total = len(all_cases)
-    page = all_cases[offset: offset + limit]
-
-    return web.json_response({
+    return json_response({
         "total": total,
         "limit": limit,
         "offset": offset,
-        "cases": [_case_to_dict(c) for c in page],
+        "cases": page,
     })
 
 
@@ -343,19 +318,28 @@ async def handle_case_get(request: web.Request) -> web.Response:
     bot: "Red" = request.app[APP_BOT_KEY]
     guild = _get_guild(bot, request.match_info["guild_id"])
     if guild is None:
-        return json_error("not_found", "Guild not found", 404)
+        return json_error(404, "not_found", "Guild not found")
 
     try:
         case_number = int(request.match_info["case_number"])
     except ValueError:
-        return json_error("bad_request", "case_number must be an integer", 400)
+        return json_error(400, "bad_request", "case_number must be an integer")
+
+    try:
+        index = await request.app[APP_CASE_INDEX_KEY].get_guild(guild, bot)
+    except Exception as e:
+        logger.error(f"Failed to get modlog case #{case_number}: {e}", exc_info=True)
+        return json_error(500, "internal_error", "Failed to retrieve case")
+    cached = index.get(case_number)
+    if cached is not None:
+        return json_response(cached)
 
     try:
         case = await modlog.get_case(case_number, guild, bot)
     except Exception:
-        return json_error("not_found", f"Case #{case_number} not found", 404)
+        return json_error(404, "not_found", f"Case #{case_number} not found")
 
-    return web.json_response(_case_to_dict(case))
+    return json_response(case_to_dict(case))
 
 
 # ──────────────────────────── Security cog ───────────────────────────────────
@@ -377,7 +361,7 @@ async def handle_security_settings_get(request: web.Request) -> web.Response:
         return json_error("cog_unavailable", "Security cog is not loaded", 503)
 
     gc = await cog.config.guild(guild).all()
-    return web.json_response({
+    return json_response({
         "quarantine_role": str(gc["quarantine_role"]) if gc.get("quarantine_role") else None,
         "modlog_channel": str(gc["modlog_channel"]) if gc.get("modlog_channel") else None,
         "modlog_ping_role": str(gc["modlog_ping_role"]) if gc.get("modlog_ping_role") else None,
@@ -416,7 +400,7 @@ async def handle_security_settings_patch(request: web.Request) -> web.Response:
             await cog.config.guild(guild).set_raw(field, value=int_val)
 
     gc = await cog.config.guild(guild).all()
-    return web.json_response({
+    return json_response({
         "quarantine_role": str(gc["quarantine_role"]) if gc.get("quarantine_role") else None,
         "modlog_channel": str(gc["modlog_channel"]) if gc.get("modlog_channel") else None,
         "modlog_ping_role": str(gc["modlog_ping_role"]) if gc.get("modlog_ping_role") else None,
@@ -453,7 +437,7 @@ async def handle_security_modules_list(request: web.Request) -> web.Response:
             "enabled": conf.get("enabled", False),
             "config": conf,
         })
-    return web.json_response(result)
+    return json_response(result)
 
 
 async def handle_security_module_patch(request: web.Request) -> web.Response:
@@ -491,7 +475,7 @@ async def handle_security_module_patch(request: web.Request) -> web.Response:
 
     await cog.config.guild(guild).modules.set_raw(module_key, value=current)
 
-    return web.json_response({"key": module_key, "config": current})
+    return json_response({"key": module_key, "config": current})
 
 
 async def handle_quarantined_list(request: web.Request) -> web.Response:
@@ -514,7 +498,7 @@ async def handle_quarantined_list(request: web.Request) -> web.Response:
             "user_id": str(member_id_int),
             "roles_before_quarantine": [str(r) for r in conf.get("roles_before_quarantine", [])],
         })
-    return web.json_response(result)
+    return json_response(result)
 
 
 async def handle_quarantine_add(request: web.Request) -> web.Response:
@@ -551,7 +535,7 @@ async def handle_quarantine_add(request: web.Request) -> web.Response:
     except discord.HTTPException as e:
         return json_error("internal_error", f"Discord error: {e}", 500)
 
-    return web.json_response({
+    return json_response({
         "quarantined": True,
         "user_id": str(user_id),
         "reason": reason,
@@ -592,7 +576,7 @@ async def handle_quarantine_remove(request: web.Request) -> web.Response:
     except discord.HTTPException as e:
         return json_error("internal_error", f"Discord error: {e}", 500)
 
-    return web.json_response({
+    return json_response({
         "quarantined": False,
         "user_id": str(user_id),
     })
@@ -624,7 +608,7 @@ async def handle_whitelist_get(request: web.Request) -> web.Response:
         return json_error("bad_request", "Invalid object_id", 400)
 
     whitelist = await _get_whitelist(cog, guild, object_type, object_id)
-    return web.json_response({"object_type": object_type, "object_id": object_id_str, "whitelist": whitelist})
+    return json_response({"object_type": object_type, "object_id": object_id_str, "whitelist": whitelist})
 
 
 async def handle_whitelist_patch(request: web.Request) -> web.Response:
@@ -670,7 +654,7 @@ async def handle_whitelist_patch(request: web.Request) -> web.Response:
         current[k] = bool(v)
 
     await _set_whitelist(cog, guild, object_type, object_id, current)
-    return web.json_response({"object_type": object_type, "object_id": object_id_str, "whitelist": current})
+    return json_response({"object_type": object_type, "object_id": object_id_str, "whitelist": current})
 
 
 async def _get_whitelist(cog, guild: discord.Guild, object_type: str, object_id: int) -> dict:
@@ -717,7 +701,7 @@ async def handle_extmodlog_settings_get(request: web.Request) -> web.Response:
 
     all_conf = await cog.config.guild(guild).all()
     result = {k: all_conf[k] for k in MODLOG_EVENT_KEYS if k in all_conf}
-    return web.json_response(result)
+    return json_response(result)
 
 
 async def handle_extmodlog_settings_patch(request: web.Request) -> web.Response:
@@ -759,7 +743,7 @@ async def handle_extmodlog_settings_patch(request: web.Request) -> web.Response:
     if hasattr(cog, "settings") and isinstance(cog.settings, dict):
         cog.settings.pop(guild.id, None)
 
-    return web.json_response(updated)
+    return json_response(updated)
 
 
 async def handle_ignored_channels_get(request: web.Request) -> web.Response:
@@ -774,7 +758,7 @@ async def handle_ignored_channels_get(request: web.Request) -> web.Response:
         return json_error("cog_unavailable", "ExtendedModLog cog is not loaded", 503)
 
     ignored = await cog.config.guild(guild).ignored_channels()
-    return web.json_response([str(ch_id) for ch_id in ignored])
+    return json_response([str(ch_id) for ch_id in ignored])
 
 
 async def handle_ignored_channels_add(request: web.Request) -> web.Response:
@@ -809,7 +793,7 @@ async def handle_ignored_channels_add(request: web.Request) -> web.Response:
     if hasattr(cog, "settings") and isinstance(cog.settings, dict):
         cog.settings.pop(guild.id, None)
 
-    return web.json_response({"added": str(ch_id)}, status=201)
+    return json_response({"added": str(ch_id)}, status=201)
 
 
 async def handle_ignored_channels_remove(request: web.Request) -> web.Response:
@@ -836,4 +820,4 @@ async def handle_ignored_channels_remove(request: web.Request) -> web.Response:
     if hasattr(cog, "settings") and isinstance(cog.settings, dict):
         cog.settings.pop(guild.id, None)
 
-    return web.json_response({"removed": str(ch_id)})
+    return json_response({"removed": str(ch_id)})
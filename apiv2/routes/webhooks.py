@@ -6,8 +6,9 @@ import logging
 
 from aiohttp import web
 
+from ..encoding import json_response
 from ..server import APP_WEBHOOK_MANAGER_KEY, json_error
-from ..webhooks import SUPPORTED_EVENTS
+from ..webhooks import SUPPORTED_EVENTS, MAX_BATCH_SIZE
 
 logger = logging.getLogger("red.killerbite95.apiv2.routes.webhooks")
 
@@ -26,7 +27,7 @@ async def handle_list(request: web.Request) -> web.Response:
     """GET /api/v2/webhooks — List all configured outgoing webhooks."""
     wh = request.app[APP_WEBHOOK_MANAGER_KEY]
     webhooks = await wh.list_webhooks()
-    return web.json_response(webhooks)
+    return json_response(webhooks)
 
 
 async def handle_create(request: web.Request) -> web.Response:
@@ -42,6 +43,7 @@ async def handle_create(request: web.Request) -> web.Response:
     url = data.get("url")
     events = data.get("events", [])
     guild_id = data.get("guild_id")
+    batch_size = data.get("batch_size", 1)
 
     if not name or not isinstance(name, str):
         return json_error(400, "bad_request", "Missing or invalid 'name'")
@@ -66,15 +68,19 @@ async def handle_create(request: web.Request) -> web.Response:
         except (ValueError, TypeError):
             return json_error(400, "bad_request", "'guild_id' must be an integer")
 
-    secret = await wh.create(name, url, events, guild_id)
+    if not isinstance(batch_size, int) or not 1 <= batch_size <= MAX_BATCH_SIZE:
+        return json_error(400, "bad_request", f"'batch_size' must be an integer between 1 and {MAX_BATCH_SIZE}")
+
+    secret = await wh.create(name, url, events, guild_id, batch_size)
     if secret is None:
         return json_error(409, "conflict", f"Webhook '{name}' already exists")
 
-    return web.json_response({
+    return json_response({
         "name": name,
         "url": url,
         "events": events,
         "guild_id": guild_id,
+        "batch_size": batch_size,
         "secret": secret,
         "message": "Webhook created. Save the secret for signature verification.",
     }, status=201)
@@ -89,7 +95,7 @@ async def handle_delete(request: web.Request) -> web.Response:
     if not success:
         return json_error(404, "not_found", f"Webhook '{name}' not found")
 
-    return web.json_response({"message": f"Webhook '{name}' deleted"})
+    return json_response({"message": f"Webhook '{name}' deleted"})
 
 
 async def handle_test(request: web.Request) -> web.Response:
@@ -102,12 +108,12 @@ async def handle_test(request: web.Request) -> web.Response:
         return json_error(404, "not_found", f"Webhook '{name}' not found")
 
     if isinstance(result, int):
-        return web.json_response({
+        return json_response({
             "message": f"Test ping sent to '{name}'",
             "response_status": result,
         })
 
-    return web.json_response({
+    return json_response({
         "message": f"Test ping failed for '{name}'",
         "error": result,
     }, status=502)
@@ -9,6 +9,7 @@ use Killerbite95\APIv2\Resources\Community;
 use Killerbite95\APIv2\Resources\Core;
 use Killerbite95\APIv2\Resources\Economy;
 use Killerbite95\APIv2\Resources\GameServers;
+use Killerbite95\APIv2\Resources\Jobs;
 use Killerbite95\APIv2\Resources\Members;
 use Killerbite95\APIv2\Resources\Messaging;
 use Killerbite95\APIv2\Resources\Moderation;
@@ -53,6 +54,7 @@ final class Client
     private ?Utilities $utilities = null;
     private ?ColaCoins $colaCoins = null;
     private ?Webhooks $webhooks = null;
+    private ?Jobs $jobs = null;
 
     /**
      * @param string      $baseUrl Full base URL of the bot host (e.g. https://trini.alienhost.ovh)
@@ -151,6 +153,11 @@ final class Client
         return $this->webhooks ??= new Webhooks($this);
     }
 
+    public function jobs(): Jobs
+    {
+        return $this->jobs ??= new Jobs($this);
+    }
+
     // ─────────────── HTTP verbs (generic) ───────────────
 
     public function get(string $path, array $query = []): mixed
@@ -31,4 +31,10 @@ final class Core
     {
         return $this->client->get("/guilds/$guildId");
     }
+
+    /** Per-route request counts, status classes and latency percentiles (JSON form). */
+    public function metrics(): array
+    {
+        return $this->client->get('/metrics');
+    }
 }
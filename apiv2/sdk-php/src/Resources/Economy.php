@@ -58,6 +58,13 @@ final class Economy
         ]);
     }
 
+    /**
+     * Remove bank accounts of users no longer in the guild.
+     *
+     * Runs as a background job: returns { job_id, kind, status, status_url }
+     * right away. Use $api->jobs()->wait($response) for the final state; its
+     * result is { pruned_accounts }.
+     */
     public function prune(string|int $guildId): array
     {
         return $this->client->post("/guilds/$guildId/economy/prune", ['confirm' => true]);
@@ -0,0 +1,72 @@
+<?php
+
+declare(strict_types=1);
+
+namespace Killerbite95\APIv2\Resources;
+
+use Killerbite95\APIv2\ApiException;
+use Killerbite95\APIv2\Client;
+
+/**
+ * Background jobs started by mass operations (massMove, prune, ...).
+ *
+ * Those endpoints answer 202 with { job_id, kind, status, status_url };
+ * poll the job with get() or block until it ends with wait().
+ */
+final class Jobs
+{
+    public const FINISHED_STATUSES = ['completed', 'failed', 'cancelled'];
+
+    public function __construct(private readonly Client $client) {}
+
+    public function list(): array
+    {
+        return $this->client->get('/jobs');
+    }
+
+    /**
+     * Job status and progress. With $resultsLimit > 0 the per-item results
+     * are included too (paged with $resultsOffset).
+     */
+    public function get(string $jobId, int $resultsLimit = 0, int $resultsOffset = 0): array
+    {
+        return $this->client->get('/jobs/' . rawurlencode($jobId), [
+            'results_offset' => $resultsOffset,
+            'results_limit'  => $resultsLimit,
+        ]);
+    }
+
+    public function cancel(string $jobId): array
+    {
+        return $this->client->delete('/jobs/' . rawurlencode($jobId));
+    }
+
+    /**
+     * Poll until the job finishes and return its final state.
+     *
+     * @param array|string $job A 202 response from a job endpoint, or a job ID
+     *
+     * @throws ApiException When the job is still running after $timeoutSeconds
+     */
+    public function wait(array|string $job, int $timeoutSeconds = 300, int $pollIntervalMs = 1000): array
+    {
+        $jobId = is_array($job) ? (string) ($job['job_id'] ?? $job['id'] ?? '') : $job;
+        $deadline = microtime(true) + $timeoutSeconds;
+        while (true) {
+            $state = $this->get($jobId);
+            if (in_array($state['status'] ?? null, self::FINISHED_STATUSES, true)) {
+                return $state;
+            }
+            if (microtime(true) >= $deadline) {
+                throw new ApiException(
+                    "Job $jobId still {$state['status']} after {$timeoutSeconds}s",
+                    errorCode: 'job_timeout',
+                    response: $state,
+                    method: 'GET',
+                    path: '/jobs/' . $jobId,
+                );
+            }
+            usleep($pollIntervalMs * 1000);
+        }
+    }
+}
@@ -60,4 +60,18 @@ final class Members
             'role_ids' => array_map(static fn ($id) => (int) $id, $roleIds),
         ]);
     }
+
+    /**
+     * Grant $roleId to many members at once. Runs as a background job;
+     * returns the 202 payload with `job_id`; poll GET /jobs/{job_id} for
+     * per-member results.
+     *
+     * @param array<int,string|int> $userIds
+     */
+    public function addRoleToMembers(string|int $guildId, string|int $roleId, array $userIds): array
+    {
+        return $this->client->post("/guilds/$guildId/roles/$roleId/members", [
+            'user_ids' => array_map(static fn ($id) => (string) $id, $userIds),
+        ]);
+    }
 }
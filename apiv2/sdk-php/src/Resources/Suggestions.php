@@ -15,10 +15,22 @@ final class Suggestions
 
     public function __construct(private readonly Client $client) {}
 
-    public function list(string|int $guildId, ?string $status = null, int $limit = 50, int $offset = 0): array
-    {
+    /**
+     * List suggestions in $sort order (newest, top, controversial, hot),
+     * or ranked by relevance when $query is given.
+     */
+    public function list(
+        string|int $guildId,
+        ?string $status = null,
+        int $limit = 50,
+        int $offset = 0,
+        ?string $query = null,
+        ?string $sort = null,
+    ): array {
         return $this->client->get("/guilds/$guildId/suggestions", [
             'status' => $status,
+            'sort'   => $sort,
+            'q'      => $query,
             'limit'  => $limit,
             'offset' => $offset,
         ]);
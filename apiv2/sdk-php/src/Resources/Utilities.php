@@ -146,6 +146,10 @@ final class Utilities
     /**
      * Move every voice member from $sourceChannelId (or all voice channels if null)
      * to $targetChannelId.
+     *
+     * Runs as a background job: returns { job_id, kind, status, status_url }
+     * right away. Use $api->jobs()->wait($response) for the final state; its
+     * result is { target_channel_id, moved }.
      */
     public function massMove(
         string|int $guildId,
@@ -2,6 +2,8 @@
 aiohttp application factory and middlewares for APIv2.
 """
 
+import asyncio
+import gzip
 import time
 import logging
 from typing import TYPE_CHECKING
@@ -9,6 +11,15 @@ from typing import TYPE_CHECKING
 from aiohttp import web
 
 from .auth import KeyManager, RateLimiter
+from .cache import ResponseCache, cache_middleware_factory
+from .dynamic import RouteTable
+from .encoding import json_response
+from .metrics import MetricsRegistry, metrics_middleware_factory
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 if TYPE_CHECKING:
     from redbot.core.bot import Red
@@ -21,11 +32,26 @@ APP_KEY_MANAGER_KEY = "key_manager"
 APP_RATE_LIMITER_KEY = "rate_limiter"
 APP_START_TIME_KEY = "start_time"
 APP_WEBHOOK_MANAGER_KEY = "webhook_manager"
+APP_EVENT_HUB_KEY = "event_hub"
+APP_VOICE_INDEX_KEY = "voice_index"
+APP_JOB_MANAGER_KEY = "job_manager"
+APP_RESPONSE_CACHE_KEY = "response_cache"
+APP_METRICS_KEY = "metrics"
+APP_CASE_INDEX_KEY = "case_index"
+APP_ROUTE_TABLE_KEY = "route_table"
+# Mutable runtime settings shared with the cog (changed without restarting)
+APP_SETTINGS_KEY = "settings"
+
+# Responses smaller than this are sent as-is; compressing them costs more than it saves
+COMPRESS_MIN_BYTES = 1024
+# Bodies above this are compressed in a thread to keep the event loop free
+COMPRESS_IN_THREAD_BYTES = 256 * 1024
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
 
 
 def json_error(status: int, error: str, message: str) -> web.Response:
     """Create a standardized JSON error response."""
-    return web.json_response(
+    return json_response(
         {"error": error, "message": message, "status": status},
         status=status,
     )
@@ -110,6 +136,64 @@ async def logging_middleware(request: web.Request, handler):
     return response
 
 
+def _pick_encoding(accept_encoding: str) -> str | None:
+    """Choose br or gzip from an Accept-Encoding header (ignoring q=0)."""
+    offered = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        offered.add(coding.strip())
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered or "*" in offered:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=5)
+
+
+@web.middleware
+async def compression_middleware(request: web.Request, handler):
+    """Compress large text/JSON responses with br or gzip as negotiated."""
+    resp = await handler(request)
+
+    if not isinstance(resp, web.Response) or resp.prepared:
+        return resp  # Streams and websockets manage their own output
+    body = resp.body
+    if (
+        not isinstance(body, (bytes, bytearray))
+        or len(body) < COMPRESS_MIN_BYTES
+        or "Content-Encoding" in resp.headers
+        or not resp.content_type.startswith(COMPRESSIBLE_TYPES)
+    ):
+        return resp
+
+    resp.headers.add("Vary", "Accept-Encoding")
+    encoding = _pick_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding is None:
+        return resp
+
+    if len(body) >= COMPRESS_IN_THREAD_BYTES:
+        compressed = await asyncio.get_running_loop().run_in_executor(None, _compress, bytes(body), encoding)
+    else:
+        compressed = _compress(body, encoding)
+    if len(compressed) >= len(body):
+        return resp
+
+    resp.body = compressed
+    resp.headers["Content-Encoding"] = encoding
+    # A different representation needs a different strong validator
+    etag = resp.headers.get("ETag")
+    if etag and etag.endswith('"'):
+        resp.headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+    return resp
+
+
 @web.middleware
 async def cors_middleware(request: web.Request, handler):
     """Handle CORS preflight and add headers to every response."""
@@ -123,7 +207,8 @@ async def cors_middleware(request: web.Request, handler):
 
     resp.headers["Access-Control-Allow-Origin"] = "*"
     resp.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, PATCH, DELETE, OPTIONS"
-    resp.headers["Access-Control-Allow-Headers"] = "Authorization, Content-Type"
+    resp.headers["Access-Control-Allow-Headers"] = "Authorization, Content-Type, If-None-Match, If-Modified-Since"
+    resp.headers["Access-Control-Expose-Headers"] = "ETag, Last-Modified, X-RateLimit-Remaining"
     resp.headers["Access-Control-Max-Age"] = "86400"
     return resp
 
@@ -144,14 +229,37 @@ async def error_middleware(request: web.Request, handler):
         return json_error(500, "internal_error", "An internal error occurred")
 
 
-def create_app(bot: "Red", key_manager: KeyManager, rate_limiter: RateLimiter, webhook_manager=None) -> web.Application:
+def create_app(
+    bot: "Red",
+    key_manager: KeyManager,
+    rate_limiter: RateLimiter,
+    webhook_manager=None,
+    event_hub=None,
+    settings: dict | None = None,
+    voice_index=None,
+    job_manager=None,
+    response_cache: ResponseCache | None = None,
+    metrics: MetricsRegistry | None = None,
+    case_index=None,
+    route_table: RouteTable | None = None,
+) -> web.Application:
     """Create the aiohttp application with all middlewares."""
+    if response_cache is None:
+        response_cache = ResponseCache()
+    if metrics is None:
+        metrics = MetricsRegistry()
+    if route_table is None:
+        route_table = RouteTable()
     app = web.Application(
         middlewares=[
             cors_middleware,
+            metrics_middleware_factory(metrics),
+            compression_middleware,
             error_middleware,
             logging_middleware,
             auth_middleware,
+            # Innermost: cached responses are still authenticated and rate limited
+            cache_middleware_factory(response_cache),
         ]
     )
     app[APP_BOT_KEY] = bot
@@ -159,4 +267,12 @@ def create_app(bot: "Red", key_manager: KeyManager, rate_limiter: RateLimiter, w
     app[APP_RATE_LIMITER_KEY] = rate_limiter
     app[APP_START_TIME_KEY] = time.monotonic()
     app[APP_WEBHOOK_MANAGER_KEY] = webhook_manager
+    app[APP_EVENT_HUB_KEY] = event_hub
+    app[APP_SETTINGS_KEY] = settings if settings is not None else {}
+    app[APP_VOICE_INDEX_KEY] = voice_index
+    app[APP_JOB_MANAGER_KEY] = job_manager
+    app[APP_RESPONSE_CACHE_KEY] = response_cache
+    app[APP_METRICS_KEY] = metrics
+    app[APP_CASE_INDEX_KEY] = case_index
+    app[APP_ROUTE_TABLE_KEY] = route_table
     return app
@@ -0,0 +1,131 @@
+"""
+Live event stream hub for APIv2.
+Fans Discord and cog events out to connected SSE / WebSocket clients.
+
+Each connection gets its own bounded queue. When a slow client falls behind
+the oldest queued events are dropped so one stalled reader can never block
+the bot or grow memory without bound.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from .encoding import dumps_bytes
+from .webhooks import SUPPORTED_EVENTS
+
+logger = logging.getLogger("red.killerbite95.apiv2.stream")
+
+STREAM_EVENTS = SUPPORTED_EVENTS | frozenset({
+    "gameserver_status_change",
+    "ticket_open",
+    "ticket_close",
+    "suggestion_vote",
+})
+
+SUBSCRIBER_QUEUE_SIZE = 256
+MAX_SUBSCRIBERS = 100
+
+
+class Subscriber:
+    """A single connected stream client."""
+
+    def __init__(self, key_name: str, events: frozenset[str], guild_id: int | None):
+        self.key_name = key_name
+        self.events = events
+        self.guild_id = guild_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def wants(self, event: str, guild_id: int | None) -> bool:
+        if event not in self.events:
+            return False
+        return self.guild_id is None or guild_id is None or self.guild_id == guild_id
+
+    def push(self, item: Optional[tuple[int, str, bytes]]):
+        """Queue an item, discarding the oldest one if the client is behind."""
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+
+
+class EventHub:
+    """Registry of stream subscribers and the publish side of the stream."""
+
+    def __init__(self):
+        self._subscribers: set[Subscriber] = set()
+        self._event_counts: dict[str, int] = {}
+        self._seq = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self, key_name: str, events: frozenset[str], guild_id: int | None = None
+    ) -> Optional[Subscriber]:
+        """Register a new client. Returns None when the hub is full."""
+        if len(self._subscribers) >= MAX_SUBSCRIBERS:
+            return None
+        sub = Subscriber(key_name, events, guild_id)
+        self._subscribers.add(sub)
+        for event in events:
+            self._event_counts[event] = self._event_counts.get(event, 0) + 1
+        logger.debug(f"Stream subscriber added for key {key_name} ({len(self._subscribers)} total)")
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        if sub not in self._subscribers:
+            return
+        self._subscribers.discard(sub)
+        for event in sub.events:
+            count = self._event_counts.get(event, 0) - 1
+            if count > 0:
+                self._event_counts[event] = count
+            else:
+                self._event_counts.pop(event, None)
+
+    def update_events(self, sub: Subscriber, events: frozenset[str]):
+        """Change the event filter of a live subscriber."""
+        self.unsubscribe(sub)
+        sub.events = events
+        self._subscribers.add(sub)
+        for event in events:
+            self._event_counts[event] = self._event_counts.get(event, 0) + 1
+
+    def has_subscribers(self, event: str) -> bool:
+        """Cheap check so listeners can skip building payloads nobody will receive."""
+        return event in self._event_counts
+
+    def publish(self, event: str, payload: dict, guild_id: int | None = None):
+        """Send an event to every interested subscriber (non-blocking)."""
+        if event not in self._event_counts:
+            return
+
+        body: bytes | None = None
+        for sub in self._subscribers:
+            if not sub.wants(event, guild_id):
+                continue
+            if body is None:
+                # Serialized once and shared by every connection
+                self._seq += 1
+                body = dumps_bytes({
+                    "id": self._seq,
+                    "event": event,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "data": payload,
+                })
+            sub.push((self._seq, event, body))
+
+    def close(self):
+        """Ask every connected client handler to finish."""
+        for sub in list(self._subscribers):
+            sub.push(None)
@@ -0,0 +1,96 @@
+"""
+Channel-keyed index over VoiceLogs history for APIv2.
+
+VoiceLogs stores voice sessions per user, so answering "who was recently in
+channel X" means scanning every user's history. This index keeps a bounded
+deque of the most recent sessions per channel instead: it is built once from
+VoiceLogs' config and then kept current from voice state events.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger("red.killerbite95.apiv2.voiceindex")
+
+RECENT_PER_CHANNEL = 25
+
+
+class VoiceLogIndex:
+    """channel_id -> deque of recent VoiceLogs entries (oldest first)."""
+
+    def __init__(self, maxlen: int = RECENT_PER_CHANNEL):
+        self.maxlen = maxlen
+        self._by_channel: dict[int, deque] = {}
+        # user_id -> the entry for the session they are currently in
+        self._open: dict[int, dict] = {}
+        self._built = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def invalidate(self):
+        """Drop the index; it is rebuilt on next use."""
+        self._by_channel = {}
+        self._open = {}
+        self._built = False
+
+    async def ensure_built(self, cog):
+        """Build the index from VoiceLogs' config if it has not been built yet."""
+        if self._built:
+            return
+        async with self._lock:
+            if self._built:
+                return
+            all_users = await cog.config.all_users()
+
+            per_channel: dict[int, list[dict]] = {}
+            open_sessions: dict[int, dict] = {}
+            for uid_str, user_data in all_users.items():
+                user_id = int(uid_str)
+                for e in user_data.get("history", []):
+                    channel_id = e.get("channel_id")
+                    if channel_id is None:
+                        continue
+                    entry = {**e, "user_id": user_id}
+                    per_channel.setdefault(channel_id, []).append(entry)
+                    if entry.get("left_at") is None:
+                        open_sessions[user_id] = entry
+
+            by_channel = {}
+            for channel_id, entries in per_channel.items():
+                entries.sort(key=lambda e: e.get("joined_at") or 0)
+                by_channel[channel_id] = deque(entries[-self.maxlen:], maxlen=self.maxlen)
+
+            self._by_channel = by_channel
+            self._open = open_sessions
+            self._built = True
+            logger.info(f"VoiceLogs index built: {len(by_channel)} channel(s)")
+
+    def record_join(self, user_id: int, channel):
+        """A member joined a voice channel."""
+        entry = {
+            "channel_id": channel.id,
+            "channel_name": channel.name,
+            "joined_at": time.time(),
+            "left_at": None,
+            "user_id": user_id,
+        }
+        self._by_channel.setdefault(channel.id, deque(maxlen=self.maxlen)).append(entry)
+        self._open[user_id] = entry
+
+    def record_leave(self, user_id: int, channel):
+        """A member left a voice channel."""
+        entry = self._open.pop(user_id, None)
+        if entry is not None and entry["channel_id"] == channel.id:
+            entry["left_at"] = time.time()
+
+    def recent(self, channel_id: int, limit: int = RECENT_PER_CHANNEL) -> list[dict]:
+        """Most recent entries for a channel, newest first."""
+        entries = self._by_channel.get(channel_id)
+        if not entries:
+            return []
+        return list(reversed(entries))[:limit]
@@ -0,0 +1,314 @@
+"""
+Cold storage for resolved suggestions.
+
+Implemented, denied, duplicate and won't-do suggestions never change again
+but used to stay in Config forever, so every read of a guild's suggestions
+carried them. Once they have been resolved for a while they are moved to a
+per-guild archive in the cog's data folder:
+
+- ``<guild_id>.jsonl.gz``: append-only. Each archive run appends one gzip
+  member holding one JSON suggestion per line, so the file as a whole is
+  still a valid gzip stream.
+- ``<guild_id>.idx.json``: ``{suggestion_id: [member offset, member length,
+  line]}``, rewritten atomically after each append. It can be rebuilt by
+  scanning the data file, and the last copy of a suggestion wins. Deleting
+  an archived suggestion appends a ``{"suggestion_id": ..., "deleted": true}``
+  tombstone and drops it from the index.
+
+A suggestion that comes back to Config (a vote, a status change) and is
+archived again leaves its older copy behind as a superseded record. Once
+those outnumber the current ones the data file is rewritten with only the
+current copies (compaction).
+
+The methods here do blocking file I/O; ``SuggestionStorage`` runs them in a
+worker thread.
+"""
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("red.killerbite95.suggestions.archive")
+
+ARCHIVE_DIR = "archive"
+INDEX_VERSION = 1
+# Decompressed members kept around for repeated lookups (pagination, history)
+MEMBER_CACHE_SIZE = 8
+# Compact once at least this many records are superseded (old copies and
+# tombstones) and they outnumber the current ones
+COMPACT_MIN_SUPERSEDED = 100
+# Suggestions per gzip member in a compacted file; a lookup decompresses one member
+COMPACT_MEMBER_SIZE = 200
+
+# (offset of the gzip member, its compressed length, line within it)
+Location = Tuple[int, int, int]
+
+
+def _compress(records: List[Dict[str, Any]]) -> bytes:
+    lines = [json.dumps(data, separators=(",", ":"), ensure_ascii=False) for data in records]
+    compressor = zlib.compressobj(level=9, wbits=31)
+    return compressor.compress(("\n".join(lines) + "\n").encode("utf-8")) + compressor.flush()
+
+
+class SuggestionArchive:
+    """Per-guild gzip JSONL archive with an offset index."""
+
+    def __init__(self, data_path: Optional[Path]):
+        self._path = data_path / ARCHIVE_DIR if data_path else None
+        self._indexes: Dict[int, Dict[int, Location]] = {}
+        # Records in each guild's data file, superseded ones included
+        self._records: Dict[int, int] = {}
+        self._members: "OrderedDict[Tuple[int, int], List[Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Compaction moves members around; lookups must not read a file mid-swap
+        self._file_lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._path is not None
+
+    def _data_file(self, guild_id: int) -> Path:
+        return self._path / f"{guild_id}.jsonl.gz"
+
+    def _index_file(self, guild_id: int) -> Path:
+        return self._path / f"{guild_id}.idx.json"
+
+    # ---------------- Index ----------------
+
+    def is_loaded(self, guild_id: int) -> bool:
+        return guild_id in self._indexes
+
+    def load(self, guild_id: int) -> Dict[int, Location]:
+        """The guild's index, read from disk (or rebuilt) on first use."""
+        index = self._indexes.get(guild_id)
+        if index is not None:
+            return index
+        index, records = {}, 0
+        if self._path is not None:
+            data_file = self._data_file(guild_id)
+            index_file = self._index_file(guild_id)
+            if index_file.exists():
+                try:
+                    raw = json.loads(index_file.read_text(encoding="utf-8"))
+                    index = {int(sid): tuple(loc) for sid, loc in raw.get("entries", {}).items()}
+                    records = int(raw.get("records", len(index)))
+                    size = raw.get("size")
+                except (OSError, ValueError, TypeError) as e:
+                    logger.error(f"Unreadable suggestion archive index for guild {guild_id}, rebuilding: {e}")
+                    index, records = self._rebuild(guild_id)
+                else:
+                    actual = data_file.stat().st_size if data_file.exists() else 0
+                    if size is not None and size != actual:
+                        # A write or compaction was interrupted between data and index
+                        logger.warning(f"Suggestion archive index for guild {guild_id} is out of date, rebuilding")
+                        index, records = self._rebuild(guild_id)
+            elif data_file.exists():
+                index, records = self._rebuild(guild_id)
+        self._indexes[guild_id] = index
+        self._records[guild_id] = records
+        return index
+
+    def _rebuild(self, guild_id: int) -> Tuple[Dict[int, Location], int]:
+        index, records = self._scan(guild_id)
+        self._write_index(guild_id, index, records)
+        return index, records
+
+    def _scan(self, guild_id: int) -> Tuple[Dict[int, Location], int]:
+        """Rebuild an index by walking every gzip member of the data file.
+        Returns the index and the number of records read."""
+        index: Dict[int, Location] = {}
+        records = 0
+        data_file = self._data_file(guild_id)
+        data = data_file.read_bytes() if data_file.exists() else b""
+        offset = 0
+        while offset < len(data):
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                payload = decompressor.decompress(data[offset:])
+            except zlib.error:
+                logger.error(f"Suggestion archive for guild {guild_id} is truncated at byte {offset}")
+                break
+            if not decompressor.eof:
+                logger.error(f"Suggestion archive for guild {guild_id} ends with an incomplete member")
+                break
+            length = len(data) - offset - len(decompressor.unused_data)
+            for line_no, line in enumerate(payload.decode("utf-8").splitlines()):
+                try:
+                    record = json.loads(line)
+                    sid = int(record["suggestion_id"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                records += 1
+                if record.get("deleted", False):
+                    index.pop(sid, None)
+                else:
+                    index[sid] = (offset, length, line_no)
+            offset += length
+        logger.info(f"Rebuilt suggestion archive index for guild {guild_id}: {len(index)} suggestion(s)")
+        return index, records
+
+    def _write_index(self, guild_id: int, index: Dict[int, Location], records: int):
+        index_file = self._index_file(guild_id)
+        data_file = self._data_file(guild_id)
+        tmp = index_file.with_suffix(".tmp")
+        payload = {
+            "version": INDEX_VERSION,
+            # Size of the data file this index describes, checked on load
+            "size": data_file.stat().st_size if data_file.exists() else 0,
+            "records": records,
+            "entries": {str(sid): list(loc) for sid, loc in index.items()},
+        }
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, index_file)
+
+    def contains(self, guild_id: int, suggestion_id: int) -> bool:
+        """Whether a suggestion is archived. The guild must be loaded."""
+        return suggestion_id in self._indexes.get(guild_id, {})
+
+    def count(self, guild_id: int) -> int:
+        return len(self._indexes.get(guild_id, {}))
+
+    def superseded(self, guild_id: int) -> int:
+        """Records in the data file that are no longer current. The guild must be loaded."""
+        return self._records.get(guild_id, 0) - self.count(guild_id)
+
+    # ---------------- Writing ----------------
+
+    def _write_member(self, guild_id: int, records: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Append one gzip member of JSON lines. Returns its (offset, length)."""
+        self._path.mkdir(parents=True, exist_ok=True)
+        member = _compress(records)
+        with self._data_file(guild_id).open("ab") as fp:
+            offset = fp.seek(0, os.SEEK_END)
+            fp.write(member)
+            fp.flush()
+            os.fsync(fp.fileno())
+        return offset, len(member)
+
+    def append(self, guild_id: int, suggestions: List[Dict[str, Any]]) -> int:
+        """Append suggestions as one gzip member and index them. Returns how many."""
+        if self._path is None or not suggestions:
+            return 0
+        with self._file_lock:
+            index = dict(self.load(guild_id))
+            offset, length = self._write_member(guild_id, suggestions)
+            for line_no, data in enumerate(suggestions):
+                index[int(data["suggestion_id"])] = (offset, length, line_no)
+            records = self._records.get(guild_id, 0) + len(suggestions)
+            # Data first, index second: a crash in between leaves an unindexed
+            # member and the suggestions still in Config, archived again next run
+            self._write_index(guild_id, index, records)
+            self._indexes[guild_id] = index
+            self._records[guild_id] = records
+            self._maybe_compact(guild_id)
+        return len(suggestions)
+
+    def discard(self, guild_id: int, suggestion_ids: Iterable[int]) -> int:
+        """Tombstone archived suggestions so reads no longer find them. Returns how many."""
+        if self._path is None:
+            return 0
+        with self._file_lock:
+            index = dict(self.load(guild_id))
+            removed = [sid for sid in suggestion_ids if index.pop(sid, None) is not None]
+            if not removed:
+                return 0
+            # The tombstones keep them deleted if the index is ever rebuilt
+            self._write_member(guild_id, [{"suggestion_id": sid, "deleted": True} for sid in removed])
+            records = self._records.get(guild_id, 0) + len(removed)
+            self._write_index(guild_id, index, records)
+            self._indexes[guild_id] = index
+            self._records[guild_id] = records
+            self._maybe_compact(guild_id)
+        return len(removed)
+
+    def _maybe_compact(self, guild_id: int):
+        superseded = self.superseded(guild_id)
+        if superseded >= COMPACT_MIN_SUPERSEDED and superseded >= self.count(guild_id):
+            self.compact(guild_id)
+
+    def compact(self, guild_id: int) -> int:
+        """Rewrite a guild's data file with only the current copy of each
+        suggestion. Returns how many records were dropped."""
+        if self._path is None:
+            return 0
+        with self._file_lock:
+            index = self.load(guild_id)
+            current = self.get_many(guild_id, sorted(index))
+            data_file = self._data_file(guild_id)
+            tmp = data_file.with_suffix(".tmp")
+            new_index: Dict[int, Location] = {}
+            ids = sorted(current)
+            with tmp.open("wb") as fp:
+                for start in range(0, len(ids), COMPACT_MEMBER_SIZE):
+                    chunk = ids[start:start + COMPACT_MEMBER_SIZE]
+                    member = _compress([current[sid] for sid in chunk])
+                    offset = fp.tell()
+                    fp.write(member)
+                    for line_no, sid in enumerate(chunk):
+                        new_index[sid] = (offset, len(member), line_no)
+                fp.flush()
+                os.fsync(fp.fileno())
+            dropped = self._records.get(guild_id, 0) - len(ids)
+            # A crash before the index is rewritten leaves a size mismatch,
+            # which makes the next load rescan the compacted file
+            os.replace(tmp, data_file)
+            self._write_index(guild_id, new_index, len(ids))
+            self._indexes[guild_id] = new_index
+            self._records[guild_id] = len(ids)
+            with self._cache_lock:
+                for key in [k for k in self._members if k[0] == guild_id]:
+                    del self._members[key]
+        logger.info(f"Compacted suggestion archive for guild {guild_id}: dropped {dropped} superseded record(s)")
+        return dropped
+
+    # ---------------- Reading ----------------
+
+    def _member(self, guild_id: int, offset: int, length: int) -> List[Dict[str, Any]]:
+        key = (guild_id, offset)
+        with self._cache_lock:
+            cached = self._members.get(key)
+            if cached is not None:
+                self._members.move_to_end(key)
+                return cached
+        with self._data_file(guild_id).open("rb") as fp:
+            fp.seek(offset)
+            compressed = fp.read(length)
+        payload = zlib.decompress(compressed, wbits=31).decode("utf-8")
+        records = [json.loads(line) for line in payload.splitlines()]
+        with self._cache_lock:
+            self._members[key] = records
+            while len(self._members) > MEMBER_CACHE_SIZE:
+                self._members.popitem(last=False)
+        return records
+
+    def get(self, guild_id: int, suggestion_id: int) -> Optional[Dict[str, Any]]:
+        with self._file_lock:
+            location = self.load(guild_id).get(suggestion_id)
+            if location is None:
+                return None
+            offset, length, line_no = location
+            return dict(self._member(guild_id, offset, length)[line_no])
+
+    def get_many(self, guild_id: int, suggestion_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Several archived suggestions, decompressing each member at most once."""
+        with self._file_lock:
+            index = self.load(guild_id)
+            by_member: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+            for sid in suggestion_ids:
+                location = index.get(sid)
+                if location is not None:
+                    by_member.setdefault(location[:2], []).append((sid, location[2]))
+            result = {}
+            for (offset, length), wanted in by_member.items():
+                records = self._member(guild_id, offset, length)
+                for sid, line_no in wanted:
+                    result[sid] = dict(records[line_no])
+            return result
+
+    def all(self, guild_id: int) -> Dict[str, Dict[str, Any]]:
+        """Every archived suggestion of a guild as ``{suggestion_id: data}``."""
+        return {str(sid): data for sid, data in self.get_many(guild_id, self.load(guild_id)).items()}
@@ -64,34 +64,22 @@ class DashboardIntegration:
                 except Exception as e:
                     notifications.append({"message": f"Error: {e}", "category": "danger"})
 
-        # GET — load THIS guild's suggestions
+        # GET — load THIS guild's suggestions (one page from the ranking index)
         try:
             data = await self.config.guild(guild).all()
+            counts = await self.storage.count_suggestions(guild)
+            _total, page = await self.storage.list_suggestions(guild, limit=50)
         except Exception:
             return {"status": 0, "web_content": {"source": '<div class="trini-tp-empty"><i class="fa fa-exclamation-triangle fa-3x"></i><p>Error al cargar datos.</p></div>'}}
 
-        suggestions_raw = data.get("suggestions", {})
-
         # Count by status
         status_counts = {}
         for st in SuggestionStatus:
-            status_counts[st.value] = 0
+            status_counts[st.value] = counts.get(st.value, 0)
 
         suggestions_list = []
-        for sid, sdata in suggestions_raw.items():
-            if not isinstance(sdata, dict):
-                continue
-            if sdata.get("deleted", False):
-                continue
-            status_val = str(sdata.get("status", "pending"))
-            try:
-                SuggestionStatus(status_val)
-            except ValueError:
-                status_val = "pending"
-            if status_val in status_counts:
-                status_counts[status_val] += 1
-
-            author_id = int(sdata.get("author_id", 0) or 0)
+        for suggestion in page:
+            author_id = suggestion.author_id
             author_name = f"ID: {author_id}"
             member = guild.get_member(author_id)
             if member:
@@ -101,40 +89,33 @@ class DashboardIntegration:
                 if user:
                     author_name = str(user.display_name)
 
-            content = str(sdata.get("content", ""))
+            content = str(suggestion.content)
             preview = content[:120] + ("..." if len(content) > 120 else "")
 
-            up = len(sdata.get("voters_up", []))
-            down = len(sdata.get("voters_down", []))
-
-            try:
-                status_info = STATUS_CONFIG.get(SuggestionStatus(status_val), {})
-            except ValueError:
-                status_info = {"label": status_val, "emoji": ""}
+            status_val = suggestion.status.value
+            status_info = STATUS_CONFIG.get(suggestion.status, {})
 
             suggestions_list.append({
-                "id": int(sid),
+                "id": suggestion.suggestion_id,
                 "content": html_mod.escape(preview),
                 "author": html_mod.escape(author_name),
-                "upvotes": up,
-                "downvotes": down,
-                "score": up - down,
+                "upvotes": suggestion.upvotes,
+                "downvotes": suggestion.downvotes,
+                "score": suggestion.score,
                 "status": status_val,
                 "status_label": str(status_info.get("label", status_val)),
                 "status_emoji": str(status_info.get("emoji", "")),
-                "reason": html_mod.escape(str(sdata.get("reason", "") or "")),
-                "created_at": str(sdata.get("created_at", ""))[:10],
+                "reason": html_mod.escape(str(suggestion.reason or "")),
+                "created_at": str(suggestion.created_at or "")[:10],
             })
 
-        suggestions_list.sort(key=lambda s: s["id"], reverse=True)
-
         ch_id = data.get("suggestion_channel")
         ch_name = ""
         if ch_id:
             ch = guild.get_channel(ch_id)
             ch_name = f"#{ch.name}" if ch else ""
 
-        total = len(suggestions_list)
+        total = sum(counts.values())
 
         # Build status options
         statuses = []
@@ -245,7 +226,7 @@ function toggleStatus(s) {
             "status": 0,
             "web_content": {
                 "source": source,
-                "suggestions": suggestions_list[:50],
+                "suggestions": suggestions_list,
                 "statuses": statuses,
                 "status_counts": status_counts,
                 "total": total,
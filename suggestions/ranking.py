@@ -0,0 +1,256 @@
+"""
+Ranking index for SimpleSuggestions listings.
+
+Listing suggestions used to build a ``SuggestionData`` for every stored entry,
+filter them and sort on each call. This index keeps, per guild, one small
+record per live suggestion (status, author, vote counts, creation time) and
+one sorted list per (ordering, status) pair, so a page of a listing is a
+slice of IDs. It is loaded once per guild from storage and kept current by
+``SuggestionStorage``: votes, status changes and deletions re-rank just the
+suggestion they touched.
+
+Orderings:
+- ``newest``: suggestion ID, descending.
+- ``top``: lower bound of the Wilson score interval of the upvote ratio.
+- ``controversial``: many votes, split close to evenly.
+- ``hot``: net score on a log scale plus creation time, so newer suggestions
+  need fewer votes to rank high. The time term is fixed per suggestion, so
+  the order only changes on votes and never has to be recomputed as time passes.
+"""
+import logging
+import math
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("red.killerbite95.suggestions.ranking")
+
+SORT_ORDERS = ("newest", "top", "controversial", "hot")
+
+# 95% confidence for the Wilson lower bound
+WILSON_Z = 1.96
+# Seconds of age worth one order of magnitude of net votes in the hot score
+HOT_DECAY_SECONDS = 45000
+# Reference point for the hot score's time term (2020-01-01 UTC)
+HOT_EPOCH = 1577836800
+
+
+def wilson_lower_bound(up: int, down: int, z: float = WILSON_Z) -> float:
+    """Lower bound of the Wilson score interval for the share of upvotes."""
+    n = up + down
+    if n == 0:
+        return 0.0
+    phat = up / n
+    z2 = z * z
+    return (phat + z2 / (2 * n) - z * math.sqrt((phat * (1 - phat) + z2 / (4 * n)) / n)) / (1 + z2 / n)
+
+
+def controversy(up: int, down: int) -> float:
+    """Total votes weighted by how evenly they are split; 0 if one side is empty."""
+    if up <= 0 or down <= 0:
+        return 0.0
+    balance = min(up, down) / max(up, down)
+    return (up + down) ** balance
+
+
+def hot(up: int, down: int, created_ts: float) -> float:
+    """Net score on a log scale plus a creation-time bonus."""
+    score = up - down
+    order = math.log10(max(abs(score), 1))
+    sign = 1 if score > 0 else -1 if score < 0 else 0
+    return sign * order + (created_ts - HOT_EPOCH) / HOT_DECAY_SECONDS
+
+
+def _timestamp(created_at: Optional[str]) -> float:
+    if not created_at:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return 0.0
+    if parsed.tzinfo is None:
+        # Stored with datetime.utcnow()
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class _Record:
+    __slots__ = ("status", "author_id", "up", "down", "created_ts")
+
+    def __init__(self, status: str, author_id: int, up: int, down: int, created_ts: float):
+        self.status = status
+        self.author_id = author_id
+        self.up = up
+        self.down = down
+        self.created_ts = created_ts
+
+    def key(self, sort: str, suggestion_id: int) -> Tuple[float, int]:
+        """Ascending sort key: best first, newest first on ties."""
+        if sort == "top":
+            score = wilson_lower_bound(self.up, self.down)
+        elif sort == "controversial":
+            score = controversy(self.up, self.down)
+        elif sort == "hot":
+            score = hot(self.up, self.down, self.created_ts)
+        else:
+            score = 0.0
+        return (-score, -suggestion_id)
+
+
+class _GuildRanking:
+    def __init__(self):
+        self.records: Dict[int, _Record] = {}
+        # (sort, status or None) -> [(key, suggestion_id), ...] ascending
+        self.orders: Dict[Tuple[str, Optional[str]], List[Tuple[Tuple[float, int], int]]] = {}
+        self.by_author: Dict[int, List[int]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, suggestion_id: int, record: _Record):
+        self.records[suggestion_id] = record
+        for sort in SORT_ORDERS:
+            entry = (record.key(sort, suggestion_id), suggestion_id)
+            insort(self.orders.setdefault((sort, None), []), entry)
+            insort(self.orders.setdefault((sort, record.status), []), entry)
+        insort(self.by_author.setdefault(record.author_id, []), suggestion_id)
+        self.counts[record.status] = self.counts.get(record.status, 0) + 1
+
+    def discard(self, suggestion_id: int):
+        record = self.records.pop(suggestion_id, None)
+        if record is None:
+            return
+        for sort in SORT_ORDERS:
+            entry = (record.key(sort, suggestion_id), suggestion_id)
+            for bucket in ((sort, None), (sort, record.status)):
+                order = self.orders.get(bucket)
+                if not order:
+                    continue
+                pos = bisect_left(order, entry)
+                if pos < len(order) and order[pos] == entry:
+                    del order[pos]
+        authored = self.by_author.get(record.author_id)
+        if authored is not None:
+            pos = bisect_left(authored, suggestion_id)
+            if pos < len(authored) and authored[pos] == suggestion_id:
+                del authored[pos]
+            if not authored:
+                del self.by_author[record.author_id]
+        self.counts[record.status] -= 1
+        if not self.counts[record.status]:
+            del self.counts[record.status]
+
+
+# (suggestion_id, status, author_id, upvotes, downvotes, created_at iso string)
+RankRow = Tuple[int, str, int, int, int, Optional[str]]
+
+
+def _record_of(row: RankRow) -> _Record:
+    _, status, author_id, up, down, created_at = row
+    return _Record(status, author_id, up, down, _timestamp(created_at))
+
+
+class SuggestionRankingIndex:
+    """guild_id -> ranked live suggestions (deleted ones are never ranked)."""
+
+    def __init__(self):
+        self._guilds: Dict[int, _GuildRanking] = {}
+        # Writes that land while a guild is being loaded, replayed afterwards
+        self._loading: Dict[int, List[Tuple[str, tuple]]] = {}
+
+    # ---------------- Loading ----------------
+
+    def is_loaded(self, guild_id: int) -> bool:
+        return guild_id in self._guilds
+
+    def begin_load(self, guild_id: int):
+        self._loading.setdefault(guild_id, [])
+
+    def load_guild(self, guild_id: int, rows: Iterable[RankRow]):
+        """(Re)build a guild's rankings from its live suggestions and replay pending writes."""
+        ranking = _GuildRanking()
+        for row in rows:
+            ranking.add(row[0], _record_of(row))
+        self._guilds[guild_id] = ranking
+        for op, args in self._loading.pop(guild_id, []):
+            getattr(self, op)(guild_id, *args)
+        logger.debug(f"Ranking index built for guild {guild_id}: {len(ranking.records)} suggestion(s)")
+
+    def abort_load(self, guild_id: int):
+        self._loading.pop(guild_id, None)
+
+    def drop_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+
+    # ---------------- Maintenance ----------------
+
+    def upsert(self, guild_id: int, row: RankRow):
+        """Re-rank a live suggestion after it was written."""
+        if guild_id in self._loading:
+            self._loading[guild_id].append(("upsert", (row,)))
+        ranking = self._guilds.get(guild_id)
+        if ranking is None:
+            return
+        ranking.discard(row[0])
+        ranking.add(row[0], _record_of(row))
+
+    def update_votes(self, guild_id: int, suggestion_id: int, up: int, down: int):
+        """Re-rank a suggestion after a vote; cheaper than a full upsert."""
+        if guild_id in self._loading:
+            self._loading[guild_id].append(("update_votes", (suggestion_id, up, down)))
+        ranking = self._guilds.get(guild_id)
+        if ranking is None:
+            return
+        record = ranking.records.get(suggestion_id)
+        if record is None or (record.up, record.down) == (up, down):
+            return
+        ranking.discard(suggestion_id)
+        ranking.add(suggestion_id, _Record(record.status, record.author_id, up, down, record.created_ts))
+
+    def remove(self, guild_id: int, suggestion_id: int):
+        if guild_id in self._loading:
+            self._loading[guild_id].append(("remove", (suggestion_id,)))
+        ranking = self._guilds.get(guild_id)
+        if ranking is not None:
+            ranking.discard(suggestion_id)
+
+    # ---------------- Queries ----------------
+
+    def page(
+        self,
+        guild_id: int,
+        sort: str = "newest",
+        status: Optional[str] = None,
+        author_id: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, List[int]]:
+        """Return (total, [suggestion_id, ...]) for one page of a listing."""
+        ranking = self._guilds.get(guild_id)
+        if ranking is None:
+            return 0, []
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        end = None if limit is None else offset + limit
+
+        if author_id is not None:
+            # An author's suggestions are few; rank them on the fly
+            ids = ranking.by_author.get(author_id, [])
+            if status is not None:
+                ids = [sid for sid in ids if ranking.records[sid].status == status]
+            ordered = sorted(ids, key=lambda sid: ranking.records[sid].key(sort, sid))
+            return len(ordered), ordered[offset:end]
+
+        order = ranking.orders.get((sort, status), [])
+        return len(order), [sid for _, sid in order[offset:end]]
+
+    def counts(self, guild_id: int) -> Dict[str, int]:
+        """Live suggestions per status."""
+        ranking = self._guilds.get(guild_id)
+        return dict(ranking.counts) if ranking is not None else {}
+
+    def total(self, guild_id: int, statuses: Optional[Iterable[str]] = None) -> int:
+        ranking = self._guilds.get(guild_id)
+        if ranking is None:
+            return 0
+        if statuses is None:
+            return len(ranking.records)
+        return sum(ranking.counts.get(status, 0) for status in statuses)
@@ -0,0 +1,311 @@
+"""
+Full-text and near-duplicate index for SimpleSuggestions.
+
+Finding a suggestion by its text meant loading every suggestion of the guild
+and scanning the content. This index keeps, per guild, an inverted index of
+accent-folded tokens (ranked with BM25) and a MinHash signature of each
+suggestion's character shingles, bucketed with LSH bands so that likely
+duplicates of a new text are found without comparing against every
+suggestion. It is loaded once per guild from storage and kept current by
+``SuggestionStorage``, which calls ``upsert`` and ``remove`` after each write.
+"""
+import heapq
+import logging
+import math
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("red.killerbite95.suggestions.search")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# MinHash signature length and LSH banding (BANDS * ROWS == NUM_BINS).
+# Pairs above ~0.45 Jaccard share at least one band with high probability.
+NUM_BINS = 64
+LSH_BANDS = 16
+LSH_ROWS = 4
+SHINGLE_SIZE = 4
+# Estimated similarity from which a suggestion is reported as a likely duplicate
+DUPLICATE_THRESHOLD = 0.5
+
+_BIN_BITS = NUM_BINS.bit_length() - 1
+_EMPTY = -1
+
+_TOKEN_RE = re.compile(r"\w+")
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+
+# Function words of our Spanish/English community; they match nearly everything
+STOPWORDS = frozenset(
+    """
+    a al algo algun alguna algunas alguno algunos ante con como cual cuando de del desde
+    donde el ella ellas ellos en entre era es esa ese eso esta estan este esto fue ha hay
+    la las le les lo los mas me mi mis muy no nos o para pero poder por porque que se ser
+    si sin sobre su sus tambien te tener todo todos tu un una unas uno unos y ya yo
+    an and are as at be but by can could do for from has have i if in into is it its
+    just like more my of on or our should so than that the their them then there these
+    they this to too was we were what when which will with would you your
+    """.split()
+)
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents: "Canción" and "cancion" index the same."""
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text.casefold()))
+
+
+def tokenize(text: str) -> List[str]:
+    """Accent-folded search terms of a text, stopwords removed."""
+    tokens = []
+    for token in _TOKEN_RE.findall(fold(text)):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+        # Cheap plural folding shared by both languages ("canales" ~ "canal" is
+        # not caught, "emojis" ~ "emoji" and "roles" ~ "role" are)
+        if len(token) > 4 and token.endswith("s"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _shingles(text: str) -> Set[int]:
+    """Hashed character shingles of the folded, whitespace-collapsed text."""
+    normalized = " ".join(_TOKEN_RE.findall(fold(text)))
+    if len(normalized) <= SHINGLE_SIZE:
+        pieces = {normalized} if normalized else set()
+    else:
+        pieces = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    # The index lives in memory only, so the per-process string hash is enough
+    return {hash(piece) & 0xFFFFFFFF for piece in pieces}
+
+
+def minhash(text: str) -> Optional[Tuple[int, ...]]:
+    """MinHash signature of a text, or None if it has no content.
+
+    One-permutation hashing: each shingle hash picks a bin with its low bits
+    and competes for that bin's minimum with the rest, so a signature costs
+    one pass over the shingles instead of one per bin. Empty bins borrow the
+    next filled bin's value, offset by the distance (rotation densification).
+    """
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    bins = [_EMPTY] * NUM_BINS
+    for h in shingles:
+        slot = h & (NUM_BINS - 1)
+        value = h >> _BIN_BITS
+        current = bins[slot]
+        if current == _EMPTY or value < current:
+            bins[slot] = value
+    signature = list(bins)
+    for i in range(NUM_BINS):
+        if bins[i] != _EMPTY:
+            continue
+        distance = 1
+        while bins[(i + distance) % NUM_BINS] == _EMPTY:
+            distance += 1
+        signature[i] = bins[(i + distance) % NUM_BINS] + (distance << 32)
+    return tuple(signature)
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [(i, signature[i * LSH_ROWS:(i + 1) * LSH_ROWS]) for i in range(LSH_BANDS)]
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_BINS
+
+
+class _GuildSearch:
+    def __init__(self):
+        # token -> {suggestion_id: term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.lengths: Dict[int, int] = {}
+        self.statuses: Dict[int, str] = {}
+        self.total_length = 0
+        self.signatures: Dict[int, Tuple[int, ...]] = {}
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = {}
+
+    def add(self, suggestion_id: int, content: str, status: str):
+        counts: Dict[str, int] = {}
+        for token in tokenize(content):
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self.postings.setdefault(token, {})[suggestion_id] = tf
+        length = sum(counts.values())
+        self.lengths[suggestion_id] = length
+        self.total_length += length
+        self.statuses[suggestion_id] = status
+
+        signature = minhash(content)
+        if signature is not None:
+            self.signatures[suggestion_id] = signature
+            for band in _bands(signature):
+                self.buckets.setdefault(band, set()).add(suggestion_id)
+
+    def discard(self, suggestion_id: int, content: str):
+        if suggestion_id not in self.lengths:
+            return
+        for token in set(tokenize(content)):
+            docs = self.postings.get(token)
+            if docs is not None:
+                docs.pop(suggestion_id, None)
+                if not docs:
+                    del self.postings[token]
+        self.total_length -= self.lengths.pop(suggestion_id)
+        self.statuses.pop(suggestion_id, None)
+
+        signature = self.signatures.pop(suggestion_id, None)
+        if signature is not None:
+            for band in _bands(signature):
+                members = self.buckets.get(band)
+                if members is not None:
+                    members.discard(suggestion_id)
+                    if not members:
+                        del self.buckets[band]
+
+
+class SuggestionSearchIndex:
+    """guild_id -> searchable suggestions (deleted ones are never indexed)."""
+
+    def __init__(self):
+        self._guilds: Dict[int, _GuildSearch] = {}
+        # Indexed content per suggestion, needed to unindex it on change
+        self._content: Dict[Tuple[int, int], str] = {}
+        # Writes that land while a guild is being loaded, replayed afterwards
+        self._loading: Dict[int, List[Tuple[str, tuple]]] = {}
+
+    # ---------------- Loading ----------------
+
+    def is_loaded(self, guild_id: int) -> bool:
+        return guild_id in self._guilds
+
+    def begin_load(self, guild_id: int):
+        self._loading.setdefault(guild_id, [])
+
+    def load_guild(self, guild_id: int, suggestions: Dict[str, Dict[str, Any]]):
+        """(Re)build a guild's index from its stored suggestions and replay pending writes."""
+        self._drop_content(guild_id)
+        guild_search = _GuildSearch()
+        for data in suggestions.values():
+            if data.get("deleted", False):
+                continue
+            sid = int(data.get("suggestion_id", 0))
+            content = data.get("content", "")
+            guild_search.add(sid, content, data.get("status", "pending"))
+            self._content[(guild_id, sid)] = content
+        self._guilds[guild_id] = guild_search
+        for op, args in self._loading.pop(guild_id, []):
+            getattr(self, op)(guild_id, *args)
+        logger.debug(f"Search index built for guild {guild_id}: {len(guild_search.lengths)} suggestion(s)")
+
+    def abort_load(self, guild_id: int):
+        self._loading.pop(guild_id, None)
+
+    def drop_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+        self._drop_content(guild_id)
+
+    def _drop_content(self, guild_id: int):
+        for key in [k for k in self._content if k[0] == guild_id]:
+            del self._content[key]
+
+    # ---------------- Maintenance ----------------
+
+    def upsert(self, guild_id: int, data: Dict[str, Any]):
+        """Index a suggestion after it was written (or unindex it if deleted)."""
+        if guild_id in self._loading:
+            self._loading[guild_id].append(("upsert", (data,)))
+        guild_search = self._guilds.get(guild_id)
+        if guild_search is None:
+            return
+        sid = int(data.get("suggestion_id", 0))
+        key = (guild_id, sid)
+        old = self._content.pop(key, None)
+        if old is not None:
+            guild_search.discard(sid, old)
+        if data.get("deleted", False):
+            return
+        content = data.get("content", "")
+        guild_search.add(sid, content, data.get("status", "pending"))
+        self._content[key] = content
+
+    def remove(self, guild_id: int, suggestion_id: int):
+        if guild_id in self._loading:
+            self._loading[guild_id].append(("remove", (suggestion_id,)))
+        guild_search = self._guilds.get(guild_id)
+        old = self._content.pop((guild_id, suggestion_id), None)
+        if guild_search is not None and old is not None:
+            guild_search.discard(suggestion_id, old)
+
+    # ---------------- Queries ----------------
+
+    def search(
+        self,
+        guild_id: int,
+        query: str,
+        statuses: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """[(suggestion_id, relevance), ...] best first, BM25 over the query terms."""
+        guild_search = self._guilds.get(guild_id)
+        if guild_search is None or not guild_search.lengths:
+            return []
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        allowed = set(statuses) if statuses is not None else None
+
+        count = len(guild_search.lengths)
+        average = guild_search.total_length / count or 1.0
+        scores: Dict[int, float] = {}
+        for term in terms:
+            docs = guild_search.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for sid, tf in docs.items():
+                if allowed is not None and guild_search.statuses.get(sid) not in allowed:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * guild_search.lengths[sid] / average)
+                scores[sid] = scores.get(sid, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = ((score, sid) for sid, score in scores.items())
+        if limit is not None:
+            best = heapq.nlargest(limit, ranked)
+        else:
+            best = sorted(ranked, reverse=True)
+        return [(sid, round(score, 4)) for score, sid in best]
+
+    def similar(
+        self,
+        guild_id: int,
+        text: str,
+        limit: int = 3,
+        threshold: float = DUPLICATE_THRESHOLD,
+        statuses: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[int, float]]:
+        """[(suggestion_id, similarity), ...] of likely duplicates of ``text``."""
+        guild_search = self._guilds.get(guild_id)
+        if guild_search is None:
+            return []
+        signature = minhash(text)
+        if signature is None:
+            return []
+        allowed = set(statuses) if statuses is not None else None
+
+        candidates: Set[int] = set()
+        for band in _bands(signature):
+            candidates |= guild_search.buckets.get(band, set())
+
+        matches = []
+        for sid in candidates:
+            if allowed is not None and guild_search.statuses.get(sid) not in allowed:
+                continue
+            score = similarity(signature, guild_search.signatures[sid])
+            if score >= threshold:
+                matches.append((score, sid))
+        return [(sid, round(score, 2)) for score, sid in heapq.nlargest(limit, matches)]
@@ -13,10 +13,12 @@ Features:
 import discord # pyright: ignore[reportMissingImports]
 from redbot.core import commands, Config, checks, app_commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.i18n import Translator, cog_i18n
 from typing import Optional, Union
 import logging
 import re
+import time
 from datetime import datetime
 
 from .storage import (
@@ -24,8 +26,11 @@ from .storage import (
     SuggestionStatus,
     STATUS_CONFIG,
     CURRENT_SCHEMA_VERSION,
+    SUGGESTION_GROUP,
+    SUGGESTION_REF_GROUP,
     migrate_schema,
 )
+from .ranking import SORT_ORDERS
 from .embeds import (
     create_suggestion_embed,
     create_status_change_embed,
@@ -33,10 +38,10 @@ from .embeds import (
     create_history_embed,
 )
 from .views import (
-    SuggestionView,
-    StaffActionsView,
     SuggestionModal,
     SuggestionListView,
+    VoteMessageRefresher,
+    render_components,
     setup_persistent_views,
     cleanup_persistent_views,
     handle_suggestion_interaction,
@@ -47,6 +52,11 @@ logger = logging.getLogger("red.killerbite95.suggestions")
 
 _ = Translator("SimpleSuggestions", __file__)
 
+# Seconds between progress edits while resync reads the channel history
+RESYNC_PROGRESS_INTERVAL = 3.0
+# Results shown by suggestsearch
+SEARCH_RESULTS = 10
+
 
 @cog_i18n(_)
 class SimpleSuggestions(DashboardIntegration, commands.Cog):
@@ -74,6 +84,7 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
             "thread_auto_archive": False,
             "thread_archive_duration": 1440,  # minutes: 60, 1440, 4320, 10080
             "thread_on_votes": 0,  # Create thread when reaching X votes (0 = always)
+            "archive_after_days": 30,  # Archive resolved suggestions after X days (0 = never)
             
             # Notifications
             "notify_author": True,
@@ -82,18 +93,23 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
             # Permissions
             "staff_role": None,
             
-            # Data
+            # Data (suggestions themselves live in the SUGGESTION custom group)
             "suggestion_counter": 0,
-            "suggestions": {},
+            "suggestions": {},  # Legacy (schema v2 and earlier, for migration)
             "schema_version": CURRENT_SCHEMA_VERSION,
+            "message_index_version": 0,
             
             # Legacy (for migration)
             "suggestion_id": 0,
         }
         self.config.register_guild(**default_guild)
+        self.config.init_custom(SUGGESTION_GROUP, 2)
+        self.config.init_custom(SUGGESTION_REF_GROUP, 1)
         
         # Initialize storage handler
-        self.storage = SuggestionStorage(bot, self.config)
+        self.storage = SuggestionStorage(bot, self.config, cog_data_path(self))
+        # Debounced edits of suggestion messages after votes
+        self.vote_refresher = VoteMessageRefresher(self)
         
         # Persistent view handler reference
         self._persistent_view_handler = None
@@ -101,12 +117,16 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
     async def cog_load(self):
         """Called when cog is loaded."""
         await super().cog_load()
+        await self._migrate_all_guilds()
+        self.storage.start()
         await setup_persistent_views(self.bot, self)
         logger.info(f"SimpleSuggestions v{self.__version__} loaded")
     
     async def cog_unload(self):
         """Called when cog is unloaded."""
         await cleanup_persistent_views(self.bot, self)
+        self.vote_refresher.close()
+        await self.storage.close()
         logger.info("SimpleSuggestions unloaded")
     
     @commands.Cog.listener()
@@ -120,6 +140,15 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         """Ensure guild data is migrated to latest schema."""
         await migrate_schema(self.config, guild)
     
+    async def _migrate_all_guilds(self):
+        """Migrate every guild with legacy data up front, so votes never hit old storage."""
+        for guild_id, data in (await self.config.all_guilds()).items():
+            if data.get("suggestions") or data.get("schema_version", CURRENT_SCHEMA_VERSION) < CURRENT_SCHEMA_VERSION:
+                try:
+                    await migrate_schema(self.config, discord.Object(id=guild_id))
+                except Exception as e:
+                    logger.error(f"Failed to migrate suggestions for guild {guild_id}: {e}", exc_info=True)
+    
     async def _get_suggestion_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
         """Get the configured suggestion channel."""
         channel_id = await self.config.guild(guild).suggestion_channel()
@@ -246,18 +275,8 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         use_buttons = await self.config.guild(channel.guild).use_buttons()
         
         if use_buttons:
-            # Create view with buttons
-            view = SuggestionView(self, suggestion.suggestion_id)
-            view.update_vote_counts(0, 0)
-            
-            # Add staff buttons
-            staff_view = StaffActionsView(self, suggestion.suggestion_id)
-            
-            # Combine views (add staff buttons to user view)
-            for item in staff_view.children:
-                view.add_item(item)
-            
-            message = await channel.send(embed=embed, view=view)
+            # Public buttons plus the staff row
+            message = await channel.send(embed=embed, view=render_components(suggestion))
         else:
             # Legacy: use reactions
             message = await channel.send(embed=embed)
@@ -303,6 +322,9 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         else:
             respond = ctx.send
         
+        # Look for likely duplicates before the new suggestion is indexed itself
+        similar = await self.storage.find_similar(ctx.guild, suggestion)
+        
         # Create suggestion in storage
         suggestion_data = await self.storage.create_suggestion(
             ctx.guild,
@@ -334,12 +356,17 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         
         await self.storage.update_suggestion(ctx.guild, suggestion_data)
         
-        await respond(
-            _("✅ Your suggestion **#{suggestion_id}** has been sent in {channel}").format(
-                suggestion_id=suggestion_data.suggestion_id, channel=channel.mention
-            ),
-            ephemeral=True
+        response = _("✅ Your suggestion **#{suggestion_id}** has been sent in {channel}").format(
+            suggestion_id=suggestion_data.suggestion_id, channel=channel.mention
         )
+        if similar:
+            lines = []
+            for match, score in similar:
+                status_info = STATUS_CONFIG.get(match.status, STATUS_CONFIG[SuggestionStatus.PENDING])
+                preview = match.content[:60] + ("..." if len(match.content) > 60 else "")
+                lines.append(f"{status_info['emoji']} **#{match.suggestion_id}** ({score:.0%}) - {preview}")
+            response += "\n\n" + _("⚠️ It looks similar to these existing suggestions:") + "\n" + "\n".join(lines)
+        await respond(response, ephemeral=True)
     
     @commands.hybrid_command(name="editsuggest")
     @app_commands.describe(
@@ -403,21 +430,50 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         
         await ctx.send(_("✅ Your suggestion has been edited."), ephemeral=True)
     
+    @commands.hybrid_command(name="suggestsearch")
+    @app_commands.describe(query="Words to search for in suggestions")
+    async def suggest_search(self, ctx: commands.Context, *, query: str):
+        """
+        Search suggestions by content, best matches first.
+        
+        Accents and upper case are ignored.
+        
+        **Examples:**
+        - `[p]suggestsearch emojis`
+        - `[p]suggestsearch canal de música`
+        """
+        await self._ensure_migrated(ctx.guild)
+        
+        total, results = await self.storage.search_suggestions(ctx.guild, query, limit=SEARCH_RESULTS)
+        if not results:
+            await ctx.send(_("No suggestions match your search."), ephemeral=True)
+            return
+        
+        lines = []
+        for suggestion, _relevance in results:
+            status_info = STATUS_CONFIG.get(suggestion.status, STATUS_CONFIG[SuggestionStatus.PENDING])
+            votes = f"[👍{suggestion.upvotes}/👎{suggestion.downvotes}]"
+            preview = suggestion.content[:80] + ("..." if len(suggestion.content) > 80 else "")
+            lines.append(f"{status_info['emoji']} **#{suggestion.suggestion_id}** {votes} - {preview}")
+        
+        embed = discord.Embed(
+            title=_("🔎 Search: {query}").format(query=query[:100]),
+            description="\n".join(lines),
+            color=discord.Color.blurple()
+        )
+        embed.set_footer(text=_("Showing {shown} of {total} results").format(shown=len(results), total=total))
+        await ctx.send(embed=embed, ephemeral=True)
+    
     @commands.hybrid_command(name="mysuggestions")
     async def my_suggestions(self, ctx: commands.Context):
         """View your own suggestions."""
         await self._ensure_migrated(ctx.guild)
         
-        suggestions = await self.storage.get_all_suggestions(
-            ctx.guild,
-            author_filter=ctx.author.id
-        )
-        
-        if not suggestions:
+        view = SuggestionListView(self, ctx.guild, author_filter=ctx.author.id)
+        if not await view.load_page():
             await ctx.send(_("You have no suggestions."), ephemeral=True)
             return
         
-        view = SuggestionListView(self, suggestions)
         embed = create_suggestion_list_embed(
             view.get_current_page_items(),
             view.page,
@@ -556,16 +612,7 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
                 
                 use_buttons = await self.config.guild(ctx.guild).use_buttons()
                 if use_buttons:
-                    view = SuggestionView(self, suggestion_id)
-                    view.update_vote_counts(suggestion.upvotes, suggestion.downvotes)
-                    if suggestion.status != SuggestionStatus.PENDING:
-                        view.edit_button.disabled = True
-                    
-                    staff_view = StaffActionsView(self, suggestion_id)
-                    for item in staff_view.children:
-                        view.add_item(item)
-                    
-                    await message.edit(embed=embed, view=view)
+                    await message.edit(embed=embed, view=render_components(suggestion))
                 else:
                     await message.edit(embed=embed)
             except discord.NotFound:
@@ -589,7 +636,7 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
     
     @commands.hybrid_command(name="suggestions")
     @checks.admin_or_permissions(manage_guild=True)
-    @app_commands.describe(status="Filter by status")
+    @app_commands.describe(status="Filter by status", sort="Order of the list")
     @app_commands.choices(status=[
         app_commands.Choice(name="All", value="all"),
         app_commands.Choice(name="Pending", value="pending"),
@@ -599,15 +646,33 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         app_commands.Choice(name="Approved", value="approved"),
         app_commands.Choice(name="Implemented", value="implemented"),
         app_commands.Choice(name="Denied", value="denied"),
+    ], sort=[
+        app_commands.Choice(name="Newest", value="newest"),
+        app_commands.Choice(name="Top", value="top"),
+        app_commands.Choice(name="Hot", value="hot"),
+        app_commands.Choice(name="Controversial", value="controversial"),
     ])
     async def list_suggestions(
         self,
         ctx: commands.Context,
-        status: Optional[str] = "all"
+        status: Optional[str] = "all",
+        sort: Optional[str] = "newest"
     ):
-        """List server suggestions."""
+        """
+        List server suggestions.
+        
+        **Orders:** newest, top (best upvote ratio), hot (recent and upvoted),
+        controversial (many votes on both sides)
+        """
         await self._ensure_migrated(ctx.guild)
         
+        if sort not in SORT_ORDERS:
+            await ctx.send(
+                _("❌ Invalid order. Use one of: {orders}").format(orders=", ".join(SORT_ORDERS)),
+                ephemeral=True
+            )
+            return
+        
         status_filter = None
         if status and status != "all":
             try:
@@ -615,16 +680,11 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
             except ValueError:
                 pass
         
-        suggestions = await self.storage.get_all_suggestions(
-            ctx.guild,
-            status_filter=status_filter
-        )
-        
-        if not suggestions:
+        view = SuggestionListView(self, ctx.guild, status_filter=status_filter, sort=sort)
+        if not await view.load_page():
             await ctx.send(_("No suggestions found."), ephemeral=True)
             return
         
-        view = SuggestionListView(self, suggestions, status_filter=status_filter)
         embed = create_suggestion_list_embed(
             view.get_current_page_items(),
             view.page,
@@ -709,26 +769,51 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
             await ctx.send(_("❌ No suggestion channel configured."))
             return
         
-        await ctx.send(_("🔄 Syncing suggestions..."))
+        progress = await ctx.send(_("🔄 Syncing suggestions..."))
         
         suggestions = await self.storage.get_all_suggestions(ctx.guild)
-        deleted_count = 0
-        valid_count = 0
-        
-        for suggestion in suggestions:
+        by_message = {s.message_id: s.suggestion_id for s in suggestions if s.message_id}
+        missing_ids = [s.suggestion_id for s in suggestions if not s.message_id]
+        
+        # One pass over the channel history, starting just before the oldest
+        # suggestion message, instead of one fetch per suggestion
+        live_ids = set()
+        scanned = 0
+        last_update = time.monotonic()
+        if by_message:
             try:
-                await channel.fetch_message(suggestion.message_id)
-                valid_count += 1
-            except discord.NotFound:
-                await self.storage.mark_deleted(ctx.guild, suggestion.suggestion_id)
-                deleted_count += 1
-            except discord.HTTPException:
-                pass
+                async for message in channel.history(
+                    limit=None,
+                    after=discord.Object(id=min(by_message) - 1),
+                    oldest_first=True,
+                ):
+                    scanned += 1
+                    if message.id in by_message:
+                        live_ids.add(message.id)
+                        if len(live_ids) == len(by_message):
+                            break
+                    if time.monotonic() - last_update >= RESYNC_PROGRESS_INTERVAL:
+                        last_update = time.monotonic()
+                        await progress.edit(content=_(
+                            "🔄 Syncing suggestions... {scanned} messages scanned, "
+                            "{found}/{total} suggestions found"
+                        ).format(scanned=scanned, found=len(live_ids), total=len(by_message)))
+            except discord.Forbidden:
+                await progress.edit(content=_("❌ I can't read the message history of {channel}.").format(
+                    channel=channel.mention
+                ))
+                return
+            except discord.HTTPException as e:
+                await progress.edit(content=_("❌ Sync aborted while reading history: {error}").format(error=e))
+                return
         
-        await ctx.send(
+        missing_ids += [sid for mid, sid in by_message.items() if mid not in live_ids]
+        deleted_count = await self.storage.mark_deleted_many(ctx.guild, missing_ids)
+        
+        await progress.edit(content=
             _("✅ Sync completed:\n"
             "• Valid suggestions: {valid}\n"
-            "• Marked as deleted: {deleted}").format(valid=valid_count, deleted=deleted_count)
+            "• Marked as deleted: {deleted}").format(valid=len(live_ids), deleted=deleted_count)
         )
     
     @suggest_admin.command(name="repost")
@@ -746,15 +831,11 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
             return
         
         # Get suggestion including deleted
-        suggestions = await self.config.guild(ctx.guild).suggestions()
-        data = suggestions.get(str(suggestion_id))
-        if not data:
+        suggestion = await self.storage.get_suggestion(ctx.guild, suggestion_id)
+        if not suggestion:
             await ctx.send(_("❌ Suggestion not found."))
             return
         
-        from .storage import SuggestionData
-        suggestion = SuggestionData(data)
-        
         channel = await self._get_suggestion_channel(ctx.guild)
         if not channel:
             await ctx.send(_("❌ No suggestion channel configured."))
@@ -771,6 +852,28 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
             suggestion_id=suggestion_id, url=message.jump_url
         ))
     
+    @suggest_admin.command(name="archive")
+    async def suggest_archive(self, ctx: commands.Context, days: Optional[int] = None):
+        """
+        Move resolved suggestions to the archive now.
+        
+        Implemented, denied, duplicate and won't-do suggestions resolved more than
+        `days` ago (default: the configured `archivedays`) leave the active storage.
+        They can still be viewed with `suggestioninfo` and `suggestionhistory`.
+        
+        **Usage:** `[p]suggestadmin archive [days]`
+        """
+        await self._ensure_migrated(ctx.guild)
+        
+        if days is None:
+            days = await self.config.guild(ctx.guild).archive_after_days()
+        if days < 0:
+            await ctx.send(_("❌ The number of days cannot be negative."))
+            return
+        
+        count = await self.storage.archive_resolved(ctx.guild, days)
+        await ctx.send(_("✅ {count} resolved suggestions archived.").format(count=count))
+    
     @suggest_admin.command(name="purge")
     async def suggest_purge(self, ctx: commands.Context, what: str = "deleted"):
         """
@@ -881,10 +984,29 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         state = _("enabled") if not current else _("disabled")
         await ctx.send(_("✅ Author notifications: **{state}**").format(state=state))
     
+    @suggest_set.command(name="archivedays")
+    async def set_archive_days(self, ctx: commands.Context, days: int):
+        """
+        Archive resolved suggestions after this many days (0 to disable).
+        
+        Archived suggestions are kept compressed outside the active storage and
+        remain viewable by ID.
+        """
+        if days < 0:
+            await ctx.send(_("❌ The number of days cannot be negative."))
+            return
+        await self.config.guild(ctx.guild).archive_after_days.set(days)
+        if days:
+            await ctx.send(_("✅ Resolved suggestions will be archived after **{days}** days.").format(days=days))
+        else:
+            await ctx.send(_("✅ Automatic archiving disabled."))
+    
     @suggest_set.command(name="settings")
     async def show_settings(self, ctx: commands.Context):
         """Show the current configuration."""
         guild_config = await self.config.guild(ctx.guild).all()
+        total_suggestions = len(await self.storage.get_all_raw(ctx.guild))
+        archived_suggestions = await self.storage.count_archived(ctx.guild)
         
         channel = ctx.guild.get_channel(guild_config["suggestion_channel"])
         log_channel = ctx.guild.get_channel(guild_config["log_channel"]) if guild_config["log_channel"] else None
@@ -933,8 +1055,11 @@ class SimpleSuggestions(DashboardIntegration, commands.Cog):
         embed.add_field(
             name=_("📊 Statistics"),
             value=_("**Total suggestions:** {total}\n"
+                  "**Archived:** {archived} (after {days} days)\n"
                   "**Current counter:** #{counter}").format(
-                      total=len(guild_config['suggestions']),
+                      total=total_suggestions,
+                      archived=archived_suggestions,
+                      days=guild_config['archive_after_days'] or "∞",
                       counter=guild_config['suggestion_counter']
                   ),
             inline=False
@@ -3,20 +3,41 @@ Storage module for SimpleSuggestions.
 Handles Config schema, atomic operations, and data migrations.
 """
 import asyncio
+import base64
+import copy
 import discord
 from redbot.core import Config
-from typing import Dict, List, Optional, Any, TYPE_CHECKING
-from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple, TYPE_CHECKING
+from datetime import datetime, timedelta
 from enum import Enum
 import logging
 
+from .archive import SuggestionArchive
+from .ranking import SuggestionRankingIndex, RankRow
+from .search import SuggestionSearchIndex
+
 if TYPE_CHECKING:
     from redbot.core.bot import Red
 
 logger = logging.getLogger("red.killerbite95.suggestions.storage")
 
 # Schema version for migrations
-CURRENT_SCHEMA_VERSION = 2
+CURRENT_SCHEMA_VERSION = 3
+
+# Config custom group holding one entry per suggestion: (guild_id, suggestion_id)
+SUGGESTION_GROUP = "SUGGESTION"
+# Config custom group keyed by guild_id: {message_id or thread_id: suggestion_id}
+SUGGESTION_REF_GROUP = "SUGGESTION_REF"
+# Bumped when the reference index layout changes, forcing a rebuild
+MESSAGE_INDEX_VERSION = 1
+
+# Seconds between write-behind flushes of buffered votes
+VOTE_FLUSH_INTERVAL = 5.0
+
+# Seconds between automatic archive runs, and before the first one
+ARCHIVE_INTERVAL = 6 * 3600
+ARCHIVE_STARTUP_DELAY = 300
 
 
 class SuggestionStatus(Enum):
@@ -32,6 +53,15 @@ class SuggestionStatus(Enum):
     WONT_DO = "wont_do"
 
 
+# Final states; suggestions resolved long enough ago move to the archive
+RESOLVED_STATUSES = {
+    SuggestionStatus.IMPLEMENTED,
+    SuggestionStatus.DENIED,
+    SuggestionStatus.DUPLICATE,
+    SuggestionStatus.WONT_DO,
+}
+
+
 # Status display configuration
 # Labels are in English; use _() at display time for translation
 STATUS_CONFIG = {
@@ -47,6 +77,66 @@ STATUS_CONFIG = {
 }
 
 
+# ==================== VOTER ENCODING ====================
+
+# Voters are persisted as "dv1:" + base64 of the sorted IDs, delta-encoded as
+# LEB128 varints. Snowflake gaps take ~8 bytes instead of ~20 JSON characters.
+# Plain lists (the format before this encoding) are still read.
+VOTERS_PREFIX = "dv1:"
+
+
+def encode_voters(voters: Iterable[int]) -> str:
+    """Encode a collection of user IDs compactly for storage."""
+    out = bytearray()
+    previous = 0
+    for user_id in sorted(voters):
+        delta = user_id - previous
+        previous = user_id
+        while True:
+            byte = delta & 0x7F
+            delta >>= 7
+            if delta:
+                out.append(byte | 0x80)
+            else:
+                out.append(byte)
+                break
+    return VOTERS_PREFIX + base64.b64encode(bytes(out)).decode("ascii")
+
+
+def decode_voters(raw: Any) -> Set[int]:
+    """Decode stored voters: an encoded string or a legacy list of IDs."""
+    if not raw:
+        return set()
+    if isinstance(raw, str):
+        if not raw.startswith(VOTERS_PREFIX):
+            return set()
+        data = base64.b64decode(raw[len(VOTERS_PREFIX):])
+        voters = set()
+        current = shift = value = 0
+        for byte in data:
+            value |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            current += value
+            voters.add(current)
+            shift = value = 0
+        return voters
+    return {int(user_id) for user_id in raw}
+
+
+def count_voters(raw: Any) -> int:
+    """Number of voters in a stored value without building the set."""
+    if not raw:
+        return 0
+    if isinstance(raw, str):
+        if not raw.startswith(VOTERS_PREFIX):
+            return 0
+        # Every ID ends on exactly one byte without the continuation bit
+        return sum(1 for byte in base64.b64decode(raw[len(VOTERS_PREFIX):]) if not byte & 0x80)
+    return len(raw)
+
+
 class SuggestionData:
     """Data class for a suggestion."""
     
@@ -58,8 +148,8 @@ class SuggestionData:
         self.status: SuggestionStatus = SuggestionStatus(data.get("status", "pending"))
         self.created_at: str = data.get("created_at", datetime.utcnow().isoformat())
         self.thread_id: Optional[int] = data.get("thread_id")
-        self.voters_up: List[int] = data.get("voters_up", [])
-        self.voters_down: List[int] = data.get("voters_down", [])
+        self.voters_up: Set[int] = decode_voters(data.get("voters_up"))
+        self.voters_down: Set[int] = decode_voters(data.get("voters_down"))
         self.reason: Optional[str] = data.get("reason")
         self.history: List[Dict[str, Any]] = data.get("history", [])
         self.deleted: bool = data.get("deleted", False)
@@ -74,13 +164,36 @@ class SuggestionData:
             "status": self.status.value,
             "created_at": self.created_at,
             "thread_id": self.thread_id,
-            "voters_up": self.voters_up,
-            "voters_down": self.voters_down,
+            "voters_up": encode_voters(self.voters_up),
+            "voters_down": encode_voters(self.voters_down),
             "reason": self.reason,
             "history": self.history,
             "deleted": self.deleted,
         }
     
+    def copy(self) -> "SuggestionData":
+        """Copy with its own voter sets and history list."""
+        clone = copy.copy(self)
+        clone.voters_up = set(self.voters_up)
+        clone.voters_down = set(self.voters_down)
+        clone.history = list(self.history)
+        return clone
+    
+    def toggle_vote(self, user_id: int, vote_type: str) -> str:
+        """
+        Apply a vote button press: same vote again removes it, the other vote
+        switches. Returns "added", "removed" or "switched".
+        """
+        same, other = (self.voters_up, self.voters_down) if vote_type == "up" else (self.voters_down, self.voters_up)
+        if user_id in same:
+            same.discard(user_id)
+            return "removed"
+        same.add(user_id)
+        if user_id in other:
+            other.discard(user_id)
+            return "switched"
+        return "added"
+    
     @property
     def upvotes(self) -> int:
         return len(self.voters_up)
@@ -104,13 +217,102 @@ class SuggestionData:
         })
 
 
+def _refs_of(data: Dict[str, Any]) -> List[str]:
+    """Message and thread IDs that point at a stored suggestion."""
+    return [str(ref) for ref in (data.get("message_id"), data.get("thread_id")) if ref]
+
+
+def _resolved_at(data: Dict[str, Any]) -> Optional[datetime]:
+    """When a suggestion reached its current status (naive UTC), if known."""
+    stamp = data.get("created_at")
+    for entry in reversed(data.get("history") or []):
+        if entry.get("new_status") == data.get("status"):
+            stamp = entry.get("changed_at")
+            break
+    try:
+        return datetime.fromisoformat(stamp) if stamp else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _rank_row(data: Dict[str, Any]) -> RankRow:
+    """What the ranking index needs of a stored suggestion."""
+    return (
+        int(data.get("suggestion_id", 0)),
+        data.get("status", "pending"),
+        int(data.get("author_id", 0) or 0),
+        count_voters(data.get("voters_up")),
+        count_voters(data.get("voters_down")),
+        data.get("created_at"),
+    )
+
+
+async def rebuild_message_index(config: Config, guild_id: int, suggestions: Dict[str, Dict[str, Any]]) -> int:
+    """Rewrite a guild's message/thread -> suggestion index from its suggestions."""
+    index = {}
+    for data in suggestions.values():
+        for ref in _refs_of(data):
+            index[ref] = data.get("suggestion_id")
+    await config.custom(SUGGESTION_REF_GROUP, str(guild_id)).set(index)
+    await config.guild_from_id(guild_id).message_index_version.set(MESSAGE_INDEX_VERSION)
+    return len(index)
+
+
 class SuggestionStorage:
-    """Handles all storage operations for suggestions."""
+    """Handles all storage operations for suggestions.
+
+    Each suggestion is its own entry in the ``SUGGESTION`` custom group, so
+    reading or writing one suggestion no longer loads and rewrites every
+    suggestion in the guild.
+
+    Votes are write-behind: ``add_vote`` updates an in-memory copy of the
+    suggestion and marks it dirty, and a background task writes dirty
+    suggestions every ``VOTE_FLUSH_INTERVAL`` seconds (and on unload). While a
+    suggestion has buffered votes, reads return the in-memory copy and its
+    voter lists win over whatever a caller passes to ``update_suggestion``.
+
+    Resolved suggestions are moved to a compressed archive after a while (see
+    ``archive.py``). Reads fall back to the archive, and any write to an
+    archived suggestion (a vote, a status change, a repost) brings it back to
+    Config, from where a later archive run moves it out again.
+    """
     
-    def __init__(self, bot: "Red", config: Config):
+    def __init__(self, bot: "Red", config: Config, data_path: Optional[Path] = None):
         self.bot = bot
         self.config = config
         self._locks: Dict[int, asyncio.Lock] = {}  # guild_id -> Lock
+        # (guild_id, suggestion_id) -> in-memory suggestion with buffered votes
+        self._live: Dict[Tuple[int, int], SuggestionData] = {}
+        self._dirty: Set[Tuple[int, int]] = set()
+        self._load_locks: Dict[Tuple[int, int], asyncio.Lock] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # Guilds whose message index is known to be current this session
+        self._indexed: Set[int] = set()
+        # In-memory indexes, loaded per guild on first use and kept current here
+        self.search = SuggestionSearchIndex()
+        self.ranking = SuggestionRankingIndex()
+        self.archive = SuggestionArchive(data_path)
+        self._archive_task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background vote flusher and archiver."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        if self._archive_task is None and self.archive.enabled:
+            self._archive_task = asyncio.create_task(self._archive_loop())
+    
+    async def close(self):
+        """Stop the background tasks and persist any buffered votes."""
+        for task in (self._flush_task, self._archive_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = self._archive_task = None
+        await self.flush_votes()
     
     def _get_lock(self, guild_id: int) -> asyncio.Lock:
         """Get or create a lock for a guild."""
@@ -118,6 +320,108 @@ class SuggestionStorage:
             self._locks[guild_id] = asyncio.Lock()
         return self._locks[guild_id]
     
+    def _entry(self, guild: discord.Guild, suggestion_id: int):
+        """Config group for a single suggestion."""
+        return self.config.custom(SUGGESTION_GROUP, str(guild.id), str(suggestion_id))
+    
+    def _guild_entries(self, guild: discord.Guild):
+        """Config group for every suggestion of a guild."""
+        return self.config.custom(SUGGESTION_GROUP, str(guild.id))
+    
+    def _refs(self, guild: discord.Guild):
+        """Config group mapping message and thread IDs to suggestion IDs."""
+        return self.config.custom(SUGGESTION_REF_GROUP, str(guild.id))
+    
+    async def _ensure_message_index(self, guild: discord.Guild):
+        """Build the reference index once for guilds that predate it."""
+        if guild.id in self._indexed:
+            return
+        async with self._get_lock(guild.id):
+            if await self.config.guild(guild).message_index_version() < MESSAGE_INDEX_VERSION:
+                count = await rebuild_message_index(self.config, guild.id, await self._get_all_with_archive(guild))
+                logger.info(f"Built suggestion message index for guild {guild.id}: {count} reference(s)")
+            self._indexed.add(guild.id)
+    
+    async def _update_refs(self, guild: discord.Guild, old: Dict[str, Any], new: Dict[str, Any]):
+        """Move index entries when a suggestion's message or thread changes."""
+        old_refs, new_refs = set(_refs_of(old)), set(_refs_of(new))
+        refs = self._refs(guild)
+        for ref in old_refs - new_refs:
+            await refs.clear_raw(ref)
+        for ref in new_refs - old_refs:
+            await refs.set_raw(ref, value=new["suggestion_id"])
+    
+    async def _ensure_indexes(self, guild: discord.Guild):
+        """Load a guild into the search and ranking indexes, with a single read."""
+        indexes = [index for index in (self.search, self.ranking) if not index.is_loaded(guild.id)]
+        if not indexes:
+            return
+        async with self._get_lock(guild.id):
+            indexes = [index for index in indexes if not index.is_loaded(guild.id)]
+            if not indexes:
+                return
+            for index in indexes:
+                index.begin_load(guild.id)
+            try:
+                suggestions = await self._get_all_with_archive(guild)
+                live = {k: v for k, v in suggestions.items() if not v.get("deleted", False)}
+                if self.search in indexes:
+                    self.search.load_guild(guild.id, live)
+                if self.ranking in indexes:
+                    self.ranking.load_guild(guild.id, [_rank_row(data) for data in live.values()])
+            except Exception:
+                for index in indexes:
+                    index.abort_load(guild.id)
+                raise
+    
+    async def _get_archived(self, guild_id: int, suggestion_id: int) -> Optional[Dict[str, Any]]:
+        """An archived suggestion's data, or None if it is not archived."""
+        if not self.archive.enabled:
+            return None
+        if not self.archive.is_loaded(guild_id):
+            await asyncio.to_thread(self.archive.load, guild_id)
+        if not self.archive.contains(guild_id, suggestion_id):
+            return None
+        return await asyncio.to_thread(self.archive.get, guild_id, suggestion_id)
+    
+    async def _get_all_with_archive(self, guild: discord.Guild) -> Dict[str, Dict[str, Any]]:
+        """Hot and archived suggestions together, hot copies winning."""
+        suggestions = await self.get_all_raw(guild)
+        if not self.archive.enabled:
+            return suggestions
+        if not self.archive.is_loaded(guild.id):
+            await asyncio.to_thread(self.archive.load, guild.id)
+        if not self.archive.count(guild.id):
+            return suggestions
+        archived = await asyncio.to_thread(self.archive.all, guild.id)
+        return {**archived, **suggestions}
+    
+    async def _discard_archived(self, guild_id: int, suggestion_ids: Iterable[int]):
+        """Tombstone deleted suggestions in the archive so its copy can't resurface."""
+        if not self.archive.enabled:
+            return
+        if not self.archive.is_loaded(guild_id):
+            await asyncio.to_thread(self.archive.load, guild_id)
+        archived = [sid for sid in suggestion_ids if self.archive.contains(guild_id, sid)]
+        if archived:
+            await asyncio.to_thread(self.archive.discard, guild_id, archived)
+    
+    async def count_archived(self, guild: discord.Guild) -> int:
+        """Suggestions of a guild held in the archive."""
+        if not self.archive.enabled:
+            return 0
+        if not self.archive.is_loaded(guild.id):
+            await asyncio.to_thread(self.archive.load, guild.id)
+        return self.archive.count(guild.id)
+    
+    def _reindex(self, guild: discord.Guild, stored: Dict[str, Any]):
+        """Bring the in-memory indexes up to date after a suggestion was written."""
+        self.search.upsert(guild.id, stored)
+        if stored.get("deleted", False):
+            self.ranking.remove(guild.id, int(stored["suggestion_id"]))
+        else:
+            self.ranking.upsert(guild.id, _rank_row(stored))
+    
     async def get_next_suggestion_id(self, guild: discord.Guild) -> int:
         """
         Atomically get and increment the suggestion counter.
@@ -155,39 +459,71 @@ class SuggestionStorage:
             "deleted": False,
         })
         
-        async with self._get_lock(guild.id):
-            suggestions = await self.config.guild(guild).suggestions()
-            suggestions[str(suggestion_id)] = data.to_dict()
-            await self.config.guild(guild).suggestions.set(suggestions)
+        stored = data.to_dict()
+        await self._entry(guild, suggestion_id).set(stored)
+        await self._update_refs(guild, {}, stored)
+        self._reindex(guild, stored)
         
         logger.info(f"Created suggestion #{suggestion_id} in guild {guild.id}")
         return data
     
     async def get_suggestion(self, guild: discord.Guild, suggestion_id: int) -> Optional[SuggestionData]:
         """Get a suggestion by its ID."""
-        suggestions = await self.config.guild(guild).suggestions()
-        data = suggestions.get(str(suggestion_id))
+        live = self._live.get((guild.id, suggestion_id))
+        if live is not None:
+            return live.copy()
+        data = await self._entry(guild, suggestion_id).all()
+        if not data:
+            data = await self._get_archived(guild.id, suggestion_id)
         if data:
             return SuggestionData(data)
         return None
     
     async def get_suggestion_by_message(self, guild: discord.Guild, message_id: int) -> Optional[SuggestionData]:
-        """Get a suggestion by its message ID."""
-        suggestions = await self.config.guild(guild).suggestions()
-        for data in suggestions.values():
-            if data.get("message_id") == message_id:
-                return SuggestionData(data)
+        """Get a suggestion by its message ID (or its thread's ID)."""
+        await self._ensure_message_index(guild)
+        suggestion_id = await self._refs(guild).get_raw(str(message_id), default=None)
+        if suggestion_id is None:
+            return None
+        suggestion = await self.get_suggestion(guild, suggestion_id)
+        if suggestion and message_id in (suggestion.message_id, suggestion.thread_id):
+            return suggestion
         return None
     
+    async def get_all_raw(self, guild: discord.Guild) -> Dict[str, Dict[str, Any]]:
+        """All suggestions of a guild in Config as ``{suggestion_id: data}``, deleted
+        included and archived ones not."""
+        suggestions = await self._guild_entries(guild).all()
+        for (guild_id, suggestion_id), live in self._live.items():
+            if guild_id == guild.id and str(suggestion_id) in suggestions:
+                suggestions[str(suggestion_id)] = live.to_dict()
+        return suggestions
+    
     async def update_suggestion(self, guild: discord.Guild, suggestion: SuggestionData) -> bool:
         """Update a suggestion in storage."""
+        key = (guild.id, suggestion.suggestion_id)
+        entry = self._entry(guild, suggestion.suggestion_id)
         async with self._get_lock(guild.id):
-            suggestions = await self.config.guild(guild).suggestions()
-            if str(suggestion.suggestion_id) in suggestions:
-                suggestions[str(suggestion.suggestion_id)] = suggestion.to_dict()
-                await self.config.guild(guild).suggestions.set(suggestions)
-                return True
-        return False
+            existing = await entry.all()
+            if not existing:
+                # Writing an archived suggestion brings it back to Config
+                existing = await self._get_archived(guild.id, suggestion.suggestion_id)
+            if not existing:
+                return False
+            live = self._live.get(key)
+            if live is not None:
+                # Buffered votes are newer than whatever the caller read
+                suggestion.voters_up = set(live.voters_up)
+                suggestion.voters_down = set(live.voters_down)
+                # Stays dirty so the next flush releases it
+                self._live[key] = suggestion.copy()
+            stored = suggestion.to_dict()
+            await entry.set(stored)
+            await self._update_refs(guild, existing, stored)
+            self._reindex(guild, stored)
+            if suggestion.deleted:
+                await self._discard_archived(guild.id, [suggestion.suggestion_id])
+        return True
     
     async def update_status(
         self,
@@ -211,6 +547,24 @@ class SuggestionStorage:
         logger.info(f"Updated suggestion #{suggestion_id} status: {old_status} -> {new_status.value}")
         return suggestion
     
+    async def _get_live(self, guild: discord.Guild, suggestion_id: int) -> Optional[SuggestionData]:
+        """In-memory copy of a suggestion for voting, loaded from Config on first use."""
+        key = (guild.id, suggestion_id)
+        live = self._live.get(key)
+        if live is not None:
+            return live
+        lock = self._load_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            live = self._live.get(key)
+            if live is None:
+                data = await self._entry(guild, suggestion_id).all()
+                if not data:
+                    data = await self._get_archived(guild.id, suggestion_id)
+                if data:
+                    live = self._live[key] = SuggestionData(data)
+        self._load_locks.pop(key, None)
+        return live
+    
     async def add_vote(
         self,
         guild: discord.Guild,
@@ -222,42 +576,52 @@ class SuggestionStorage:
         Add a vote to a suggestion.
         Returns (suggestion, action) where action is "added", "removed", or "switched".
         Handles toggle and switch logic.
+        
+        The vote is applied in memory and persisted by the next flush.
         """
-        suggestion = await self.get_suggestion(guild, suggestion_id)
+        suggestion = await self._get_live(guild, suggestion_id)
         if not suggestion:
             return None
         
-        action = None
+        action = suggestion.toggle_vote(user_id, vote_type)
         
-        if vote_type == "up":
-            if user_id in suggestion.voters_up:
-                # Toggle off
-                suggestion.voters_up.remove(user_id)
-                action = "removed"
-            else:
-                # Add upvote
-                suggestion.voters_up.append(user_id)
-                action = "added"
-                # Remove downvote if exists
-                if user_id in suggestion.voters_down:
-                    suggestion.voters_down.remove(user_id)
-                    action = "switched"
-        else:  # down
-            if user_id in suggestion.voters_down:
-                # Toggle off
-                suggestion.voters_down.remove(user_id)
-                action = "removed"
-            else:
-                # Add downvote
-                suggestion.voters_down.append(user_id)
-                action = "added"
-                # Remove upvote if exists
-                if user_id in suggestion.voters_up:
-                    suggestion.voters_up.remove(user_id)
-                    action = "switched"
-        
-        await self.update_suggestion(guild, suggestion)
-        return (suggestion, action)
+        self._dirty.add((guild.id, suggestion_id))
+        self.ranking.update_votes(guild.id, suggestion_id, suggestion.upvotes, suggestion.downvotes)
+        return (suggestion.copy(), action)
+    
+    async def flush_votes(self) -> int:
+        """Write every suggestion with buffered votes. Returns how many were written."""
+        dirty, self._dirty = self._dirty, set()
+        written = 0
+        for key in dirty:
+            guild_id, suggestion_id = key
+            entry = self.config.custom(SUGGESTION_GROUP, str(guild_id), str(suggestion_id))
+            try:
+                async with self._get_lock(guild_id):
+                    # Read under the lock: update_suggestion swaps in a new copy while holding it
+                    live = self._live.get(key)
+                    if live is None:
+                        continue
+                    if await entry.all() or self.archive.contains(guild_id, suggestion_id):
+                        await entry.set(live.to_dict())
+                        written += 1
+            except Exception as e:
+                logger.error(f"Failed to flush votes for suggestion #{suggestion_id} in guild {guild_id}: {e}", exc_info=True)
+                self._dirty.add(key)
+                continue
+            if key not in self._dirty:
+                # Nothing new arrived while writing; Config is current again
+                self._live.pop(key, None)
+        return written
+    
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(VOTE_FLUSH_INTERVAL)
+            if self._dirty:
+                try:
+                    await self.flush_votes()
+                except Exception as e:
+                    logger.error(f"Vote flush failed: {e}", exc_info=True)
     
     async def get_all_suggestions(
         self,
@@ -267,7 +631,7 @@ class SuggestionStorage:
         include_deleted: bool = False
     ) -> List[SuggestionData]:
         """Get all suggestions with optional filters."""
-        suggestions = await self.config.guild(guild).suggestions()
+        suggestions = await self.get_all_raw(guild)
         result = []
         
         for data in suggestions.values():
@@ -286,6 +650,88 @@ class SuggestionStorage:
         result.sort(key=lambda s: s.suggestion_id, reverse=True)
         return result
     
+    async def list_suggestions(
+        self,
+        guild: discord.Guild,
+        sort: str = "newest",
+        status_filter: Optional[SuggestionStatus] = None,
+        author_filter: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Tuple[int, List[SuggestionData]]:
+        """
+        One page of a listing from the ranking index, deleted suggestions excluded.
+        Returns (total matching, suggestions). ``sort`` is one of ``SORT_ORDERS``.
+        """
+        await self._ensure_indexes(guild)
+        total, ids = self.ranking.page(
+            guild.id,
+            sort=sort,
+            status=status_filter.value if status_filter else None,
+            author_id=author_filter,
+            offset=offset,
+            limit=limit,
+        )
+        if limit is None:
+            # Whole listing: one read beats one read per suggestion
+            suggestions = await self.get_all_raw(guild)
+            archived_ids = [sid for sid in ids if str(sid) not in suggestions]
+            if archived_ids and self.archive.enabled:
+                archived = await asyncio.to_thread(self.archive.get_many, guild.id, archived_ids)
+                suggestions.update({str(sid): data for sid, data in archived.items()})
+            page = [SuggestionData(suggestions[str(sid)]) for sid in ids if str(sid) in suggestions]
+        else:
+            page = []
+            for sid in ids:
+                suggestion = await self.get_suggestion(guild, sid)
+                if suggestion:
+                    page.append(suggestion)
+        return total, page
+    
+    async def count_suggestions(self, guild: discord.Guild) -> Dict[str, int]:
+        """Live (not deleted) suggestions per status value."""
+        await self._ensure_indexes(guild)
+        return self.ranking.counts(guild.id)
+    
+    async def search_suggestions(
+        self,
+        guild: discord.Guild,
+        query: str,
+        status_filter: Optional[SuggestionStatus] = None,
+        offset: int = 0,
+        limit: int = 10
+    ) -> Tuple[int, List[Tuple[SuggestionData, float]]]:
+        """
+        Ranked full-text search. Returns (total matches, [(suggestion, relevance), ...])
+        for the requested page, best match first.
+        """
+        await self._ensure_indexes(guild)
+        statuses = [status_filter.value] if status_filter else None
+        ranked = self.search.search(guild.id, query, statuses=statuses)
+        page = []
+        for suggestion_id, relevance in ranked[offset:offset + limit]:
+            suggestion = await self.get_suggestion(guild, suggestion_id)
+            if suggestion:
+                page.append((suggestion, relevance))
+        return len(ranked), page
+    
+    async def find_similar(
+        self,
+        guild: discord.Guild,
+        content: str,
+        limit: int = 3
+    ) -> List[Tuple[SuggestionData, float]]:
+        """Likely duplicates of ``content`` as [(suggestion, similarity), ...], most similar first."""
+        await self._ensure_indexes(guild)
+        # Suggestions already closed as duplicates only point at the original
+        statuses = [status.value for status in SuggestionStatus if status != SuggestionStatus.DUPLICATE]
+        result = []
+        for suggestion_id, score in self.search.similar(guild.id, content, limit=limit, statuses=statuses):
+            suggestion = await self.get_suggestion(guild, suggestion_id)
+            if suggestion:
+                result.append((suggestion, score))
+        return result
+    
     async def mark_deleted(self, guild: discord.Guild, suggestion_id: int) -> bool:
         """Mark a suggestion as deleted (soft delete)."""
         suggestion = await self.get_suggestion(guild, suggestion_id)
@@ -295,19 +741,97 @@ class SuggestionStorage:
         suggestion.deleted = True
         return await self.update_suggestion(guild, suggestion)
     
+    async def mark_deleted_many(self, guild: discord.Guild, suggestion_ids: Iterable[int]) -> int:
+        """Soft-delete several suggestions, writing only their entries. Returns how many changed."""
+        wanted = {int(sid) for sid in suggestion_ids}
+        if not wanted:
+            return 0
+        async with self._get_lock(guild.id):
+            suggestions = {sid: await self._entry(guild, sid).all() for sid in wanted}
+            missing = [sid for sid, data in suggestions.items() if not data]
+            if missing and self.archive.enabled:
+                # Archived ones come back to Config marked deleted, until purged
+                if not self.archive.is_loaded(guild.id):
+                    await asyncio.to_thread(self.archive.load, guild.id)
+                archived = await asyncio.to_thread(self.archive.get_many, guild.id, missing)
+                suggestions.update(archived)
+            changed = 0
+            for sid, data in suggestions.items():
+                if not data or data.get("deleted", False):
+                    continue
+                data["deleted"] = True
+                await self._entry(guild, sid).set(data)
+                changed += 1
+                live = self._live.get((guild.id, sid))
+                if live is not None:
+                    live.deleted = True
+            if changed:
+                for sid in wanted:
+                    self.search.remove(guild.id, sid)
+                    self.ranking.remove(guild.id, sid)
+                await self._discard_archived(guild.id, wanted)
+        return changed
+    
     async def purge_deleted(self, guild: discord.Guild) -> int:
         """Permanently remove all deleted suggestions. Returns count removed."""
         async with self._get_lock(guild.id):
-            suggestions = await self.config.guild(guild).suggestions()
-            original_count = len(suggestions)
-            
-            suggestions = {
-                k: v for k, v in suggestions.items()
-                if not v.get("deleted", False)
-            }
+            suggestions = await self._guild_entries(guild).all()
+            purged = {k for k, v in suggestions.items() if v.get("deleted", False)}
             
-            await self.config.guild(guild).suggestions.set(suggestions)
-            return original_count - len(suggestions)
+            for sid in purged:
+                await self._entry(guild, int(sid)).clear()
+            # An archived copy would otherwise take the purged one's place
+            await self._discard_archived(guild.id, [int(sid) for sid in purged])
+            refs = await self._refs(guild).all()
+            kept = {ref: sid for ref, sid in refs.items() if str(sid) not in purged}
+            if len(kept) != len(refs):
+                await self._refs(guild).set(kept)
+            for key in [k for k in self._live if k[0] == guild.id and str(k[1]) in purged]:
+                self._live.pop(key, None)
+                self._dirty.discard(key)
+            return len(purged)
+    
+    async def archive_resolved(self, guild: discord.Guild, older_than_days: int) -> int:
+        """
+        Move suggestions resolved more than ``older_than_days`` ago from Config
+        to the archive. Returns how many were archived.
+        """
+        if not self.archive.enabled:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        resolved = {status.value for status in RESOLVED_STATUSES}
+        async with self._get_lock(guild.id):
+            suggestions = await self._guild_entries(guild).all()
+            moving = []
+            for sid, data in suggestions.items():
+                if (guild.id, int(sid)) in self._live:
+                    # Buffered votes; left for a later run
+                    continue
+                if data.get("deleted", False) or data.get("status") not in resolved:
+                    continue
+                resolved_at = _resolved_at(data)
+                if resolved_at is None or resolved_at > cutoff:
+                    continue
+                moving.append(data)
+            if not moving:
+                return 0
+            await asyncio.to_thread(self.archive.append, guild.id, moving)
+            for data in moving:
+                await self._entry(guild, data["suggestion_id"]).clear()
+        logger.info(f"Archived {len(moving)} resolved suggestion(s) of guild {guild.id}")
+        return len(moving)
+    
+    async def _archive_loop(self):
+        await asyncio.sleep(ARCHIVE_STARTUP_DELAY)
+        while True:
+            try:
+                for guild_id, data in (await self.config.all_guilds()).items():
+                    days = data.get("archive_after_days", 0)
+                    if days and days > 0:
+                        await self.archive_resolved(discord.Object(id=guild_id), days)
+            except Exception as e:
+                logger.error(f"Suggestion archive run failed: {e}", exc_info=True)
+            await asyncio.sleep(ARCHIVE_INTERVAL)
     
     async def update_message_id(
         self,
@@ -331,8 +855,11 @@ async def migrate_schema(config: Config, guild: discord.Guild) -> bool:
     Returns True if migration was performed.
     """
     current_version = await config.guild(guild).schema_version()
+    # schema_version defaults to the current version, so guilds that never had
+    # it written would skip the v3 move; leftover legacy data means "not done".
+    legacy = await config.guild(guild).suggestions()
     
-    if current_version >= CURRENT_SCHEMA_VERSION:
+    if current_version >= CURRENT_SCHEMA_VERSION and not legacy:
         return False
     
     logger.info(f"Migrating guild {guild.id} from schema v{current_version} to v{CURRENT_SCHEMA_VERSION}")
@@ -340,7 +867,7 @@ async def migrate_schema(config: Config, guild: discord.Guild) -> bool:
     if current_version < 2:
         # Migrate from v1 to v2
         # v1 used message_id as key, v2 uses suggestion_id as key
-        old_suggestions = await config.guild(guild).suggestions()
+        old_suggestions = legacy
         new_suggestions = {}
         
         for msg_id, data in old_suggestions.items():
@@ -372,12 +899,21 @@ async def migrate_schema(config: Config, guild: discord.Guild) -> bool:
                 "deleted": False,
             }
         
-        await config.guild(guild).suggestions.set(new_suggestions)
+        legacy = new_suggestions
         
         # Migrate counter
         old_counter = await config.guild(guild).suggestion_id()
         await config.guild(guild).suggestion_counter.set(old_counter)
     
+    if legacy:
+        # v2 -> v3: move the guild-wide dict into per-suggestion entries
+        entries = config.custom(SUGGESTION_GROUP, str(guild.id))
+        existing = await entries.all()
+        await entries.set({**legacy, **existing})
+        await config.guild(guild).suggestions.clear()
+        await rebuild_message_index(config, guild.id, await entries.all())
+        logger.info(f"Moved {len(legacy)} suggestion(s) of guild {guild.id} to per-suggestion storage")
+    
     await config.guild(guild).schema_version.set(CURRENT_SCHEMA_VERSION)
     logger.info(f"Migration complete for guild {guild.id}")
     return True
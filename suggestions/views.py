@@ -2,11 +2,13 @@
 Views module for SimpleSuggestions.
 Handles buttons, modals, and persistent views.
 """
+import asyncio
 import discord
 from discord import ui
 from redbot.core.i18n import Translator
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
 import logging
+import time
 
 from .storage import SuggestionStorage, SuggestionStatus, STATUS_CONFIG
 from .embeds import (
@@ -24,6 +26,9 @@ logger = logging.getLogger("red.killerbite95.suggestions.views")
 
 _ = Translator("SimpleSuggestions", __file__)
 
+# Minimum seconds between vote-driven edits of the same suggestion message
+VOTE_EDIT_INTERVAL = 3.0
+
 
 # ==================== MODALS ====================
 
@@ -93,199 +98,127 @@ class StatusChangeModal(ui.Modal):
         self.stop()
 
 
-# ==================== PERSISTENT VIEWS ====================
+# ==================== COMPONENT TEMPLATES ====================
 
-class SuggestionView(ui.View):
-    """
-    Persistent view for suggestion interactions.
-    Attached to each suggestion message.
+# Button actions per row, in display order
+_LAYOUT = (
+    ("upvote", "downvote", "votes", "edit"),
+    ("approve", "deny", "status"),
+)
+
+# (pending, translated labels) -> (action, template button) in display order
+_TEMPLATES: Dict[Tuple[bool, Tuple[str, ...]], Tuple[Tuple[str, ui.Button], ...]] = {}
+
+
+def _compile_template(pending: bool, labels: Tuple[str, ...]) -> Tuple[Tuple[str, ui.Button], ...]:
+    votes_label, edit_label, approve_label, deny_label, status_label = labels
+    buttons = {
+        "upvote": ui.Button(label="0", emoji="👍", style=discord.ButtonStyle.success),
+        "downvote": ui.Button(label="0", emoji="👎", style=discord.ButtonStyle.danger),
+        "votes": ui.Button(label=votes_label, emoji="📊", style=discord.ButtonStyle.secondary),
+        "edit": ui.Button(label=edit_label, emoji="✏️", style=discord.ButtonStyle.secondary, disabled=not pending),
+        "approve": ui.Button(label=approve_label, emoji="✅", style=discord.ButtonStyle.success),
+        "deny": ui.Button(label=deny_label, emoji="❌", style=discord.ButtonStyle.danger),
+        "status": ui.Button(label=status_label, emoji="📋", style=discord.ButtonStyle.secondary),
+    }
+    template = []
+    for row, actions in enumerate(_LAYOUT):
+        for action in actions:
+            buttons[action].row = row
+            template.append((action, buttons[action]))
+    return tuple(template)
+
+
+def render_components(suggestion) -> ui.View:
     """
+    Public buttons with current vote counts plus the staff row.
     
-    def __init__(self, cog: "SimpleSuggestions", suggestion_id: int):
-        super().__init__(timeout=None)
-        self.cog = cog
-        self.suggestion_id = suggestion_id
-        
-        # Create buttons manually to guarantee order
-        # Row 0: Upvote, Downvote, Ver votos, Editar
-        # Note: No callbacks assigned - all handled by handle_suggestion_interaction
-        self.upvote_button = ui.Button(
-            label="0",
-            emoji="👍",
-            style=discord.ButtonStyle.success,
-            custom_id=f"suggestion:upvote:{suggestion_id}",
-            row=0
-        )
-        self.add_item(self.upvote_button)
-        
-        self.downvote_button = ui.Button(
-            label="0",
-            emoji="👎",
-            style=discord.ButtonStyle.danger,
-            custom_id=f"suggestion:downvote:{suggestion_id}",
-            row=0
-        )
-        self.add_item(self.downvote_button)
-        
-        self.votes_button = ui.Button(
-            label=_("View votes"),
-            emoji="📊",
-            style=discord.ButtonStyle.secondary,
-            custom_id=f"suggestion:votes:{suggestion_id}",
-            row=0
-        )
-        self.add_item(self.votes_button)
-        
-        self.edit_button = ui.Button(
-            label=_("Edit"),
-            emoji="✏️",
-            style=discord.ButtonStyle.secondary,
-            custom_id=f"suggestion:edit:{suggestion_id}",
-            row=0
-        )
-        self.add_item(self.edit_button)
-    
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        """Check if the interaction is valid."""
-        if not interaction.guild:
-            return False
-        return True
-    
-    async def _downvote_callback(self, interaction: discord.Interaction):
-        """Handle downvote."""
-        await self._handle_vote(interaction, "down")
+    The buttons have no callbacks; ``handle_suggestion_interaction`` answers them.
+    """
+    pending = suggestion.status == SuggestionStatus.PENDING
+    # Labels are part of the key: the locale can differ per guild
+    labels = (_("View votes"), _("Edit"), _("Approve"), _("Deny"), _("Change status"))
+    template = _TEMPLATES.get((pending, labels))
+    if template is None:
+        template = _TEMPLATES[(pending, labels)] = _compile_template(pending, labels)
+    
+    counts = {"upvote": str(suggestion.upvotes), "downvote": str(suggestion.downvotes)}
+    view = ui.View(timeout=None)
+    for action, button in template:
+        # Only the label of vote buttons and the custom ID differ per message
+        view.add_item(ui.Button(
+            style=button.style,
+            label=counts.get(action, button.label),
+            emoji=button.emoji,
+            disabled=button.disabled,
+            custom_id=f"suggestion:{action}:{suggestion.suggestion_id}",
+            row=button.row,
+        ))
+    return view
+
+
+class VoteMessageRefresher:
+    """
+    Coalesces the public message edits caused by votes.
     
-    async def _votes_callback(self, interaction: discord.Interaction):
-        """Show detailed votes."""
-        suggestion = await self.cog.storage.get_suggestion(interaction.guild, self.suggestion_id)
-        if not suggestion:
-            await interaction.response.send_message(_("❌ Suggestion not found."), ephemeral=True)
-            return
-        
-        embed = create_votes_detail_embed(suggestion, self.cog.bot)
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+    The first vote on an idle suggestion edits the message immediately; votes
+    arriving within ``VOTE_EDIT_INTERVAL`` of the last edit are folded into a
+    single delayed edit that shows the totals at the time it runs.
+    """
     
-    async def _edit_callback(self, interaction: discord.Interaction):
-        """Edit suggestion (author only, pending only)."""
-        suggestion = await self.cog.storage.get_suggestion(interaction.guild, self.suggestion_id)
-        if not suggestion:
-            await interaction.response.send_message(_("❌ Suggestion not found."), ephemeral=True)
-            return
-        
-        if suggestion.author_id != interaction.user.id:
-            await interaction.response.send_message(_("❌ Only the author can edit this suggestion."), ephemeral=True)
-            return
-        
-        if suggestion.status != SuggestionStatus.PENDING:
-            status_info = STATUS_CONFIG.get(suggestion.status, {})
-            await interaction.response.send_message(
-                _("❌ You cannot edit a suggestion with status: {label}").format(label=_(status_info.get('label', suggestion.status.value))),
-                ephemeral=True
-            )
+    def __init__(self, cog: "SimpleSuggestions"):
+        self.cog = cog
+        self._tasks: Dict[Tuple[int, int], asyncio.Task] = {}
+        self._last_edit: Dict[Tuple[int, int], float] = {}
+        # Latest message seen per suggestion, consumed by the pending edit
+        self._messages: Dict[Tuple[int, int], discord.Message] = {}
+    
+    def schedule(self, guild: discord.Guild, suggestion_id: int, message: Optional[discord.Message]):
+        """Queue a refresh of a suggestion's message."""
+        if message is None:
             return
-        
-        modal = EditSuggestionModal(suggestion.content, self.suggestion_id)
-        await interaction.response.send_modal(modal)
-        
-        if await modal.wait():
+        key = (guild.id, suggestion_id)
+        self._messages[key] = message
+        if key in self._tasks:
             return
-        
-        # Update content
-        suggestion.content = modal.value
-        await self.cog.storage.update_suggestion(interaction.guild, suggestion)
-        
-        # Update message
-        author = interaction.guild.get_member(suggestion.author_id)
-        embed = create_suggestion_embed(suggestion, author)
-        await interaction.message.edit(embed=embed)
-        
-        await modal.interaction.response.send_message(_("✅ Suggestion edited."), ephemeral=True)
-    
-    async def _handle_vote(self, interaction: discord.Interaction, vote_type: str):
-        """Handle vote button press."""
-        # Defer the response first
-        await interaction.response.defer(ephemeral=True)
-        
-        result = await self.cog.storage.add_vote(
-            interaction.guild,
-            self.suggestion_id,
-            interaction.user.id,
-            vote_type
-        )
-        
-        if not result:
-            await interaction.followup.send(_("❌ Suggestion not found."), ephemeral=True)
-            return
-        
-        suggestion, action = result
-        
-        # Create a fresh view with correct vote counts
-        new_view = SuggestionView(self.cog, self.suggestion_id)
-        new_view.update_vote_counts(suggestion.upvotes, suggestion.downvotes)
-        
-        # Disable edit if not pending
-        if suggestion.status != SuggestionStatus.PENDING:
-            new_view.edit_button.disabled = True
-        
-        # Add staff buttons
-        staff_view = StaffActionsView(self.cog, self.suggestion_id)
-        for item in staff_view.children:
-            new_view.add_item(item)
-        
-        # Update message embed
-        author = interaction.guild.get_member(suggestion.author_id)
-        embed = create_suggestion_embed(suggestion, author)
-        await interaction.message.edit(embed=embed, view=new_view)
-        
-        # Send ephemeral response
-        response_embed = create_vote_result_embed(suggestion, action, vote_type, interaction.user)
-        await interaction.followup.send(embed=response_embed, ephemeral=True)
-    
-    def update_vote_counts(self, upvotes: int, downvotes: int):
-        """Update the vote count labels."""
-        self.upvote_button.label = str(upvotes)
-        self.downvote_button.label = str(downvotes)
-
-
-class StaffActionsView(ui.View):
-    """
-    Staff-only actions view.
-    Added as a second row for staff members.
-    """
+        delay = max(0.0, self._last_edit.get(key, 0.0) + VOTE_EDIT_INTERVAL - time.monotonic())
+        self._tasks[key] = asyncio.create_task(self._refresh(guild, suggestion_id, delay))
     
-    def __init__(self, cog: "SimpleSuggestions", suggestion_id: int):
-        super().__init__(timeout=None)
-        self.cog = cog
-        self.suggestion_id = suggestion_id
-        
-        # Create buttons manually to guarantee order (row 1)
-        # Note: No callbacks assigned - all handled by handle_suggestion_interaction
-        self.approve_button = ui.Button(
-            label=_("Approve"),
-            emoji="✅",
-            style=discord.ButtonStyle.success,
-            custom_id=f"suggestion:approve:{suggestion_id}",
-            row=1
-        )
-        self.add_item(self.approve_button)
-        
-        self.deny_button = ui.Button(
-            label=_("Deny"),
-            emoji="❌",
-            style=discord.ButtonStyle.danger,
-            custom_id=f"suggestion:deny:{suggestion_id}",
-            row=1
-        )
-        self.add_item(self.deny_button)
-        
-        self.status_button = ui.Button(
-            label=_("Change status"),
-            emoji="📋",
-            style=discord.ButtonStyle.secondary,
-            custom_id=f"suggestion:status:{suggestion_id}",
-            row=1
-        )
-        self.add_item(self.status_button)
+    async def _refresh(self, guild: discord.Guild, suggestion_id: int, delay: float):
+        key = (guild.id, suggestion_id)
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            message = self._messages.pop(key, None)
+            suggestion = await self.cog.storage.get_suggestion(guild, suggestion_id)
+            if message is not None and suggestion is not None:
+                author = guild.get_member(suggestion.author_id)
+                embed = create_suggestion_embed(suggestion, author)
+                await message.edit(embed=embed, view=render_components(suggestion))
+        except discord.NotFound:
+            logger.warning(f"Message for suggestion #{suggestion_id} no longer exists")
+        except discord.HTTPException as e:
+            logger.warning(f"Could not refresh message for suggestion #{suggestion_id}: {e}")
+        finally:
+            self._last_edit[key] = time.monotonic()
+            self._tasks.pop(key, None)
+        
+        # Votes that arrived while editing get their own (delayed) edit
+        if key in self._messages:
+            self.schedule(guild, suggestion_id, self._messages[key])
+        else:
+            self._prune()
+    
+    def _prune(self):
+        cutoff = time.monotonic() - VOTE_EDIT_INTERVAL
+        for key in [k for k, t in self._last_edit.items() if t < cutoff and k not in self._tasks]:
+            del self._last_edit[key]
+    
+    def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._messages.clear()
 
 
 class StatusSelectView(ui.View):
@@ -375,16 +308,7 @@ class StatusSelectView(ui.View):
                         author = interaction.guild.get_member(suggestion.author_id)
                         embed = create_suggestion_embed(suggestion, author)
                         
-                        user_view = SuggestionView(self.cog, self.suggestion_id)
-                        user_view.update_vote_counts(suggestion.upvotes, suggestion.downvotes)
-                        if suggestion.status != SuggestionStatus.PENDING:
-                            user_view.edit_button.disabled = True
-                        
-                        staff_view = StaffActionsView(self.cog, self.suggestion_id)
-                        for item in staff_view.children:
-                            user_view.add_item(item)
-                        
-                        await original_message.edit(embed=embed, view=user_view)
+                        await original_message.edit(embed=embed, view=render_components(suggestion))
                         logger.info(f"Updated embed for suggestion #{self.suggestion_id}")
                     except discord.NotFound:
                         logger.warning(f"Original message not found for suggestion #{self.suggestion_id}")
@@ -417,23 +341,35 @@ class StatusSelectView(ui.View):
 # ==================== PAGINATION VIEW ====================
 
 class SuggestionListView(ui.View):
-    """Paginated view for listing suggestions."""
+    """
+    Paginated view for listing suggestions.
+    
+    Holds the query (order and filters) and the current page only: each page
+    is fetched from the storage's ranking index when it is shown, and the page
+    count comes from the index's maintained totals.
+    """
     
     def __init__(
         self,
         cog: "SimpleSuggestions",
-        suggestions: list,
+        guild: discord.Guild,
         page: int = 1,
         per_page: int = 10,
-        status_filter: Optional[SuggestionStatus] = None
+        status_filter: Optional[SuggestionStatus] = None,
+        author_filter: Optional[int] = None,
+        sort: str = "newest"
     ):
         super().__init__(timeout=120)
         self.cog = cog
-        self.all_suggestions = suggestions
+        self.guild = guild
         self.page = page
         self.per_page = per_page
         self.status_filter = status_filter
-        self.total_pages = max(1, (len(suggestions) + per_page - 1) // per_page)
+        self.author_filter = author_filter
+        self.sort = sort
+        self.total = 0
+        self.total_pages = 1
+        self._items: list = []
         
         self._update_buttons()
     
@@ -442,15 +378,31 @@ class SuggestionListView(ui.View):
         self.next_button.disabled = self.page >= self.total_pages
         self.page_label.label = f"{self.page}/{self.total_pages}"
     
+    async def load_page(self, page: Optional[int] = None) -> list:
+        """Fetch a page (default: the current one) and make it current."""
+        if page is not None:
+            self.page = page
+        self.total, self._items = await self.cog.storage.list_suggestions(
+            self.guild,
+            sort=self.sort,
+            status_filter=self.status_filter,
+            author_filter=self.author_filter,
+            offset=(self.page - 1) * self.per_page,
+            limit=self.per_page,
+        )
+        self.total_pages = max(1, (self.total + self.per_page - 1) // self.per_page)
+        if self.page > self.total_pages:
+            # The listing shrank while the view was open
+            return await self.load_page(self.total_pages)
+        self._update_buttons()
+        return self._items
+    
     def get_current_page_items(self) -> list:
-        start = (self.page - 1) * self.per_page
-        end = start + self.per_page
-        return self.all_suggestions[start:end]
+        return self._items
     
     @ui.button(emoji="⬅️", style=discord.ButtonStyle.secondary)
     async def prev_button(self, interaction: discord.Interaction, button: ui.Button):
-        self.page = max(1, self.page - 1)
-        self._update_buttons()
+        await self.load_page(max(1, self.page - 1))
         await self._update_message(interaction)
     
     @ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
@@ -459,16 +411,14 @@ class SuggestionListView(ui.View):
     
     @ui.button(emoji="➡️", style=discord.ButtonStyle.secondary)
     async def next_button(self, interaction: discord.Interaction, button: ui.Button):
-        self.page = min(self.total_pages, self.page + 1)
-        self._update_buttons()
+        await self.load_page(self.page + 1)
         await self._update_message(interaction)
     
     async def _update_message(self, interaction: discord.Interaction):
         from .embeds import create_suggestion_list_embed
         
-        current_items = self.get_current_page_items()
         embed = create_suggestion_list_embed(
-            current_items,
+            self.get_current_page_items(),
             self.page,
             self.total_pages,
             self.status_filter
@@ -537,6 +487,86 @@ async def _check_staff_permission_standalone(cog: "SimpleSuggestions", interacti
     return False
 
 
+async def _show_votes(cog: "SimpleSuggestions", interaction: discord.Interaction, suggestion_id: int):
+    """Show detailed votes."""
+    suggestion = await cog.storage.get_suggestion(interaction.guild, suggestion_id)
+    if not suggestion:
+        await interaction.response.send_message(_("❌ Suggestion not found."), ephemeral=True)
+        return
+    
+    embed = create_votes_detail_embed(suggestion, cog.bot)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def _edit_suggestion(cog: "SimpleSuggestions", interaction: discord.Interaction, suggestion_id: int):
+    """Edit suggestion (author only, pending only)."""
+    suggestion = await cog.storage.get_suggestion(interaction.guild, suggestion_id)
+    if not suggestion:
+        await interaction.response.send_message(_("❌ Suggestion not found."), ephemeral=True)
+        return
+    
+    if suggestion.author_id != interaction.user.id:
+        await interaction.response.send_message(_("❌ Only the author can edit this suggestion."), ephemeral=True)
+        return
+    
+    if suggestion.status != SuggestionStatus.PENDING:
+        status_info = STATUS_CONFIG.get(suggestion.status, {})
+        await interaction.response.send_message(
+            _("❌ You cannot edit a suggestion with status: {label}").format(label=_(status_info.get('label', suggestion.status.value))),
+            ephemeral=True
+        )
+        return
+    
+    modal = EditSuggestionModal(suggestion.content, suggestion_id)
+    await interaction.response.send_modal(modal)
+    
+    if await modal.wait():
+        return
+    
+    # Update content
+    suggestion.content = modal.value
+    await cog.storage.update_suggestion(interaction.guild, suggestion)
+    
+    # Update message
+    author = interaction.guild.get_member(suggestion.author_id)
+    embed = create_suggestion_embed(suggestion, author)
+    await interaction.message.edit(embed=embed)
+    
+    await modal.interaction.response.send_message(_("✅ Suggestion edited."), ephemeral=True)
+
+
+async def _handle_vote(cog: "SimpleSuggestions", interaction: discord.Interaction, suggestion_id: int, vote_type: str):
+    """Handle vote button press."""
+    # Applied in memory; persisted by the storage flusher
+    result = await cog.storage.add_vote(
+        interaction.guild,
+        suggestion_id,
+        interaction.user.id,
+        vote_type
+    )
+    
+    if not result:
+        await interaction.response.send_message(_("❌ Suggestion not found."), ephemeral=True)
+        return
+    
+    suggestion, action = result
+    
+    # Confirm right away; the public message is refreshed separately
+    response_embed = create_vote_result_embed(suggestion, action, vote_type, interaction.user)
+    await interaction.response.send_message(embed=response_embed, ephemeral=True)
+    
+    cog.bot.dispatch(
+        "suggestion_vote",
+        guild=interaction.guild,
+        suggestion=suggestion,
+        user_id=interaction.user.id,
+        vote_type=vote_type,
+        action=action,
+    )
+    
+    cog.vote_refresher.schedule(interaction.guild, suggestion_id, interaction.message)
+
+
 async def _handle_status_change(cog: "SimpleSuggestions", interaction: discord.Interaction, suggestion_id: int, new_status: SuggestionStatus):
     """Handle status change with modal for reason."""
     suggestion = await cog.storage.get_suggestion(interaction.guild, suggestion_id)
@@ -582,16 +612,7 @@ async def _handle_status_change(cog: "SimpleSuggestions", interaction: discord.I
                     author = interaction.guild.get_member(suggestion.author_id)
                     embed = create_suggestion_embed(suggestion, author)
                     
-                    user_view = SuggestionView(cog, suggestion_id)
-                    user_view.update_vote_counts(suggestion.upvotes, suggestion.downvotes)
-                    if suggestion.status != SuggestionStatus.PENDING:
-                        user_view.edit_button.disabled = True
-                    
-                    staff_view = StaffActionsView(cog, suggestion_id)
-                    for item in staff_view.children:
-                        user_view.add_item(item)
-                    
-                    await original_message.edit(embed=embed, view=user_view)
+                    await original_message.edit(embed=embed, view=render_components(suggestion))
                     logger.info(f"Updated embed for suggestion #{suggestion_id}")
                 except discord.NotFound:
                     logger.warning(f"Original message not found for suggestion #{suggestion_id}")
@@ -654,17 +675,15 @@ async def handle_suggestion_interaction(cog: "SimpleSuggestions", interaction: d
         return True
     
     try:
-        # Create the appropriate view and handle the interaction
         if action in ["upvote", "downvote", "votes", "edit"]:
-            view = SuggestionView(cog, suggestion_id)
             if action == "upvote":
-                await view._handle_vote(interaction, "up")
+                await _handle_vote(cog, interaction, suggestion_id, "up")
             elif action == "downvote":
-                await view._handle_vote(interaction, "down")
+                await _handle_vote(cog, interaction, suggestion_id, "down")
             elif action == "votes":
-                await view._votes_callback(interaction)
+                await _show_votes(cog, interaction, suggestion_id)
             elif action == "edit":
-                await view._edit_callback(interaction)
+                await _edit_suggestion(cog, interaction, suggestion_id)
         
         elif action in ["approve", "deny", "status"]:
             # Check staff permission first
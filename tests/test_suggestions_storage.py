@@ -0,0 +1,113 @@
+"""Regression tests for the SimpleSuggestions storage layer."""
+import asyncio
+import copy
+import types
+
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("redbot")
+
+from suggestions.storage import SuggestionStatus, SuggestionStorage
+
+
+class _Group:
+    """In-memory stand-in for a Config group. Every call yields to the loop once."""
+
+    def __init__(self, root, path):
+        self.root = root
+        self.path = path
+
+    def _node(self):
+        node = self.root
+        for part in self.path:
+            node = node.get(part)
+            if node is None:
+                return None
+        return node
+
+    async def all(self):
+        await asyncio.sleep(0)
+        return copy.deepcopy(self._node() or {})
+
+    async def set(self, value):
+        await asyncio.sleep(0)
+        node = self.root
+        for part in self.path[:-1]:
+            node = node.setdefault(part, {})
+        node[self.path[-1]] = copy.deepcopy(value)
+
+    async def clear(self):
+        await asyncio.sleep(0)
+        parent = _Group(self.root, self.path[:-1])._node()
+        if parent is not None:
+            parent.pop(self.path[-1], None)
+
+    async def get_raw(self, key, default=None):
+        await asyncio.sleep(0)
+        return copy.deepcopy((self._node() or {}).get(key, default))
+
+    async def set_raw(self, key, value):
+        await _Group(self.root, self.path + (key,)).set(value)
+
+    async def clear_raw(self, key):
+        await _Group(self.root, self.path + (key,)).clear()
+
+
+class _Value:
+    def __init__(self, values, key):
+        self.values = values
+        self.key = key
+
+    async def __call__(self):
+        return self.values.get(self.key, 0)
+
+    async def set(self, value):
+        self.values[self.key] = value
+
+
+class _Config:
+    def __init__(self):
+        self.root = {}
+        self.guilds = {}
+
+    def custom(self, group, *identifiers):
+        return _Group(self.root, (group,) + identifiers)
+
+    def guild(self, guild):
+        values = self.guilds.setdefault(guild.id, {})
+        return types.SimpleNamespace(
+            suggestion_counter=_Value(values, "suggestion_counter"),
+            message_index_version=_Value(values, "message_index_version"),
+        )
+
+
+def test_flush_during_update_keeps_new_status():
+    async def scenario():
+        config = _Config()
+        storage = SuggestionStorage(None, config)
+        guild = types.SimpleNamespace(id=1)
+        suggestion = await storage.create_suggestion(guild, 100, "Add a music channel", 5)
+        sid = suggestion.suggestion_id
+        await storage.add_vote(guild, sid, 42, "up")
+
+        # Hold the guild lock so both queue on it: the status change first, then the flush
+        lock = storage._get_lock(guild.id)
+        await lock.acquire()
+        update = asyncio.create_task(storage.update_status(guild, sid, SuggestionStatus.APPROVED, 9, "ok"))
+        await asyncio.sleep(0)
+        flush = asyncio.create_task(storage.flush_votes())
+        await asyncio.sleep(0)
+        lock.release()
+        await asyncio.gather(update, flush)
+
+        stored = await storage._entry(guild, sid).all()
+        current = await storage.get_suggestion(guild, sid)
+        return stored, current
+
+    stored, current = asyncio.run(scenario())
+    assert stored["status"] == SuggestionStatus.APPROVED.value
+    assert stored["reason"] == "ok"
+    assert len(stored["history"]) == 1
+    assert current.status is SuggestionStatus.APPROVED
+    assert current.voters_up == {42}
@@ -15,6 +15,7 @@ from ..abc import MixinMeta
 from ..common.constants import MODAL_SCHEMA, TICKET_PANEL_SCHEMA, QUICK_REPLY_SCHEMA, TICKET_STATUSES
 from ..common.menu import SMALL_CONTROLS, MenuButton, menu
 from ..common.models import TimeParser, QuickReply, BlacklistEntry
+from ..common.ticketindex import TICKET_INDEX
 from ..common.utils import (
     prune_invalid_tickets,
     update_active_overview,
@@ -1504,6 +1505,7 @@ class AdminCommands(MixinMeta):
                                     async with self.config.guild(ctx.guild).opened() as opened:
                                         if uid in opened and channel_id in opened[uid]:
                                             opened[uid][channel_id]["message_id"] = message_id
+                                            TICKET_INDEX.upsert(ctx.guild.id, uid, channel_id, opened[uid][channel_id])
                                     break
                         except Exception:
                             pass
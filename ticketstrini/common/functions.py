@@ -11,6 +11,7 @@ from redbot.core.utils.chat_formatting import pagify
 
 from ..abc import MixinMeta
 from ..common.utils import update_active_overview
+from ..common.ticketindex import TICKET_INDEX
 from ..common.views import CloseView, LogView
 
 log = logging.getLogger("red.vrt.tickets.functions")
@@ -497,6 +498,15 @@ class Functions(MixinMeta):
             new_id = await update_active_overview(guild, data)
             if new_id:
                 data["overview_msg"] = new_id
+        TICKET_INDEX.upsert(guild.id, uid, channel_or_thread.id, data["opened"][uid][str(channel_or_thread.id)])
+
+        self.bot.dispatch(
+            "ticket_open",
+            guild=guild,
+            channel=channel_or_thread,
+            owner_id=user.id,
+            panel=panel_name,
+        )
 
         txt = f"Ticket has been created!\nChannel mention: {channel_or_thread.mention}"
 
@@ -0,0 +1,219 @@
+"""
+In-memory index of open tickets.
+
+The ``opened`` config dict is keyed by owner, so answering "all claimed
+tickets, newest first" or "how many tickets per panel" means loading and
+scanning every ticket in the guild. This index mirrors ``opened`` per guild
+with lookups by channel, owner, status, panel and claimer plus an
+opened-time ordering. It is loaded from config once per guild and kept
+current by the open/close/claim/status paths, which call ``upsert`` and
+``remove`` right after writing to config.
+"""
+
+import logging
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from redbot.core import Config
+
+log = logging.getLogger("red.killerbite95.tickets.index")
+
+
+def _status(ticket: dict) -> str:
+    return ticket.get("status") or "open"
+
+
+class _GuildTickets:
+    def __init__(self):
+        # channel_id -> (owner_id, ticket)
+        self.tickets: Dict[str, Tuple[str, dict]] = {}
+        self.by_owner: Dict[str, Set[str]] = {}
+        self.by_status: Dict[str, Set[str]] = {}
+        self.by_panel: Dict[str, Set[str]] = {}
+        self.by_claimer: Dict[str, Set[str]] = {}
+        # (opened iso timestamp, channel_id), oldest first
+        self.order: List[Tuple[str, str]] = []
+
+    @staticmethod
+    def _keys(owner_id: str, ticket: dict) -> Tuple[str, str, str, Optional[str]]:
+        claimed_by = ticket.get("claimed_by")
+        return owner_id, _status(ticket), ticket.get("panel") or "", str(claimed_by) if claimed_by else None
+
+    def add(self, channel_id: str, owner_id: str, ticket: dict):
+        owner, status, panel, claimer = self._keys(owner_id, ticket)
+        self.tickets[channel_id] = (owner_id, ticket)
+        self.by_owner.setdefault(owner, set()).add(channel_id)
+        self.by_status.setdefault(status, set()).add(channel_id)
+        self.by_panel.setdefault(panel, set()).add(channel_id)
+        if claimer:
+            self.by_claimer.setdefault(claimer, set()).add(channel_id)
+        insort(self.order, (ticket.get("opened") or "", channel_id))
+
+    def discard(self, channel_id: str):
+        entry = self.tickets.pop(channel_id, None)
+        if entry is None:
+            return
+        owner_id, ticket = entry
+        owner, status, panel, claimer = self._keys(owner_id, ticket)
+        for index, key in (
+            (self.by_owner, owner),
+            (self.by_status, status),
+            (self.by_panel, panel),
+            (self.by_claimer, claimer),
+        ):
+            if key is None:
+                continue
+            channels = index.get(key)
+            if channels is not None:
+                channels.discard(channel_id)
+                if not channels:
+                    del index[key]
+        pos = bisect_left(self.order, (ticket.get("opened") or "", channel_id))
+        if pos < len(self.order) and self.order[pos][1] == channel_id:
+            del self.order[pos]
+
+
+class TicketIndex:
+    """guild_id -> open tickets, with secondary indexes and a query API."""
+
+    def __init__(self):
+        self._guilds: Dict[int, _GuildTickets] = {}
+        # Writes that land while a guild is being loaded, replayed afterwards
+        self._loading: Dict[int, List[Tuple[str, tuple]]] = {}
+
+    # ---------------- Loading ----------------
+
+    def is_loaded(self, guild_id: int) -> bool:
+        return guild_id in self._guilds
+
+    def load_guild(self, guild_id: int, opened: dict):
+        """(Re)build a guild's index from its ``opened`` config dict."""
+        guild_tickets = _GuildTickets()
+        for owner_id, channels in opened.items():
+            for channel_id, ticket in channels.items():
+                guild_tickets.add(str(channel_id), str(owner_id), dict(ticket))
+        self._guilds[guild_id] = guild_tickets
+
+    async def ensure_guild(self, guild_id: int, config: Config):
+        """Load a guild from config if it is not indexed yet."""
+        if guild_id in self._guilds:
+            return
+        pending = self._loading.setdefault(guild_id, [])
+        try:
+            opened = await config.guild_from_id(guild_id).opened()
+            self.load_guild(guild_id, opened)
+            for op, args in pending:
+                getattr(self, op)(guild_id, *args)
+        finally:
+            self._loading.pop(guild_id, None)
+
+    def drop_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+
+    # ---------------- Maintenance ----------------
+
+    def upsert(self, guild_id: int, owner_id: Any, channel_id: Any, ticket: dict):
+        """Insert or replace a ticket after it was written to config."""
+        if guild_id in self._loading:
+            self._loading[guild_id].append(("upsert", (owner_id, channel_id, ticket)))
+        guild_tickets = self._guilds.get(guild_id)
+        if guild_tickets is None:
+            return
+        channel_id = str(channel_id)
+        guild_tickets.discard(channel_id)
+        guild_tickets.add(channel_id, str(owner_id), dict(ticket))
+
+    def remove(self, guild_id: int, channel_id: Any):
+        """Forget a ticket after it was removed from config."""
+        if guild_id in self._loading:
+            self._loading[guild_id].append(("remove", (channel_id,)))
+        guild_tickets = self._guilds.get(guild_id)
+        if guild_tickets is not None:
+            guild_tickets.discard(str(channel_id))
+
+    # ---------------- Queries ----------------
+
+    def get(self, guild_id: int, channel_id: Any) -> Optional[Tuple[str, dict]]:
+        """(owner_id, ticket) for a ticket channel, or None."""
+        guild_tickets = self._guilds.get(guild_id)
+        if guild_tickets is None:
+            return None
+        return guild_tickets.tickets.get(str(channel_id))
+
+    def query(
+        self,
+        guild_id: int,
+        status: Optional[str] = None,
+        owner_id: Any = None,
+        panel: Optional[str] = None,
+        claimed_by: Any = None,
+        newest_first: bool = True,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, List[Tuple[str, str, dict]]]:
+        """Return (total, [(channel_id, owner_id, ticket), ...]) ordered by opened time."""
+        guild_tickets = self._guilds.get(guild_id)
+        if guild_tickets is None:
+            return 0, []
+
+        filters = []
+        if status is not None:
+            filters.append(guild_tickets.by_status.get(status, set()))
+        if owner_id is not None:
+            filters.append(guild_tickets.by_owner.get(str(owner_id), set()))
+        if panel is not None:
+            filters.append(guild_tickets.by_panel.get(panel, set()))
+        if claimed_by is not None:
+            filters.append(guild_tickets.by_claimer.get(str(claimed_by), set()))
+
+        if filters:
+            filters.sort(key=len)
+            matches = set(filters[0]).intersection(*filters[1:])
+            ordered = sorted(
+                matches,
+                key=lambda cid: (guild_tickets.tickets[cid][1].get("opened") or "", cid),
+                reverse=newest_first,
+            )
+        else:
+            ordered = [cid for _, cid in guild_tickets.order]
+            if newest_first:
+                ordered.reverse()
+
+        total = len(ordered)
+        end = None if limit is None else offset + limit
+        page = []
+        for cid in ordered[offset:end]:
+            owner, ticket = guild_tickets.tickets[cid]
+            page.append((cid, owner, ticket))
+        return total, page
+
+    def counts(self, guild_id: int) -> Dict[str, Any]:
+        """Aggregate counts for a guild's open tickets."""
+        guild_tickets = self._guilds.get(guild_id)
+        if guild_tickets is None:
+            return {"total": 0, "by_status": {}, "by_panel": {}, "claimed": 0, "owners": 0}
+        return {
+            "total": len(guild_tickets.tickets),
+            "by_status": {k: len(v) for k, v in guild_tickets.by_status.items()},
+            "by_panel": {k: len(v) for k, v in guild_tickets.by_panel.items()},
+            "claimed": sum(len(v) for v in guild_tickets.by_claimer.values()),
+            "owners": len(guild_tickets.by_owner),
+        }
+
+    def totals(self) -> Dict[str, Any]:
+        """Counts across every indexed guild."""
+        by_status: Counter = Counter()
+        total = 0
+        guilds = 0
+        for guild_tickets in self._guilds.values():
+            if guild_tickets.tickets:
+                guilds += 1
+            total += len(guild_tickets.tickets)
+            for status, channels in guild_tickets.by_status.items():
+                by_status[status] += len(channels)
+        return {"total": total, "by_status": dict(by_status), "guilds_with_open": guilds}
+
+
+# One index per loaded cog; shared by the cog, its views and the helpers in utils
+TICKET_INDEX = TicketIndex()
@@ -28,6 +28,7 @@ from .models import (
     TimeParser,
 )
 from .constants import SCHEMA_VERSION, TICKET_STATUSES
+from .ticketindex import TICKET_INDEX
 
 LOADING = "https://i.imgur.com/l3p6EMX.gif"
 log = logging.getLogger("red.killerbite95.tickets.utils")
@@ -625,6 +626,7 @@ async def claim_ticket(
             opened[owner_id][str(channel.id)]["claimed_by"] = staff.id
             opened[owner_id][str(channel.id)]["claimed_at"] = now.isoformat()
             opened[owner_id][str(channel.id)]["status"] = "claimed"
+            TICKET_INDEX.upsert(guild.id, owner_id, channel.id, opened[owner_id][str(channel.id)])
     
     # Calculate claim time for stats
     try:
@@ -690,6 +692,7 @@ async def unclaim_ticket(
             opened[owner_id][str(channel.id)]["claimed_by"] = None
             opened[owner_id][str(channel.id)]["claimed_at"] = None
             opened[owner_id][str(channel.id)]["status"] = "open"
+            TICKET_INDEX.upsert(guild.id, owner_id, channel.id, opened[owner_id][str(channel.id)])
 
     # Clear the claim from the ticket's opening embed and channel topic
     await update_claim_display(guild, channel, ticket_data, None)
@@ -747,6 +750,7 @@ async def transfer_ticket(
             opened[owner_id][str(channel.id)]["claimed_by"] = to_staff.id
             opened[owner_id][str(channel.id)]["claimed_at"] = now.isoformat()
             opened[owner_id][str(channel.id)]["status"] = "claimed"
+            TICKET_INDEX.upsert(guild.id, owner_id, channel.id, opened[owner_id][str(channel.id)])
 
     # Reflect the new claimer on the ticket's opening embed and channel topic
     await update_claim_display(guild, channel, ticket_data, to_staff)
@@ -776,6 +780,7 @@ async def update_ticket_status(
     async with config.guild(guild).opened() as opened:
         if owner_id in opened and channel_id in opened[owner_id]:
             opened[owner_id][channel_id]["status"] = status
+            TICKET_INDEX.upsert(guild.id, owner_id, channel_id, opened[owner_id][channel_id])
 
 
 async def update_last_message(
@@ -798,6 +803,7 @@ async def update_last_message(
             else:
                 if opened[owner_id][channel_id].get("claimed_by"):
                     opened[owner_id][channel_id]["status"] = "awaiting_staff"
+            TICKET_INDEX.upsert(guild.id, owner_id, channel_id, opened[owner_id][channel_id])
 
 
 # ============================================================================
@@ -867,6 +873,7 @@ async def escalate_ticket(
         if owner_id in opened and str(channel.id) in opened[owner_id]:
             opened[owner_id][str(channel.id)]["escalated"] = True
             opened[owner_id][str(channel.id)]["escalation_level"] = level
+            TICKET_INDEX.upsert(guild.id, owner_id, channel.id, opened[owner_id][str(channel.id)])
     
     # Build notification message
     role_mention = ""
@@ -936,6 +943,7 @@ async def add_ticket_note(
             if "notes" not in opened[owner_id][str(channel.id)]:
                 opened[owner_id][str(channel.id)]["notes"] = []
             opened[owner_id][str(channel.id)]["notes"].append(note)
+            TICKET_INDEX.upsert(guild.id, owner_id, channel.id, opened[owner_id][str(channel.id)])
     
     await log_audit_action(
         guild=guild,
@@ -1261,6 +1269,7 @@ async def reopen_archived_ticket(
         new_id = await update_active_overview(guild, data)
         if new_id:
             data["overview_msg"] = new_id
+    TICKET_INDEX.upsert(guild.id, owner_id, cid, ticket_entry)
 
     # Restore the opening message: active embed + Close/Claim buttons
     message_id = entry.get("message_id")
@@ -1285,6 +1294,15 @@ async def reopen_archived_ticket(
     if cog is not None:
         cog.ticket_channel_ids.add(cid)
 
+    bot.dispatch(
+        "ticket_open",
+        guild=guild,
+        channel=channel,
+        owner_id=int(owner_id),
+        panel=ticket_entry.get("panel"),
+        reopened=True,
+    )
+
     return True, _("Ticket reopened.")
 
 
@@ -1317,6 +1335,17 @@ async def close_ticket(
         del opened[uid][cid]
         if not opened[uid]:
             del opened[uid]
+    TICKET_INDEX.remove(guild.id, cid)
+
+    bot.dispatch(
+        "ticket_close",
+        guild=guild,
+        channel=channel,
+        owner_id=member.id,
+        panel=ticket.get("panel"),
+        closed_by=closedby,
+        reason=reason,
+    )
     
     # Now process the close with the ticket data we saved
     pfp = ticket["pfp"]
@@ -1682,6 +1711,8 @@ async def prune_invalid_tickets(
                 if cid not in opened[uid]:
                     continue
                 del opened[uid][cid]
+        if TICKET_INDEX.is_loaded(guild.id):
+            TICKET_INDEX.load_guild(guild.id, opened)
 
     grammar = _("ticket") if count == 1 else _("tickets")
     if count and ctx:
@@ -2022,6 +2053,7 @@ async def check_auto_close_warnings(
                     if "close_warnings_sent" not in opened[owner_id][str(channel.id)]:
                         opened[owner_id][str(channel.id)]["close_warnings_sent"] = []
                     opened[owner_id][str(channel.id)]["close_warnings_sent"].append(warning_hour)
+                    TICKET_INDEX.upsert(guild.id, owner_id, channel.id, opened[owner_id][str(channel.id)])
             
             return inactivity_type
     
@@ -39,6 +39,7 @@ from .utils import (
 )
 from .models import PanelSchedule, WelcomeSections, TimeParser
 from .constants import TICKET_STATUSES
+from .ticketindex import TICKET_INDEX
 
 log = logging.getLogger("red.killerbite95.ticketstrini.views")
 
@@ -1045,6 +1046,15 @@ class SupportButton(Button):
             new_id = await update_active_overview(guild, data)
             if new_id:
                 data["overview_msg"] = new_id
+        TICKET_INDEX.upsert(guild.id, uid, channel_or_thread.id, data["opened"][uid][str(channel_or_thread.id)])
+
+        self.view.bot.dispatch(
+            "ticket_open",
+            guild=guild,
+            channel=channel_or_thread,
+            owner_id=user.id,
+            panel=self.panel_name,
+        )
 
 
 class PanelView(View):
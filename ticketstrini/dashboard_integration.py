@@ -4,6 +4,8 @@ from redbot.core import commands, Config
 from redbot.core.bot import Red
 import discord
 
+from .common.ticketindex import TicketIndex
+
 
 def dashboard_page(*args, **kwargs):
     """
@@ -19,6 +21,7 @@ def dashboard_page(*args, **kwargs):
 class DashboardIntegration:
     bot: Red
     config: Config
+    ticket_index: TicketIndex
 
     @commands.Cog.listener()
     async def on_dashboard_cog_add(self, dashboard_cog: commands.Cog) -> None:
@@ -57,7 +60,10 @@ class DashboardIntegration:
             blacklist = data.get("blacklist", [])
             bl_advanced = data.get("blacklist_advanced", {})
 
-            guild_open = sum(len(channels) for channels in opened.values())
+            if self.ticket_index.is_loaded(gid):
+                guild_open = self.ticket_index.counts(gid)["total"]
+            else:
+                guild_open = sum(len(channels) for channels in opened.values())
             if guild_open > 0 or panels:
                 guilds_using += 1
             total_open += guild_open
@@ -216,64 +222,73 @@ class DashboardIntegration:
             guild_name = guild.name if guild else f"ID: {gid}"
             guild_icon = str(guild.icon.url) if guild and guild.icon else ""
 
+            # Newest first, from the ticket index when the guild is loaded
+            if self.ticket_index.is_loaded(gid):
+                _total, entries = self.ticket_index.query(gid)
+            else:
+                entries = [
+                    (ch_id_str, uid_str, tdata)
+                    for uid_str, channels in opened.items()
+                    for ch_id_str, tdata in channels.items()
+                ]
+
             tickets = []
-            for uid_str, channels in opened.items():
-                for ch_id_str, tdata in channels.items():
-                    user = None
-                    try:
-                        user = self.bot.get_user(int(uid_str))
-                    except (ValueError, TypeError):
-                        pass
-                    user_name = str(user) if user else f"ID: {uid_str}"
-                    user_avatar = str(user.display_avatar.url) if user else ""
+            for ch_id_str, uid_str, tdata in entries:
+                user = None
+                try:
+                    user = self.bot.get_user(int(uid_str))
+                except (ValueError, TypeError):
+                    pass
+                user_name = str(user) if user else f"ID: {uid_str}"
+                user_avatar = str(user.display_avatar.url) if user else ""
 
-                    status = tdata.get("status", "open")
-                    panel = tdata.get("panel", "—")
-                    opened_at = tdata.get("opened", "")
-                    claimed_by_id = tdata.get("claimed_by")
-                    claimed_name = ""
-                    if claimed_by_id:
-                        claimer = self.bot.get_user(int(claimed_by_id)) if claimed_by_id else None
-                        claimed_name = str(claimer) if claimer else f"ID: {claimed_by_id}"
-                    escalated = tdata.get("escalated", False)
-                    notes_count = len(tdata.get("notes", []))
+                status = tdata.get("status", "open")
+                panel = tdata.get("panel", "—")
+                opened_at = tdata.get("opened", "")
+                claimed_by_id = tdata.get("claimed_by")
+                claimed_name = ""
+                if claimed_by_id:
+                    claimer = self.bot.get_user(int(claimed_by_id)) if claimed_by_id else None
+                    claimed_name = str(claimer) if claimer else f"ID: {claimed_by_id}"
+                escalated = tdata.get("escalated", False)
+                notes_count = len(tdata.get("notes", []))
 
-                    # Format opened_at
-                    opened_display = ""
-                    if opened_at:
-                        try:
-                            dt = datetime.datetime.fromisoformat(str(opened_at))
-                            opened_display = dt.strftime("%d/%m/%Y %H:%M")
-                        except (ValueError, TypeError):
-                            opened_display = str(opened_at)[:16]
+                # Format opened_at
+                opened_display = ""
+                if opened_at:
+                    try:
+                        dt = datetime.datetime.fromisoformat(str(opened_at))
+                        opened_display = dt.strftime("%d/%m/%Y %H:%M")
+                    except (ValueError, TypeError):
+                        opened_display = str(opened_at)[:16]
 
-                    status_class = {
-                        "open": "success",
-                        "claimed": "info",
-                        "awaiting_user": "warning",
-                        "awaiting_staff": "danger",
-                    }.get(status, "secondary")
+                status_class = {
+                    "open": "success",
+                    "claimed": "info",
+                    "awaiting_user": "warning",
+                    "awaiting_staff": "danger",
+                }.get(status, "secondary")
 
-                    status_label = {
-                        "open": "Abierto",
-                        "claimed": "Reclamado",
-                        "awaiting_user": "Esperando usuario",
-                        "awaiting_staff": "Esperando staff",
-                    }.get(status, status)
+                status_label = {
+                    "open": "Abierto",
+                    "claimed": "Reclamado",
+                    "awaiting_user": "Esperando usuario",
+                    "awaiting_staff": "Esperando staff",
+                }.get(status, status)
 
-                    tickets.append({
-                        "user_name": user_name,
-                        "user_avatar": user_avatar,
-                        "channel_id": ch_id_str,
-                        "panel": panel,
-                        "status": status,
-                        "status_class": status_class,
-                        "status_label": status_label,
-                        "opened_at": opened_display,
-                        "claimed_by": claimed_name,
-                        "escalated": escalated,
-                        "notes_count": notes_count,
-                    })
+                tickets.append({
+                    "user_name": user_name,
+                    "user_avatar": user_avatar,
+                    "channel_id": ch_id_str,
+                    "panel": panel,
+                    "status": status,
+                    "status_class": status_class,
+                    "status_label": status_label,
+                    "opened_at": opened_display,
+                    "claimed_by": claimed_name,
+                    "escalated": escalated,
+                    "notes_count": notes_count,
+                })
 
             if tickets:
                 guilds_data.append({
@@ -13,6 +13,7 @@ from redbot.core.i18n import cog_i18n
 from .abc import CompositeMetaClass
 from .commands import TicketCommands
 from .common.constants import DEFAULT_GUILD, SCHEMA_VERSION
+from .common.ticketindex import TICKET_INDEX, TicketIndex
 from .common.functions import Functions
 from .common.utils import (
     close_ticket,
@@ -68,6 +69,9 @@ class TicketsTrini(TicketCommands, Functions, DashboardIntegration, commands.Cog
         # Set of ticket channel IDs for fast on_message filtering
         self.ticket_channel_ids: t.Set[str] = set()
 
+        # In-memory index of open tickets (by channel/owner/status/panel/opened time)
+        self.ticket_index: TicketIndex = TICKET_INDEX
+
         self.auto_close.start()
         self.escalation_check.start()
 
@@ -123,6 +127,7 @@ class TicketsTrini(TicketCommands, Functions, DashboardIntegration, commands.Cog
         pruned = await prune_invalid_tickets(guild, data, self.config)
         if pruned:
             data = await self.config.guild(guild).all()
+        self.ticket_index.load_guild(guild.id, data["opened"])
 
         # Refresh overview panel
         new_id = await update_active_overview(guild, data)
@@ -369,6 +374,7 @@ class TicketsTrini(TicketCommands, Functions, DashboardIntegration, commands.Cog
                                     async with self.config.guild(guild).opened() as op:
                                         if uid in op and channel_id in op[uid]:
                                             op[uid][channel_id]["close_warnings_sent"] = 1
+                                            TICKET_INDEX.upsert(guild.id, uid, channel_id, op[uid][channel_id])
                                 except discord.HTTPException:
                                     pass
                                 continue
@@ -401,6 +407,7 @@ class TicketsTrini(TicketCommands, Functions, DashboardIntegration, commands.Cog
                                 async with self.config.guild(guild).opened() as op:
                                     if uid in op and channel_id in op[uid]:
                                         op[uid][channel_id]["close_warnings_sent"] = 1
+                                        TICKET_INDEX.upsert(guild.id, uid, channel_id, op[uid][channel_id])
                             except discord.HTTPException:
                                 pass
                             continue
@@ -630,8 +637,8 @@ class TicketsTrini(TicketCommands, Functions, DashboardIntegration, commands.Cog
         guild = self.bot.get_guild(guild_id)
         if not guild:
             return {"status": 1, "error": "Guild no encontrada."}
-        conf = await self.config.guild(guild).all()
-        opened = conf.get("opened", {})
+        await self.ticket_index.ensure_guild(guild.id, self.config)
+        _total, tickets = self.ticket_index.query(guild.id, newest_first=True)
         html_content = """
         <!-- Bootstrap CSS -->
         <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css"
@@ -650,23 +657,22 @@ class TicketsTrini(TicketCommands, Functions, DashboardIntegration, commands.Cog
             </thead>
             <tbody>
         """
-        if not opened:
+        if not tickets:
             html_content += "<tr><td colspan='4'>No hay tickets activos</td></tr>"
         else:
-            for uid, tickets in opened.items():
+            for cid, uid, ticket in tickets:
                 member = guild.get_member(int(uid))
                 member_name = member.display_name if member else "Desconocido"
-                for cid, ticket in tickets.items():
-                    opened_at = ticket.get("opened", "N/A")
-                    panel = ticket.get("panel", "N/A")
-                    html_content += f"""
-                      <tr>
-                        <td>{member_name}</td>
-                        <td>{cid}</td>
-                        <td>{panel}</td>
-                        <td>{opened_at}</td>
-                      </tr>
-                    """
+                opened_at = ticket.get("opened", "N/A")
+                panel = ticket.get("panel", "N/A")
+                html_content += f"""
+                  <tr>
+                    <td>{member_name}</td>
+                    <td>{cid}</td>
+                    <td>{panel}</td>
+                    <td>{opened_at}</td>
+                  </tr>
+                """
         html_content += """
             </tbody>
           </table>